@@ -0,0 +1,83 @@
+# Porównanie dekodowania miniatur: pełne dekodowanie kontra tryb draft JPEG.
+#
+# Użycie:
+#     python benchmarks/bench_decode.py [katalog_z_obrazami]
+#
+# Bez argumentu tworzony jest tymczasowy zbiór dużych obrazów JPEG i PNG.
+# Każda metoda działa w osobnym procesie, aby szczytowe RSS były porównywalne.
+
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu do uruchamiania procesów potomnych
+import subprocess
+# Import modułu z parametrami interpretera
+import sys
+# Import modułu do tworzenia katalogów tymczasowych
+import tempfile
+# Import modułu do pomiaru czasu
+import time
+# Import modułu do pracy z obrazami
+from PIL import Image
+
+# Dostęp do modułów aplikacji z katalogu nadrzędnego
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import porównywanych ścieżek dekodowania
+from nasa_image_searcher.imaging import decode_thumbnail, decode_thumbnail_full
+
+# Rozmiar miniatury używany przez aplikację
+THUMB_SIZE = (180, 180)
+# Rozszerzenia plików uwzględniane w zbiorze testowym
+EXTENSIONS = (".jpg", ".jpeg", ".png", ".tif", ".tiff")
+
+
+# Utworzenie zbioru dużych obrazów testowych
+def make_corpus(directory, count=6, size=(6000, 4000)):
+    # Gradient daje obraz, który nie kompresuje się trywialnie
+    img = Image.linear_gradient("L").resize(size).convert("RGB")
+    for i in range(count):
+        img.save(os.path.join(directory, f"large_{i}.jpg"), quality=90)
+    # Mniejszy PNG sprawdza ścieżkę bez trybu draft
+    img.resize((size[0] // 4, size[1] // 4)).save(os.path.join(directory, "fallback.png"))
+
+
+# Odczyt szczytowego RSS bieżącego procesu w kilobajtach
+def peak_rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    return 0
+
+
+# Pomiar jednej metody w bieżącym procesie
+def run_worker(method, directory):
+    decode = decode_thumbnail if method == "draft" else decode_thumbnail_full
+    paths = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(EXTENSIONS)
+    )
+    start = time.process_time()
+    for path in paths:
+        with open(path, "rb") as f:
+            decode(f.read(), THUMB_SIZE)
+    cpu = time.process_time() - start
+    # VmHWM (Linux) w odróżnieniu od ru_maxrss nie dziedziczy szczytu po procesie rodzica
+    peak_kb = peak_rss_kb()
+    print(f"{method:6s} images={len(paths)} cpu={cpu:.3f}s peak_rss={peak_kb / 1024:.1f}MiB")
+
+
+# Uruchomienie obu metod w osobnych procesach
+def main(directory):
+    for method in ("full", "draft"):
+        subprocess.run([sys.executable, __file__, "--worker", method, directory], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--worker":
+        run_worker(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) == 2:
+        main(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            make_corpus(tmp)
+            main(tmp)
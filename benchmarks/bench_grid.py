@@ -0,0 +1,113 @@
+# Pomiar wirtualnej siatki miniatur: czas klatki przewijania i liczba elementów.
+#
+# Użycie (wymaga ekranu, np. Xvfb):
+#     python benchmarks/bench_grid.py [liczba_wyników ...]
+#
+# Silnik i most są zastąpione wersjami, które od razu zwracają miniatury,
+# więc mierzony jest wyłącznie koszt po stronie Tk.
+
+# Import modułu do obsługi ścieżek
+import os
+# Import modułu z parametrami interpretera
+import sys
+# Import modułu do pomiaru czasu
+import time
+# Import modułu statystyk do wyznaczania percentyli
+import statistics
+# Import modułu tkinter do tworzenia GUI
+import tkinter as tk
+# Import prostego obiektu z atrybutami
+from types import SimpleNamespace
+# Import modułu do pracy z obrazami
+from PIL import Image
+
+# Dostęp do modułów aplikacji z katalogu nadrzędnego
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import mierzonego komponentu
+from nasa_image_searcher.app import ImageResults, UIConfig
+# Import klasy wyniku pobierania miniatury
+from nasa_image_searcher.engine import ThumbnailResult
+# Import liczników połączeń i kolejki logowanych przez siatkę
+from nasa_image_searcher.nasa_client import ClientStats
+from nasa_image_searcher.scheduler import SchedulerStats
+# Import pamięci podręcznej zdekodowanych obrazów
+from nasa_image_searcher.memory_cache import MemoryCache
+# Import rekordów elementów wyników
+from nasa_image_searcher.items import parse_items
+
+# Liczba kroków przewijania w pomiarze
+SCROLL_STEPS = 200
+
+
+# Silnik zwracający od razu jednolitą miniaturę
+class FakeEngine:
+    # Inicjalizacja silnika
+    def __init__(self):
+        self.image = Image.new("RGB", UIConfig.THUMB_SIZE, "gray")
+        # Klient bez połączeń - siatka loguje tylko jego liczniki
+        self.http = SimpleNamespace(stats=ClientStats())
+        # Kolejka bez oczekujących pobrań - również tylko liczniki
+        self.scheduler = SimpleNamespace(stats=SchedulerStats())
+
+    # Wyniki dla wszystkich elementów naraz
+    def fetch_thumbnails(self, items, concurrency):
+        return [ThumbnailResult(i, item, self.image) for i, item in enumerate(items)]
+
+    # Zmiana kafelków w widoku - bez kolejki nie ma czego przestawiać
+    def focus(self, urls):
+        return None
+
+
+# Most wywołujący funkcje zwrotne synchronicznie
+class FakeBridge:
+    # Przekazanie gotowego wyniku
+    def submit(self, result, on_result=None, on_error=None, token=None):
+        if on_result is not None:
+            on_result(result)
+
+    # Przekazanie wszystkich wyników
+    def stream(self, results, on_item, on_error=None, on_done=None, token=None):
+        for result in results:
+            on_item(result)
+        if on_done is not None:
+            on_done()
+
+
+# Zliczenie widżetów w drzewie
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+# Pomiar dla zadanej liczby wyników
+def run(root, count):
+    results = ImageResults(root, lambda text: None, lambda item: None, FakeEngine(), FakeBridge(), MemoryCache())
+    items = parse_items([
+        {"data": [{"title": f"Item {i}"}], "links": [{"href": f"http://example/{i}~thumb.jpg"}]}
+        for i in range(count)
+    ], UIConfig.THUMB_SIZE)
+    results.display_thumbnails(items)
+    root.update()
+
+    # Przewijanie od góry do dołu w równych krokach
+    frame_times = []
+    for step in range(SCROLL_STEPS + 1):
+        start = time.perf_counter()
+        results.canvas.yview_moveto(step / SCROLL_STEPS)
+        root.update()
+        frame_times.append((time.perf_counter() - start) * 1000)
+
+    frame_times.sort()
+    p95 = frame_times[int(len(frame_times) * 0.95) - 1]
+    print(f"results={count:6d} widgets={count_widgets(root):4d} "
+          f"canvas_items={len(results.canvas.find_all()):4d} "
+          f"frame_p50={statistics.median(frame_times):.2f}ms frame_p95={p95:.2f}ms")
+    results.destroy()
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    root = tk.Tk()
+    root.geometry("1000x650")
+    for count in counts:
+        run(root, count)
+    root.destroy()
@@ -0,0 +1,93 @@
+# Opóźnienie zapytań lokalnego indeksu metadanych (SQLite FTS5).
+#
+# Użycie:
+#     python benchmarks/bench_index.py [--items 100000] [--path index.sqlite]
+#
+# Indeks jest wypełniany syntetycznymi elementami o strukturze odpowiedzi API NASA,
+# a następnie mierzone są czasy (p50/p95) typowych zapytań. Słownik jest mały, więc każde
+# słowo pasuje do większości elementów - to najgorszy przypadek dla rankingu.
+
+# Import modułu do parsowania argumentów wiersza poleceń
+import argparse
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu do losowania treści
+import random
+# Import modułu z parametrami interpretera
+import sys
+# Import modułu do tworzenia katalogów tymczasowych
+import tempfile
+# Import modułu do pomiaru czasu
+import time
+
+# Dostęp do modułów aplikacji z katalogu nadrzędnego
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import badanego indeksu
+from nasa_image_searcher.metadata_index import MetadataIndex
+
+# Słownik, z którego składane są tytuły, opisy i słowa kluczowe
+VOCABULARY = (
+    "apollo mars moon saturn jupiter hubble nebula galaxy rover launch orbit astronaut "
+    "shuttle station eclipse comet asteroid crater landing spacewalk telescope solar "
+    "earth venus mercury neptune uranus pluto cassini voyager artemis gemini mercury "
+    "mission crew module lunar surface rocket engine test flight cluster star dust"
+).split()
+# Badane zapytania: częste słowo, dwa słowa, prefiks, rzadkie słowo, identyfikator
+QUERIES = ("mars", "apollo moon", "astro", "pluto cassini comet", "PIA012345")
+# Liczba powtórzeń każdego zapytania
+REPEAT = 50
+# Wielkość porcji przy wypełnianiu indeksu (jak jedna strona wyników)
+BATCH = 100
+
+
+# Syntetyczny element wyników wyszukiwania
+def make_item(rng, i):
+    words = lambda n: " ".join(rng.choice(VOCABULARY) for _ in range(n))
+    nasa_id = f"PIA{i:06d}"
+    return {
+        "href": f"https://images-assets.nasa.gov/image/{nasa_id}/collection.json",
+        "data": [{
+            "nasa_id": nasa_id, "title": words(6).title(), "description": words(60),
+            "keywords": words(5).split(), "date_created": f"20{i % 25:02d}-01-01T00:00:00Z",
+            "media_type": "image",
+        }],
+        "links": [{"href": f"https://images-assets.nasa.gov/image/{nasa_id}/{nasa_id}~thumb.jpg",
+                   "rel": "preview", "render": "image"}],
+    }
+
+
+# Percentyl z posortowanej listy
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metadata index query latency")
+    parser.add_argument("--items", type=int, default=100000)
+    parser.add_argument("--path", help="index file (default: temporary)")
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = MetadataIndex(args.path or os.path.join(directory, "metadata.sqlite"))
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for first in range(0, args.items, BATCH):
+            index.add([make_item(rng, i) for i in range(first, min(first + BATCH, args.items))])
+        elapsed = time.perf_counter() - start
+        print(f"Indexed {len(index)} items in {elapsed:.1f}s ({args.items / elapsed:.0f} items/s)")
+
+        for query in QUERIES:
+            times = []
+            for _ in range(REPEAT):
+                start = time.perf_counter()
+                results = index.search(query, args.limit)
+                times.append(time.perf_counter() - start)
+            times.sort()
+            print(f"{query!r:24} {len(results):4} results  p50 {percentile(times, 0.5) * 1000:7.2f} ms  "
+                  f"p95 {percentile(times, 0.95) * 1000:7.2f} ms")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
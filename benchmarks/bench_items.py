@@ -0,0 +1,146 @@
+# Czas parsowania i pamięć zajmowana przez wyniki wyszukiwania: pełne elementy API
+# (słowniki z json.loads) i zwięzłe rekordy items.Item.
+#
+# Użycie:
+#     python benchmarks/bench_items.py [--items 10000] [--recording odpowiedź.json | katalog]
+#
+# Bez nagrania używana jest syntetyczna odpowiedź o strukturze API NASA (z opisami
+# i słowami kluczowymi podobnej długości jak w prawdziwych wynikach). Elementy nagrania
+# (np. z nasa_stub.py record) są powielane do zadanej liczby.
+
+# Import modułu do parsowania argumentów wiersza poleceń
+import argparse
+# Import modułu do odśmiecania przed pomiarem pamięci
+import gc
+# Import modułu do kodowania i dekodowania JSON
+import json
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu do losowania treści
+import random
+# Import modułu z parametrami interpretera
+import sys
+# Import modułu do pomiaru czasu
+import time
+# Import modułu do pomiaru przydzielonej pamięci
+import tracemalloc
+
+# Dostęp do modułów aplikacji z katalogu nadrzędnego
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import badanych rekordów
+from nasa_image_searcher.items import parse_items, compact_response
+
+# Słownik, z którego składane są tytuły, opisy i słowa kluczowe
+VOCABULARY = (
+    "apollo mars moon saturn jupiter hubble nebula galaxy rover launch orbit astronaut "
+    "shuttle station eclipse comet asteroid crater landing spacewalk telescope solar "
+    "earth venus mercury neptune uranus pluto cassini voyager artemis gemini "
+    "mission crew module lunar surface rocket engine test flight cluster star dust"
+).split()
+# Rozmiar kafelka, dla którego wybierana jest miniatura (jak w aplikacji)
+THUMB_SIZE = (180, 180)
+# Liczba powtórzeń pomiaru czasu
+REPEAT = 5
+
+
+# Syntetyczny element wyników wyszukiwania
+def make_item(rng, i):
+    words = lambda n: " ".join(rng.choice(VOCABULARY) for _ in range(n))
+    nasa_id = f"PIA{i:06d}"
+    base = f"https://images-assets.nasa.gov/image/{nasa_id}"
+    return {
+        "href": f"{base}/collection.json",
+        "data": [{
+            "center": "JPL", "nasa_id": nasa_id, "title": words(6).title(), "description": words(120),
+            "keywords": words(8).split(), "date_created": f"20{i % 25:02d}-01-01T00:00:00Z",
+            "media_type": "image", "photographer": "NASA/JPL-Caltech", "location": words(2).title(),
+            "secondary_creator": words(3).title(),
+        }],
+        "links": [
+            {"href": f"{base}/{nasa_id}~thumb.jpg", "rel": "preview", "render": "image",
+             "width": 640, "height": 480, "size": 41234},
+            {"href": f"{base}/{nasa_id}~medium.jpg", "rel": "alternate", "render": "image",
+             "width": 1280, "height": 960, "size": 182345},
+            {"href": f"{base}/{nasa_id}~orig.jpg", "rel": "canonical", "render": "image",
+             "width": 4000, "height": 3000, "size": 2345678},
+        ],
+    }
+
+
+# Elementy z nagranych odpowiedzi (plik lub katalog plików *.json)
+def recorded_items(path):
+    paths = [path] if os.path.isfile(path) else sorted(
+        os.path.join(path, name) for name in os.listdir(path) if name.endswith(".json")
+    )
+    items = []
+    for name in paths:
+        with open(name, encoding="utf-8") as f:
+            items += json.load(f).get("collection", {}).get("items", [])
+    return items
+
+
+# Mediana czasu wykonania funkcji (w sekundach)
+def timed(func):
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2]
+
+
+# Pamięć zajmowana przez wynik funkcji po zwolnieniu obiektów pośrednich (w bajtach)
+def retained(func):
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search result parse time and memory")
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--recording", help="recorded /search response file or directory")
+    args = parser.parse_args()
+
+    if args.recording:
+        source = recorded_items(args.recording)
+        if not source:
+            sys.exit(f"no items in {args.recording}")
+        raw = [source[i % len(source)] for i in range(args.items)]
+    else:
+        rng = random.Random(0)
+        raw = [make_item(rng, i) for i in range(args.items)]
+    body = json.dumps({"collection": {"version": "1.0", "items": raw, "links": [],
+                                      "metadata": {"total_hits": len(raw)}}}).encode("utf-8")
+    del raw
+    items = lambda data: data["collection"]["items"]
+    print(f"{args.items} items, response {len(body) / 2 ** 20:.1f} MiB")
+
+    data = json.loads(body)
+    rows = (
+        ("json.loads", timed(lambda: json.loads(body))),
+        ("parse_items", timed(lambda: parse_items(items(data), THUMB_SIZE))),
+        ("compact_response", timed(lambda: compact_response(data))),
+        ("compact + parse_items", timed(lambda: parse_items(items(compact_response(data)), THUMB_SIZE))),
+    )
+    for name, elapsed in rows:
+        print(f"{name:24} {elapsed * 1000:8.1f} ms  {elapsed / args.items * 1e6:6.2f} us/item")
+    del data
+
+    # Pamięć elementów utrzymywanych przez siatkę wyników i pamięć podręczną wyszukiwań
+    rows = (
+        ("raw items (dict)", retained(lambda: items(json.loads(body)))),
+        ("compact response", retained(lambda: compact_response(json.loads(body)))),
+        ("Item records", retained(lambda: parse_items(items(json.loads(body)), THUMB_SIZE))),
+    )
+    for name, size in rows:
+        print(f"{name:24} {size / 2 ** 20:8.1f} MiB  {size / args.items:8.0f} B/item")
+
+
+if __name__ == "__main__":
+    main()
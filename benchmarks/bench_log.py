@@ -0,0 +1,84 @@
+# Koszt komunikatu logu w długiej sesji: pole logu aplikacji (LogBox) przy milionie
+# komunikatów, mierzony w kolejnych porcjach.
+#
+# Użycie (wymaga ekranu, np. Xvfb):
+#     xvfb-run python benchmarks/bench_log.py [--messages 1000000] [--block 100000]
+#         [--flush-every 1000] [--log-file log.txt] [--tolerance 0.5] [--direct]
+#
+# Komunikaty są wstawiane do pola co --flush-every komunikatów (jak przy odświeżaniu
+# co UIConfig.LOG_FLUSH_MS). Dla każdej porcji podawany jest średni koszt komunikatu
+# i liczba wierszy w polu. Jeśli ostatnia porcja jest droższa od pierwszej o więcej
+# niż tolerancja, program kończy się kodem 1. Z opcją --direct mierzone jest dawne
+# zachowanie (insert i see przy każdym komunikacie, bez ograniczenia liczby wierszy).
+
+# Import modułu do parsowania argumentów wiersza poleceń
+import argparse
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu z parametrami interpretera
+import sys
+# Import modułu do pomiaru czasu
+import time
+# Import modułu tkinter do tworzenia GUI
+import tkinter as tk
+
+# Dostęp do modułów aplikacji z katalogu nadrzędnego
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import mierzonego pola logu
+from nasa_image_searcher.app import LogBox, UIConfig
+
+
+# Dawne pole logu: każdy komunikat wstawiany od razu
+def direct_log(box, text):
+    box.insert(tk.END, text + "\n")
+    box.see(tk.END)
+
+
+# Liczba wierszy w polu tekstowym
+def widget_lines(box):
+    return int(box.index("end-1c").split(".")[0]) - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Log widget cost over a long session")
+    parser.add_argument("--messages", type=int, default=1000000)
+    parser.add_argument("--block", type=int, default=100000, help="messages per reported block")
+    parser.add_argument("--flush-every", type=int, default=1000, help="messages between widget updates")
+    parser.add_argument("--log-file", help="also write the full log to this rotating file")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--direct", action="store_true", help="insert every message immediately (old behaviour)")
+    args = parser.parse_args()
+
+    UIConfig.LOG_PATH = args.log_file
+    root = tk.Tk()
+    box = LogBox(root)
+    root.update()
+    costs = []
+    print(f"{'messages':>10} {'us/msg':>8} {'lines':>8}")
+    for start in range(0, args.messages, args.block):
+        count = min(args.block, args.messages - start)
+        began = time.perf_counter()
+        for index in range(start, start + count):
+            text = f"Loaded thumbnail {index}: apollo 11 lunar module ascent stage"
+            if args.direct:
+                direct_log(box, text)
+            else:
+                box.log(text)
+            if (index + 1) % args.flush_every == 0:
+                if not args.direct:
+                    box._flush()
+                root.update()
+        costs.append((time.perf_counter() - began) / count)
+        print(f"{start + count:10d} {costs[-1] * 1e6:8.2f} {widget_lines(box):8d}")
+    box.close()
+    root.destroy()
+
+    growth = costs[-1] / costs[0] - 1
+    print(f"Last block vs first: {growth:+.0%}")
+    if growth > args.tolerance:
+        print("REGRESSION per-message cost grows with session length")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# Skalowanie dekodowania miniatur: pula wątków kontra pula procesów (1..N rdzeni).
+#
+# Użycie:
+#     python benchmarks/bench_processes.py [--count 48] [--size 2400x1600] [--workers 1,2,4]
+#
+# Korpus dużych obrazów JPEG jest tworzony w pamięci. Dla każdej liczby pracowników
+# mierzona jest liczba miniatur na sekundę oraz najdłuższe opóźnienie wątku głównego
+# (budzonego co 5 ms, jak pętla Tk), gdy dekodowanie trwa w tle.
+
+# Import modułu do parsowania argumentów wiersza poleceń
+import argparse
+# Import modułu do wyboru sposobu uruchamiania procesów
+import multiprocessing
+# Import modułu do obsługi ścieżek
+import os
+# Import modułu z parametrami interpretera
+import sys
+# Import modułu do pomiaru czasu
+import time
+# Import pul wątków i procesów
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+# Import modułu do pracy z danymi binarnymi
+from io import BytesIO
+# Import modułu do pracy z obrazami
+from PIL import Image
+
+# Dostęp do modułów aplikacji z katalogu nadrzędnego
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import porównywanych ścieżek dekodowania
+from nasa_image_searcher.imaging import decode_thumbnail, decode_thumbnail_rgb, image_from_rgb
+
+# Rozmiar miniatury używany przez aplikację
+THUMB_SIZE = (180, 180)
+# Odstęp budzenia wątku głównego w sekundach
+TICK = 0.005
+
+
+# Utworzenie korpusu obrazów JPEG w pamięci
+def make_corpus(count, size):
+    noise = Image.effect_noise(size, 48)
+    corpus = []
+    for i in range(count):
+        buffer = BytesIO()
+        Image.merge("RGB", (noise, noise.rotate(i), noise)).save(buffer, "JPEG", quality=90)
+        corpus.append(buffer.getvalue())
+    return corpus
+
+
+# Dekodowanie korpusu w puli; zwraca (miniatury na sekundę, najdłuższe opóźnienie wątku głównego)
+def run(executor, func, corpus, convert=None):
+    start = time.perf_counter()
+    futures = [executor.submit(func, data, THUMB_SIZE) for data in corpus]
+    worst = 0.0
+    # Wątek główny budzi się regularnie, jak pętla zdarzeń interfejsu
+    while not all(future.done() for future in futures):
+        tick = time.perf_counter()
+        time.sleep(TICK)
+        worst = max(worst, time.perf_counter() - tick - TICK)
+    for future in futures:
+        result = future.result()
+        if convert is not None:
+            convert(result)
+    elapsed = time.perf_counter() - start
+    return len(corpus) / elapsed, worst
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Thumbnail decode scaling")
+    parser.add_argument("--count", type=int, default=48)
+    parser.add_argument("--size", default="2400x1600")
+    parser.add_argument("--workers", default=",".join(
+        str(n) for n in sorted({1, 2, 4, cores}) if n <= cores
+    ))
+    args = parser.parse_args()
+    size = tuple(int(v) for v in args.size.split("x"))
+
+    corpus = make_corpus(args.count, size)
+    print(f"Corpus: {args.count} JPEG {size[0]}x{size[1]}, {cores} cores")
+    context = multiprocessing.get_context("spawn")
+    for workers in (int(n) for n in args.workers.split(",")):
+        with ThreadPoolExecutor(workers) as executor:
+            threads = run(executor, decode_thumbnail, corpus)
+        with ProcessPoolExecutor(workers, mp_context=context) as executor:
+            # Uruchomienie procesów przed pomiarem
+            list(executor.map(decode_thumbnail_rgb, corpus[:workers], [THUMB_SIZE] * workers))
+            processes = run(executor, decode_thumbnail_rgb, corpus, image_from_rgb)
+        print(f"{workers:2} workers: threads {threads[0]:6.1f}/s (max stall {threads[1] * 1000:5.1f} ms), "
+              f"processes {processes[0]:6.1f}/s (max stall {processes[1] * 1000:5.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# Kolejność obsługi pobrań konkurujących o połączenia z jednym hostem: otwierany obraz,
+# miniatury w widoku, kolejne strony wyników i podglądy pobierane z wyprzedzeniem, na
+# lokalnym serwerze zastępującym API NASA (nasa_stub.py) z małą liczbą połączeń.
+#
+# Użycie:
+#     python benchmarks/bench_scheduler.py [--connections 4] [--image-latency 0.2]
+#         [--bandwidth 1024] [--visible 30] [--prefetch 60] [--pages 3]
+#
+# Przebieg: miniatury pierwszych --visible kafelków, łańcuch kolejnych stron i podglądy
+# z wyprzedzeniem są zlecane naraz. Po chwili widok przesuwa się o pół ekranu (miniatury,
+# które go opuściły, są obniżane), a potem otwierany jest obraz. Podawane są czasy
+# ukończenia poszczególnych klas, raz z kolejką priorytetową i raz z kolejką FIFO (jak bez
+# priorytetów). Jeśli z kolejką priorytetową otwierany obraz nie wyprzedza miniatur
+# w widoku, a te miniatur spoza widoku i kolejnych stron, program kończy się kodem 1.
+
+# Import modułu do parsowania argumentów wiersza poleceń
+import argparse
+# Import pętli zdarzeń asyncio
+import asyncio
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu statystyk do wyznaczania median
+import statistics
+# Import modułu do uruchomienia serwera w osobnym procesie
+import subprocess
+# Import modułu z parametrami interpretera
+import sys
+# Import modułu do tworzenia katalogów tymczasowych
+import tempfile
+# Import modułu do pomiaru czasu
+import time
+
+# Katalog pomiarów i dostęp do modułów aplikacji z katalogu nadrzędnego
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+# Import mierzonego silnika i kolejki
+from nasa_image_searcher.nasa_client import AsyncHTTPClient
+from nasa_image_searcher.image_cache import ImageCache, DEFAULT_MAX_BYTES, DEFAULT_MAX_AGE
+from nasa_image_searcher.search_cache import SearchCache
+from nasa_image_searcher.engine import SearchEngine
+from nasa_image_searcher.scheduler import Scheduler, DECODE, INTERACTIVE, PRIORITY_NAMES
+
+# Rozmiar miniatury i ekranu (jak w aplikacji)
+THUMB_SIZE = (180, 180)
+SCREEN_SIZE = (1920, 1080)
+# Budżet bajtów jednego podglądu pobieranego z wyprzedzeniem
+PREFETCH_LIMIT = 64 * 2 ** 20
+
+
+# Kolejka bez priorytetów: wszystkie operacje w jednej kolejce, w kolejności zlecenia
+# (liczniki i limit pobierania z wyprzedzeniem nadal według zleconej klasy)
+class FifoScheduler(Scheduler):
+    def _enqueue(self, ticket):
+        ticket.priority = INTERACTIVE
+        super()._enqueue(ticket)
+
+    def focus(self, keys, priority, demoted):
+        pass
+
+    def promote(self, key, priority):
+        pass
+
+
+# Uruchomienie serwera zastępującego API; zwraca (proces, adres)
+def start_stub(args):
+    command = [sys.executable, os.path.join(BENCH_DIR, "nasa_stub.py"), "serve", "--port", "0",
+               "--latency", str(args.latency), "--image-latency", str(args.image_latency),
+               "--bandwidth", str(args.bandwidth)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Listening on "):
+        process.kill()
+        raise RuntimeError("stub server did not start")
+    return process, line.split()[-1]
+
+
+# Jeden przebieg; zwraca czasy ukończenia (w sekundach od zlecenia) według klas
+# i średni czas oczekiwania w kolejce według klas
+async def scenario(args, base_url, scheduler, directory):
+    engine = SearchEngine(
+        AsyncHTTPClient(pool_size=args.connections), ImageCache(directory, DEFAULT_MAX_BYTES, DEFAULT_MAX_AGE), THUMB_SIZE,
+        search_url=f"{base_url}/search", search_cache=SearchCache(), scheduler=scheduler
+    )
+    done = {"visible": [], "demoted": [], "pages": [], "prefetch": [], "interactive": []}
+    try:
+        page = await engine.fetch_page("apollo")
+        items = page.items
+        half = args.visible // 2
+        shown = set(range(half, half + args.visible))
+        start = time.perf_counter()
+
+        # Miniatury kafelków; po przewinięciu liczą się osobno te w widoku i te, które go opuściły
+        async def thumbnails(slots):
+            async for result in engine.fetch_thumbnails([items[slot] for slot in slots], len(slots)):
+                group = "visible" if slots[result.index] in shown else "demoted"
+                done[group].append(time.perf_counter() - start)
+
+        # Łańcuch kolejnych stron wyników
+        async def pages(url):
+            for _ in range(args.pages):
+                if not url:
+                    break
+                page = await engine.fetch_page(url=url)
+                done["pages"].append(time.perf_counter() - start)
+                url = page.next_url
+
+        async def prefetch(item):
+            try:
+                await engine.prefetch_preview(item, SCREEN_SIZE, PREFETCH_LIMIT)
+            except Exception:
+                return
+            done["prefetch"].append(time.perf_counter() - start)
+
+        background = [asyncio.ensure_future(thumbnails(list(range(args.visible)))),
+                      asyncio.ensure_future(pages(page.next_url))]
+        first = args.visible + half
+        background += [asyncio.ensure_future(prefetch(item)) for item in items[first:first + args.prefetch]]
+
+        # Przewinięcie o pół ekranu: nowe miniatury i obniżenie tych, które opuściły widok
+        await asyncio.sleep(args.scroll_after)
+        await engine.focus([items[slot].thumb for slot in shown])
+        background.append(asyncio.ensure_future(thumbnails(list(range(args.visible, half + args.visible)))))
+
+        # Otwarcie obrazu w widoku
+        await asyncio.sleep(args.open_after)
+        opened = time.perf_counter()
+        await engine.fetch_preview(items[half + 1], SCREEN_SIZE)
+        done["interactive"].append(time.perf_counter() - opened)
+        await asyncio.gather(*background)
+    finally:
+        await engine.close()
+    stats = scheduler.stats
+    waits = [wait / started if started else None for wait, started in zip(stats.wait_time, stats.started)]
+    return done, waits
+
+
+# Mediana i 95. percentyl w milisekundach do tabeli
+def describe(values):
+    if not values:
+        return f"{'-':>8} {'-':>8} {0:6d}"
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"{statistics.median(ordered) * 1000:8.0f} {p95 * 1000:8.0f} {len(ordered):6d}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Priority scheduler under simulated contention")
+    parser.add_argument("--connections", type=int, default=4, help="connections per host")
+    parser.add_argument("--latency", type=float, default=0.1, help="API response delay in seconds")
+    parser.add_argument("--image-latency", type=float, default=0.2, help="image response delay in seconds")
+    parser.add_argument("--bandwidth", type=float, default=1024, help="per-connection limit in KiB/s (0 - none)")
+    parser.add_argument("--visible", type=int, default=30, help="thumbnails in the viewport")
+    parser.add_argument("--prefetch", type=int, default=20, help="speculative preview downloads")
+    parser.add_argument("--pages", type=int, default=3, help="next pages fetched in the background")
+    parser.add_argument("--scroll-after", type=float, default=0.1, help="seconds before scrolling")
+    parser.add_argument("--open-after", type=float, default=0.2, help="seconds after scrolling to open an image")
+    args = parser.parse_args()
+
+    stub, base_url = start_stub(args)
+    results = {}
+    try:
+        for name, make in (("priority", Scheduler), ("fifo", FifoScheduler)):
+            # Każdy przebieg zaczyna od pustej pamięci podręcznej
+            with tempfile.TemporaryDirectory() as directory:
+                scheduler = make(args.connections, {DECODE: os.cpu_count() or 1})
+                results[name] = asyncio.run(scenario(args, base_url, scheduler, directory))
+    finally:
+        stub.kill()
+        stub.wait()
+
+    print("Completion time (interactive - from opening, others - from the start):")
+    print(f"{'class':12} {'scheduler':9} {'p50 ms':>8} {'p95 ms':>8} {'count':>6}")
+    for group in ("interactive", "visible", "demoted", "pages", "prefetch"):
+        for name, (done, _) in results.items():
+            print(f"{group:12} {name:9} {describe(done[group])}")
+    print("Mean queue wait per operation:")
+    for priority, label in enumerate(PRIORITY_NAMES):
+        print(f"{label:12} " + " ".join(
+            f"{name} {waits[priority] * 1000:6.0f} ms" if waits[priority] is not None else f"{name}      - ms"
+            for name, (_, waits) in results.items()
+        ))
+
+    # Z kolejką priorytetową ważniejsze klasy czekają krócej, a miniatury w widoku kończą
+    # się przed tymi, które go opuściły
+    done, waits = results["priority"]
+    violations = [
+        f"{PRIORITY_NAMES[higher]} waited longer than {PRIORITY_NAMES[lower]}"
+        for higher, lower in zip(range(len(waits)), range(1, len(waits)))
+        if waits[higher] is not None and waits[lower] is not None and waits[higher] > waits[lower]
+    ]
+    if done["visible"] and done["demoted"] and max(done["visible"]) > max(done["demoted"]):
+        violations.append("thumbnails in view finished after those that left it")
+    for violation in violations:
+        print(f"ORDERING {violation}")
+    if violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+# Pomiar ścieżki wyszukiwanie -> siatka miniatur w całej aplikacji, na lokalnym
+# serwerze zastępującym API NASA (nasa_stub.py), bez dostępu do sieci.
+#
+# Użycie (wymaga ekranu, np. Xvfb):
+#     xvfb-run python benchmarks/bench_search.py [--queries apollo,mars] [--runs 3]
+#         [--latency 0.1] [--image-latency 0.2] [--bandwidth 1024] [--recordings DIR]
+#         [--json wynik.json] [--baseline poprzedni.json --tolerance 0.25] [--atlas]
+#         [--dwell 1.0] [--no-prefetch]
+#
+# Dla każdego zapytania mierzone są: czas do pierwszej miniatury, czas do wypełnienia
+# wszystkich widocznych kafelków i blokowanie wątku interfejsu (suma nadwyżek ponad
+# 50 ms w obsłudze zdarzeń Tk oraz najdłuższa przerwa), raz przy pustej pamięci
+# podręcznej ("cold") i raz przy ponownym wyszukiwaniu ("warm"). Po wypełnieniu siatki
+# kursor jest przesuwany nad kafelek na środku widoku, a po chwili (--dwell) kafelek jest
+# otwierany - mierzony jest czas od kliknięcia do wyświetlenia podglądu. Na końcu podawane jest
+# szczytowe zużycie pamięci (RSS) procesu aplikacji. Z opcją --baseline wynik jest
+# porównywany z poprzednim pomiarem, a pogorszenie ponad tolerancję kończy program
+# kodem 1 (do użycia między wydaniami).
+
+# Import modułu do parsowania argumentów wiersza poleceń
+import argparse
+# Import modułu do zapisu wyników
+import json
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu do odczytu szczytowego zużycia pamięci
+import resource
+# Import modułu statystyk do wyznaczania median
+import statistics
+# Import modułu do uruchomienia serwera w osobnym procesie
+import subprocess
+# Import modułu z parametrami interpretera
+import sys
+# Import modułu do tworzenia katalogów tymczasowych
+import tempfile
+# Import modułu do pomiaru czasu
+import time
+# Import prostej przestrzeni nazw udającej zdarzenie Tk
+import types
+# Import modułu tkinter do tworzenia GUI
+import tkinter as tk
+
+# Katalog pomiarów i katalog aplikacji
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+# Import mierzonej aplikacji
+from nasa_image_searcher import app as application
+from nasa_image_searcher.app import NASAImageSearcher, ImageResults, UIConfig
+
+# Próg, powyżej którego obsługa zdarzeń Tk jest uznawana za blokowanie interfejsu (w sekundach)
+BLOCKING_THRESHOLD = 0.05
+# Odstęp między obsługami zdarzeń w pętli pomiaru (w sekundach)
+TICK = 0.002
+# Mierzone wielkości, które przy wzroście oznaczają pogorszenie
+METRICS = ("first_tile", "all_tiles", "blocking", "max_block", "click")
+
+
+# Klasa zastępująca okna dialogowe - błąd przerywa pomiar zamiast czekać na użytkownika
+class FailingMessagebox:
+    # Błąd wyszukiwania
+    @staticmethod
+    def showerror(title, message):
+        raise RuntimeError(message)
+
+    # Ostrzeżenie (np. puste zapytanie)
+    @staticmethod
+    def showwarning(title, message):
+        raise RuntimeError(message)
+
+
+# Uruchomienie serwera zastępującego API; zwraca (proces, adres)
+def start_stub(args):
+    command = [sys.executable, os.path.join(BENCH_DIR, "nasa_stub.py"), "serve", "--port", "0",
+               "--latency", str(args.latency), "--image-latency", str(args.image_latency),
+               "--bandwidth", str(args.bandwidth)]
+    if args.recordings:
+        command += ["--recordings", args.recordings]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Listening on "):
+        process.kill()
+        raise RuntimeError("stub server did not start")
+    return process, line.split()[-1]
+
+
+# Czy miniatura miejsca jest wyświetlona (osobny obraz lub atlas bloku)
+def shown(results, slot):
+    if UIConfig.ATLAS:
+        return slot // results._block_size() in results.atlases
+    return slot in results.photos
+
+
+# Jedno wyszukiwanie: obsługa zdarzeń Tk do wypełnienia widocznych kafelków
+def measure(root, app, query, timeout):
+    results = app.image_results
+    entry = app.search_panel.entry
+    entry.delete(0, tk.END)
+    entry.insert(0, query)
+    start = time.perf_counter()
+    app.search_images()
+    first_tile = all_tiles = None
+    blocking = max_block = 0.0
+    while time.perf_counter() - start < timeout:
+        tick = time.perf_counter()
+        root.update()
+        elapsed = time.perf_counter() - tick
+        max_block = max(max_block, elapsed)
+        if elapsed > BLOCKING_THRESHOLD:
+            blocking += elapsed - BLOCKING_THRESHOLD
+        now = time.perf_counter() - start
+        # Do nadejścia nowych wyników widoczne są jeszcze kafelki poprzedniego zapytania
+        if not app.results_shown:
+            time.sleep(TICK)
+            continue
+        if first_tile is None and any(shown(results, slot) for slot in results.visible):
+            first_tile = now
+        if results.visible and all(shown(results, slot) for slot in results.visible):
+            all_tiles = now
+            break
+        time.sleep(TICK)
+    return {"first_tile": first_tile, "all_tiles": all_tiles, "blocking": blocking, "max_block": max_block}
+
+
+# Wskazanie myszą kafelka na środku widoku i otwarcie go po dwell sekundach: czas od
+# kliknięcia do wyświetlenia podglądu
+def measure_click(root, app, dwell, timeout):
+    results = app.image_results
+    pointer = types.SimpleNamespace(x=results.cell_width * (UIConfig.COLUMNS // 2 + 0.5),
+                                    y=results.canvas.winfo_height() / 2)
+    slot = results._slot_at(pointer)
+    if slot is None:
+        return None
+    results._on_motion(pointer)
+    end = time.perf_counter() + dwell
+    while time.perf_counter() < end:
+        root.update()
+        time.sleep(TICK)
+    item = results.items[slot]
+    start = time.perf_counter()
+    app.show_full_image(item)
+    viewer = app.viewers[ImageResults._item_id(item)]
+    click = None
+    while time.perf_counter() - start < timeout:
+        root.update()
+        if viewer.preview is not None:
+            click = time.perf_counter() - start
+            break
+        time.sleep(TICK)
+    viewer.close()
+    return click
+
+
+# Mediana wartości (pomiary bez wyniku w limicie czasu są pomijane)
+def median(values):
+    values = [value for value in values if value is not None]
+    return statistics.median(values) if values else None
+
+
+# Porównanie z poprzednim pomiarem; zwraca opisy pogorszeń
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, metrics in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        for metric in METRICS:
+            value, before = metrics.get(metric), previous.get(metric)
+            if value is None or before is None:
+                continue
+            # Drobne wartości (poniżej progu blokowania) nie są porównywane względnie
+            if value > before * (1 + tolerance) and value - before > BLOCKING_THRESHOLD:
+                regressions.append(f"{name} {metric}: {before * 1000:.0f} -> {value * 1000:.0f} ms")
+    before = baseline.get("peak_rss")
+    if before and results["peak_rss"] > before * (1 + tolerance):
+        regressions.append(f"peak RSS: {before / 2 ** 20:.0f} -> {results['peak_rss'] / 2 ** 20:.0f} MiB")
+    return regressions
+
+
+# Wartość w milisekundach do tabeli
+def ms(value):
+    return f"{value * 1000:8.0f}" if value is not None else "       -"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end search and thumbnail grid benchmark")
+    parser.add_argument("--queries", default="apollo,mars,hubble")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.1, help="API response delay in seconds")
+    parser.add_argument("--image-latency", type=float, default=0.2, help="image response delay in seconds")
+    parser.add_argument("--bandwidth", type=float, default=1024, help="per-connection limit in KiB/s (0 - none)")
+    parser.add_argument("--recordings", help="recorded /search responses (nasa_stub.py record)")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare with results of a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--atlas", action="store_true", help="render thumbnails as per-block atlases")
+    parser.add_argument("--dwell", type=float, default=1.0, help="idle seconds before opening a tile")
+    parser.add_argument("--no-prefetch", action="store_true", help="disable preview prefetching")
+    args = parser.parse_args()
+    queries = [query.strip() for query in args.queries.split(",") if query.strip()]
+
+    # Błędy wyszukiwania przerywają pomiar zamiast otwierać okno dialogowe
+    application.messagebox = FailingMessagebox
+    UIConfig.ATLAS = args.atlas
+    UIConfig.PREFETCH = not args.no_prefetch
+    stub, base_url = start_stub(args)
+    samples = {}
+    try:
+        for run in range(args.runs):
+            # Każda seria zaczyna od pustych pamięci podręcznych (dysk, wyszukiwania, indeks)
+            with tempfile.TemporaryDirectory() as directory:
+                UIConfig.CACHE_DIR = directory
+                UIConfig.SEARCH_CACHE_PATH = os.path.join(directory, "searches.sqlite")
+                UIConfig.METADATA_INDEX_PATH = os.path.join(directory, "metadata.sqlite")
+                root = tk.Tk()
+                root.geometry("1000x650")
+                app = NASAImageSearcher(root)
+                app._ensure_engine().search_url = f"{base_url}/search"
+                root.update()
+                for scenario in ("cold", "warm"):
+                    for query in queries:
+                        result = measure(root, app, query, args.timeout)
+                        result["click"] = measure_click(root, app, args.dwell, args.timeout)
+                        samples.setdefault(f"{scenario}:{query}", []).append(result)
+                app.close()
+    finally:
+        stub.kill()
+        stub.wait()
+
+    # ru_maxrss jest podawane w kilobajtach
+    results = {
+        "settings": {"latency": args.latency, "image_latency": args.image_latency,
+                     "bandwidth": args.bandwidth, "runs": args.runs, "recordings": bool(args.recordings),
+                     "atlas": args.atlas, "dwell": args.dwell, "prefetch": not args.no_prefetch},
+        "scenarios": {
+            name: {metric: median([run[metric] for run in runs]) for metric in METRICS}
+            for name, runs in samples.items()
+        },
+        "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    }
+    print(f"{'scenario':24} {'first ms':>8} {'all ms':>8} {'block ms':>8} {'max ms':>8} {'click ms':>8}")
+    for name, metrics in results["scenarios"].items():
+        print(f"{name:24} {ms(metrics['first_tile'])} {ms(metrics['all_tiles'])} "
+              f"{ms(metrics['blocking'])} {ms(metrics['max_block'])} {ms(metrics['click'])}")
+    print(f"Peak RSS: {results['peak_rss'] / 2 ** 20:.1f} MiB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
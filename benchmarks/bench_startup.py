@@ -0,0 +1,107 @@
+# Czas uruchomienia aplikacji: od startu interpretera do pokazania okna i do gotowości
+# silnika, w osobnym procesie z -X importtime.
+#
+# Użycie (wymaga ekranu, np. Xvfb):
+#     xvfb-run python benchmarks/bench_startup.py [--runs 5] [--top 10]
+#
+# Dla porównania mierzone jest też samo okno Tk bez aplikacji. Na końcu podawane są
+# moduły o największym łącznym czasie importu przed pokazaniem okna oraz to, czy ciężkie
+# zależności (PIL, aiohttp, requests) były już wtedy wczytane.
+
+# Import modułu do parsowania argumentów wiersza poleceń
+import argparse
+# Import modułu do odczytu wyników procesu potomnego
+import json
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu statystyk do wyznaczania median
+import statistics
+# Import modułu do uruchamiania procesów
+import subprocess
+# Import modułu z parametrami interpretera
+import sys
+# Import modułu do pomiaru czasu
+import time
+
+# Katalog źródeł aplikacji (dodawany do ścieżki procesu potomnego)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Zależności, które nie powinny być wczytywane przed pokazaniem okna
+HEAVY_MODULES = ("PIL", "aiohttp", "requests")
+# Proces potomny: samo okno Tk
+TK_DRIVER = """
+import sys, tkinter as tk
+root = tk.Tk()
+while not root.winfo_ismapped():
+    root.update()
+print("window", flush=True)
+root.destroy()
+"""
+# Proces potomny: okno aplikacji, a następnie utworzenie silnika
+APP_DRIVER = """
+import sys, json, tkinter as tk
+from nasa_image_searcher.app import NASAImageSearcher
+root = tk.Tk()
+app = NASAImageSearcher(root)
+while not root.winfo_ismapped():
+    root.update()
+print("window " + json.dumps([name for name in %r if name in sys.modules]), flush=True)
+print("-- window", file=sys.stderr, flush=True)
+app._ensure_engine()
+print("engine", flush=True)
+app.close()
+""" % (HEAVY_MODULES,)
+
+
+# Jedno uruchomienie: czasy pojawienia się kolejnych wierszy wyjścia i wyjście błędów
+def run(driver):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT_DIR, env.get("PYTHONPATH")]))
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-X", "importtime", "-c", driver], env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    marks = {}
+    for line in process.stdout:
+        name, _, value = line.strip().partition(" ")
+        marks[name] = (time.perf_counter() - start, value)
+    stderr = process.stderr.read()
+    if process.wait() != 0 or "window" not in marks:
+        raise RuntimeError(f"startup driver failed:\n{stderr}")
+    return marks, stderr
+
+
+# Moduły najwyższego poziomu importowane przed pokazaniem okna: (łączny czas w s, nazwa)
+def top_imports(stderr, count):
+    imports = []
+    for line in stderr.split("-- window")[0].splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Wcięcie nazwy oznacza import zagnieżdżony (wliczony w moduł nadrzędny)
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            imports.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Application startup benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to list")
+    args = parser.parse_args()
+
+    tk_window = statistics.median(run(TK_DRIVER)[0]["window"][0] for _ in range(args.runs))
+    samples = [run(APP_DRIVER) for _ in range(args.runs)]
+    window = statistics.median(marks["window"][0] for marks, _ in samples)
+    engine = statistics.median(marks["engine"][0] for marks, _ in samples)
+    marks, stderr = samples[-1]
+    print(f"Tk window alone:      {tk_window * 1000:6.0f} ms")
+    print(f"Application window:   {window * 1000:6.0f} ms")
+    print(f"Engine ready:         {engine * 1000:6.0f} ms")
+    loaded = json.loads(marks["window"][1])
+    print(f"Heavy modules loaded before window: {', '.join(loaded) or 'none'}")
+    print("Slowest imports before window:")
+    for cumulative, name in top_imports(stderr, args.top):
+        print(f"  {cumulative * 1000:6.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
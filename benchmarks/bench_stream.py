@@ -0,0 +1,141 @@
+# Porównanie pamięci pobierania obrazów: całe ciało odpowiedzi w pamięci (requests)
+# kontra pobieranie strumieniowe z dekodowaniem w locie (SearchEngine.fetch_image).
+#
+# Użycie:
+#     python benchmarks/bench_stream.py [--size 8000x6000]
+#
+# Obrazy są serwowane przez lokalny serwer HTTP. Mierzone jest szczytowe zużycie pamięci
+# obiektów Pythona (tracemalloc) - czyli kopie pobranych bajtów; piksele zdekodowanego
+# obrazu alokuje Pillow poza tracemalloc, więc ich rozmiar podajemy osobno.
+
+# Import modułu do parsowania argumentów wiersza poleceń
+import argparse
+# Import pętli zdarzeń asyncio
+import asyncio
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu z parametrami interpretera
+import sys
+# Import modułu do tworzenia katalogów tymczasowych
+import tempfile
+# Import modułu do uruchomienia serwera w osobnym wątku
+import threading
+# Import modułu do pomiaru czasu
+import time
+# Import modułu do śledzenia alokacji pamięci
+import tracemalloc
+# Import modułu do serwowania plików przez HTTP
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+# Import klienta HTTP używanego przez dotychczasową ścieżkę
+import requests
+# Import modułu do pracy z obrazami
+from PIL import Image
+
+# Dostęp do modułów aplikacji z katalogu nadrzędnego
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import porównywanych ścieżek pobierania
+from nasa_image_searcher.imaging import open_image, decode_thumbnail, ImageLimitError
+from nasa_image_searcher.nasa_client import AsyncHTTPClient
+from nasa_image_searcher.image_cache import ImageCache
+from nasa_image_searcher.engine import SearchEngine
+
+# Rozmiar miniatury używany przez aplikację
+THUMB_SIZE = (180, 180)
+
+
+# Serwer plików bez logowania każdego żądania
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    # Klient przerywa pobieranie odrzuconego obrazu - to nie jest błąd serwera
+    def copyfile(self, source, outputfile):
+        try:
+            super().copyfile(source, outputfile)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+# Uruchomienie lokalnego serwera HTTP w osobnym wątku; zwraca adres bazowy
+def serve(directory):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=directory))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# Pomiar szczytowej pamięci obiektów Pythona podczas wykonania funkcji
+def measure(func):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        result = func()
+    finally:
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, peak, elapsed
+
+
+# Dotychczasowa ścieżka: requests.get(url).content i dekodowanie z bajtów
+def buffered(url, size):
+    data = requests.get(url, timeout=30).content
+    if size:
+        return decode_thumbnail(data, size)
+    return open_image(data)
+
+
+# Ścieżka strumieniowa silnika (nowa pamięć podręczna przy każdym pomiarze)
+def streamed(url, size, cache_dir, max_pixels=None):
+    async def run():
+        engine = SearchEngine(AsyncHTTPClient(), ImageCache(cache_dir, 10 ** 10, 0), THUMB_SIZE,
+                              max_pixels=max_pixels, max_bytes=None)
+        try:
+            return await engine.fetch_image(url, size)
+        finally:
+            await engine.close()
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", default="8000x6000")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Szum daje rozmiar pliku zbliżony do zdjęć (gradient kompresuje się zbyt dobrze)
+        path = os.path.join(directory, "large.jpg")
+        noise = Image.effect_noise((width, height), 48)
+        Image.merge("RGB", (noise, noise.transpose(Image.Transpose.ROTATE_180), noise)).save(path, quality=90)
+        del noise
+        file_mb = os.path.getsize(path) / 2 ** 20
+        print(f"Source: {width}x{height} JPEG, {file_mb:.1f} MiB, "
+              f"{width * height * 3 / 2 ** 20:.0f} MiB decoded")
+
+        server, base = serve(directory)
+        url = f"{base}/large.jpg"
+        try:
+            for label, size in (("full", None), ("thumbnail", THUMB_SIZE)):
+                for method, func in (
+                    ("buffered", lambda: buffered(url, size)),
+                    ("streamed", lambda: streamed(url, size, tempfile.mkdtemp(dir=directory))),
+                ):
+                    img, peak, elapsed = measure(func)
+                    print(f"{label:9} {method}: traced peak {peak / 2 ** 20:6.1f} MiB, "
+                          f"{elapsed:.2f}s -> {img.size[0]}x{img.size[1]}")
+
+            # Odrzucenie zbyt dużego obrazu po odczycie nagłówka
+            limit = width * height // 4
+            try:
+                streamed(url, None, tempfile.mkdtemp(dir=directory), max_pixels=limit)
+                print("limit: image was not rejected")
+            except ImageLimitError as e:
+                print(f"limit ({limit} pixels): rejected - {e}")
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
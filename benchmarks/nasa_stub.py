@@ -0,0 +1,297 @@
+# Lokalny serwer zastępujący API NASA w pomiarach: odpowiedzi wyszukiwarki odtwarzane
+# z nagrań (lub generowane), obrazy generowane deterministycznie, z regulowanym
+# opóźnieniem i przepustowością.
+#
+# Użycie:
+#     python benchmarks/nasa_stub.py serve [--port 8765] [--recordings DIR]
+#                                          [--latency 0.1] [--image-latency 0.2] [--bandwidth 2048]
+#     python benchmarks/nasa_stub.py record --queries apollo,mars --pages 2 --out DIR
+#
+# Nagrania to odpowiedzi prawdziwego /search zapisane przez "record" (jeden plik na stronę).
+# Adresy NASA w odpowiedziach są przy odtwarzaniu zamieniane na adres serwera, a każdy
+# obraz i manifest zasobów (collection.json) jest generowany na podstawie ścieżki.
+
+# Import modułu do parsowania argumentów wiersza poleceń
+import argparse
+# Import modułu do wyznaczania nazw plików nagrań
+import hashlib
+# Import modułu do zapisu i odczytu odpowiedzi JSON
+import json
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu do losowania treści obrazów
+import random
+# Import modułu z parametrami interpretera
+import sys
+# Import blokady chroniącej pamięć wygenerowanych obrazów
+import threading
+# Import modułu do opóźnień i pomiaru czasu
+import time
+# Import uporządkowanego słownika do realizacji LRU
+from collections import OrderedDict
+# Import wielowątkowego serwera HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+# Import modułu do pracy z danymi binarnymi
+from io import BytesIO
+# Import funkcji do rozkładu adresów
+from urllib.parse import urlsplit, parse_qsl, urlencode
+# Import modułu do pracy z obrazami
+from PIL import Image
+
+# Dostęp do modułów aplikacji z katalogu nadrzędnego
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Import normalizacji parametrów zapytania (klucze nagrań)
+from nasa_image_searcher.search_cache import normalize_key
+
+# Adres prawdziwej wyszukiwarki (tryb nagrywania)
+NASA_SEARCH_URL = "https://images-api.nasa.gov/search"
+# Hosty NASA zamieniane w nagraniach na adres serwera
+NASA_HOSTS = ("https://images-api.nasa.gov", "http://images-api.nasa.gov",
+              "https://images-assets.nasa.gov", "http://images-assets.nasa.gov")
+# Wymiary generowanych wersji obrazów (jak typowe zdjęcia w bibliotece NASA)
+RENDITION_SIZES = {
+    "thumb": (320, 240), "small": (640, 480), "medium": (1280, 960),
+    "large": (1920, 1440), "orig": (4000, 3000),
+}
+# Budżet pamięci wygenerowanych obrazów w bajtach
+IMAGE_CACHE_BYTES = 256 * 2 ** 20
+# Wielkość fragmentu wysyłanego przy ograniczonej przepustowości
+CHUNK_SIZE = 16 * 1024
+
+
+# Klucz nagrania strony wyników (strona pierwsza może nie mieć parametru page)
+def recording_key(params):
+    params = {name: value for name, value in params.items() if name in ("q", "media_type", "page")}
+    params.setdefault("page", "1")
+    return hashlib.sha1(normalize_key(params).encode("utf-8")).hexdigest()[:20]
+
+
+# Nazwa wersji obrazu z nazwy pliku (np. PIA00001~medium.jpg -> medium)
+def rendition_name(path):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem.rsplit("~", 1)[-1] if "~" in stem else "orig"
+
+
+# Wygenerowanie obrazu JPEG o treści zależnej tylko od ścieżki (plamy barw, które
+# kompresują się podobnie jak zdjęcia)
+def generate_image(path, size):
+    rng = random.Random(path)
+    small = (max(1, size[0] // 16), max(1, size[1] // 16))
+    img = Image.frombytes("RGB", small, rng.randbytes(small[0] * small[1] * 3))
+    img = img.resize(size, Image.Resampling.BICUBIC)
+    buffer = BytesIO()
+    img.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+# Klasa syntetycznych wyników wyszukiwania (gdy brak nagrania dla zapytania)
+class SyntheticResults:
+    # Inicjalizacja generatora
+    def __init__(self, items_per_page=100, pages=5):
+        self.items_per_page = items_per_page
+        self.pages = pages
+
+    # Strona wyników w formacie API
+    def page(self, base, params):
+        query = params.get("q", "")
+        page = int(params.get("page", "1"))
+        items = []
+        for i in range(self.items_per_page):
+            nasa_id = f"{''.join(ch for ch in query if ch.isalnum())}{page:02d}{i:03d}"
+            items.append({
+                "href": f"{base}/image/{nasa_id}/collection.json",
+                "data": [{
+                    "nasa_id": nasa_id, "title": f"{query} {page}-{i}", "media_type": "image",
+                    "description": f"Synthetic result {i} of page {page} for {query}.",
+                    "keywords": query.split(), "date_created": "2020-01-01T00:00:00Z",
+                }],
+                "links": [{"href": f"{base}/image/{nasa_id}/{nasa_id}~thumb.jpg",
+                           "rel": "preview", "render": "image"}],
+            })
+        links = []
+        if page < self.pages:
+            links.append({"rel": "next", "prompt": "Next", "href": f"{base}/search?" + urlencode(
+                {"q": query, "page": page + 1, "media_type": params.get("media_type", "image")}
+            )})
+        return {"collection": {"version": "1.0", "href": f"{base}/search", "items": items, "links": links,
+                               "metadata": {"total_hits": self.items_per_page * self.pages}}}
+
+
+# Klasa serwera zastępującego API NASA
+class StubServer(ThreadingHTTPServer):
+    # Wątki obsługi nie blokują zakończenia procesu
+    daemon_threads = True
+
+    # Inicjalizacja serwera
+    def __init__(self, address, recordings=None, latency=0.0, image_latency=0.0, bandwidth=0,
+                 synthetic=None):
+        super().__init__(address, StubHandler)
+        # Katalog nagrań odpowiedzi wyszukiwarki
+        self.recordings = recordings
+        # Opóźnienie odpowiedzi API i obrazów (w sekundach, do pierwszego bajtu)
+        self.latency = latency
+        self.image_latency = image_latency
+        # Przepustowość jednego połączenia w bajtach na sekundę (0 - bez ograniczenia)
+        self.bandwidth = bandwidth
+        # Generator wyników dla zapytań bez nagrania
+        self.synthetic = synthetic or SyntheticResults()
+        # Wygenerowane obrazy (ścieżka -> bajty), od najdawniej użytego
+        self.images = OrderedDict()
+        self.images_size = 0
+        self.lock = threading.Lock()
+        # Liczniki obsłużonych żądań i wysłanych bajtów
+        self.requests = 0
+        self.sent = 0
+
+    # Adres serwera widziany przez klienta
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # Odpowiedź wyszukiwarki: nagranie (z adresami zamienionymi na lokalne) lub wyniki syntetyczne
+    def search_response(self, params):
+        if self.recordings:
+            path = os.path.join(self.recordings, recording_key(params) + ".json")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    text = f.read()
+                for host in NASA_HOSTS:
+                    text = text.replace(host, self.base_url)
+                return text.encode("utf-8")
+        return json.dumps(self.synthetic.page(self.base_url, params)).encode("utf-8")
+
+    # Manifest zasobów elementu: wszystkie generowane wersje
+    def manifest_response(self, path):
+        directory = path.rsplit("/", 1)[0]
+        nasa_id = directory.rsplit("/", 1)[-1]
+        return json.dumps([
+            f"{self.base_url}{directory}/{nasa_id}~{name}.jpg" for name in RENDITION_SIZES
+        ] + [f"{self.base_url}{directory}/metadata.json"]).encode("utf-8")
+
+    # Obraz dla ścieżki (generowany raz i przechowywany w pamięci)
+    def image_response(self, path):
+        with self.lock:
+            data = self.images.get(path)
+            if data is not None:
+                self.images.move_to_end(path)
+                return data
+        data = generate_image(path, RENDITION_SIZES.get(rendition_name(path), RENDITION_SIZES["orig"]))
+        with self.lock:
+            if path not in self.images:
+                self.images[path] = data
+                self.images_size += len(data)
+            while self.images_size > IMAGE_CACHE_BYTES and len(self.images) > 1:
+                _, evicted = self.images.popitem(last=False)
+                self.images_size -= len(evicted)
+        return data
+
+
+# Klasa obsługi żądań serwera
+class StubHandler(BaseHTTPRequestHandler):
+    # Połączenia utrzymywane między żądaniami, jak w prawdziwym API
+    protocol_version = "HTTP/1.1"
+
+    # Obsługa żądania GET
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        if parts.path == "/search":
+            latency, content_type = server.latency, "application/json"
+            body = server.search_response(dict(parse_qsl(parts.query)))
+        elif parts.path.endswith("collection.json"):
+            latency, content_type = server.latency, "application/json"
+            body = server.manifest_response(parts.path)
+        elif parts.path.lower().endswith((".jpg", ".jpeg")):
+            latency, content_type = server.image_latency, "image/jpeg"
+            body = server.image_response(parts.path)
+        else:
+            self.send_error(404)
+            return
+        if latency:
+            time.sleep(latency)
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self._send_body(body)
+        with server.lock:
+            server.requests += 1
+            server.sent += len(body)
+
+    # Wysłanie treści z ograniczeniem przepustowości
+    def _send_body(self, body):
+        bandwidth = self.server.bandwidth
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        start = time.perf_counter()
+        for offset in range(0, len(body), CHUNK_SIZE):
+            self.wfile.write(body[offset:offset + CHUNK_SIZE])
+            # Oczekiwanie, aż czas wysyłania odpowiada zadanej przepustowości
+            delay = (offset + CHUNK_SIZE) / bandwidth - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+
+    # Wyciszenie logu każdego żądania
+    def log_message(self, format, *args):
+        pass
+
+
+# Nagranie odpowiedzi prawdziwej wyszukiwarki do katalogu
+def record(queries, pages, directory):
+    # Import biblioteki HTTP tylko w trybie nagrywania
+    import requests
+    os.makedirs(directory, exist_ok=True)
+    for query in queries:
+        url, params = NASA_SEARCH_URL, {"q": query, "media_type": "image"}
+        for page in range(1, pages + 1):
+            response = requests.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            key_params = dict(parse_qsl(urlsplit(response.url).query))
+            with open(os.path.join(directory, recording_key(key_params) + ".json"), "w", encoding="utf-8") as f:
+                f.write(response.text)
+            data = response.json()
+            print(f"{query} page {page}: {len(data['collection'].get('items', []))} items")
+            url = next((link["href"] for link in data["collection"].get("links", [])
+                        if link.get("rel") == "next"), None)
+            params = None
+            if url is None:
+                break
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local NASA Image API stand-in for benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="serve recorded or synthetic responses")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765, help="0 - any free port")
+    serve.add_argument("--recordings", help="directory written by 'record'")
+    serve.add_argument("--latency", type=float, default=0.0, help="API response delay in seconds")
+    serve.add_argument("--image-latency", type=float, default=0.0, help="image response delay in seconds")
+    serve.add_argument("--bandwidth", type=float, default=0, help="per-connection limit in KiB/s (0 - none)")
+    serve.add_argument("--items", type=int, default=100, help="synthetic results per page")
+    serve.add_argument("--pages", type=int, default=5, help="synthetic result pages")
+    rec = commands.add_parser("record", help="record real /search responses")
+    rec.add_argument("--queries", required=True, help="comma-separated queries")
+    rec.add_argument("--pages", type=int, default=1)
+    rec.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record([q.strip() for q in args.queries.split(",") if q.strip()], args.pages, args.out)
+        return
+    server = StubServer(
+        (args.host, args.port), args.recordings, args.latency, args.image_latency,
+        int(args.bandwidth * 1024), SyntheticResults(args.items, args.pages)
+    )
+    # Pierwszy wiersz wyjścia podaje adres (harness odczytuje go przy porcie 0)
+    print(f"Listening on {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
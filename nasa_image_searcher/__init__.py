@@ -0,0 +1,3 @@
+# Przeglądarka NASA Image and Video Library: interfejs Tk (app), asynchroniczny silnik
+# (engine) i narzędzia wiersza poleceń. Pakiet celowo niczego nie importuje - ciężkie
+# zależności (PIL, aiohttp) są wczytywane dopiero wtedy, gdy są potrzebne.
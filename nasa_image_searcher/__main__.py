@@ -0,0 +1,6 @@
+# Uruchomienie aplikacji poleceniem: python -m nasa_image_searcher
+
+# Import punktu wejścia aplikacji
+from .app import main
+
+main()
@@ -0,0 +1,1310 @@
+# Import modułu tkinter do tworzenia GUI
+import tkinter as tk
+# Import dodatkowych komponentów z tkinter
+from tkinter import messagebox, scrolledtext
+# Import modułu do budowania ścieżek
+import os
+# Import modułu do parsowania argumentów wiersza poleceń
+import argparse
+# Import modułu do obliczeń poziomu piramidy
+import math
+# Import domyślnych ustawień pamięci podręcznej, limitów obrazów i piramid kafelków
+# (PIL, klient HTTP i silnik są wczytywane dopiero po pokazaniu okna - patrz _ensure_engine)
+from .defaults import (DEFAULT_DIR, DEFAULT_MAX_BYTES, DEFAULT_MAX_AGE, MAX_IMAGE_PIXELS, MAX_IMAGE_BYTES,
+                       DEFAULT_MEMORY_BUDGET, PYRAMIDS_KEEP, THUMB_SIZE)
+# Import wspólnej pamięci podręcznej zdekodowanych obrazów
+from .memory_cache import MemoryCache, DEFAULT_MAX_BYTES as DEFAULT_MEMORY_BYTES
+# Import pamięci podręcznej odpowiedzi wyszukiwarki
+from .search_cache import SearchCache, DEFAULT_TTL, DEFAULT_MAX_ENTRIES
+# Import bufora komunikatów logu (z opcjonalnym plikiem rotowanym)
+from .log_sink import LogSink, DEFAULT_CAPACITY as DEFAULT_LOG_BUFFER, DEFAULT_FILE_BYTES, DEFAULT_BACKUPS
+# Import mostu do pętli asyncio i znacznika anulowania pracy
+from .bridge import EngineBridge, CancelToken
+# Import profilera etapów
+from . import profiler
+
+# Klasa przechowująca konfigurację interfejsu użytkownika
+class UIConfig:
+    # Ustawienia czcionki
+    FONT = ("Consolas", 12)
+    # Kolor tła
+    BG_COLOR = "black"
+    # Kolor tekstu
+    FG_COLOR = "green"
+    # Liczba miniatur dokładanych naraz (pierwsza porcja i każde doczytanie)
+    IMAGE_LIMIT = 15
+    # Liczba kolumn siatki miniatur
+    COLUMNS = 3
+    # Pozycja przewijania (0-1), od której doczytujemy kolejne wyniki
+    LOAD_MORE_AT = 0.9
+    # Liczba wierszy rysowanych z zapasem powyżej i poniżej widoku
+    OVERSCAN_ROWS = 2
+    # Odstęp wokół kafelka
+    TILE_PAD = 10
+    # Wysokość miejsca na tytuł pod miniaturą
+    TITLE_HEIGHT = 50
+    # Maksymalna długość wyświetlanego tytułu
+    TITLE_CHARS = 60
+    # Rozmiar kafelka z miniaturą
+    THUMB_SIZE = THUMB_SIZE
+    # Liczba miniatur pobieranych równolegle
+    THUMBNAIL_WORKERS = 8
+    # Czy wyświetlać miniatury bloku wierszy jako jeden obraz (atlas) zamiast osobnych obrazów Tk
+    ATLAS = False
+    # Liczba wierszy siatki w jednym atlasie
+    ATLAS_ROWS = 5
+    # Liczba procesów dekodujących miniatury (0 - dekodowanie w wątkach, os.cpu_count() - wszystkie rdzenie)
+    DECODE_PROCESSES = 0
+    # Odstęp (w ms) między sprawdzeniami kolejki wyników silnika
+    POLL_INTERVAL_MS = 50
+    # Opóźnienie (w ms) od pokazania okna do wczytania silnika (PIL, klient HTTP);
+    # wyszukiwanie przed tym czasem wczytuje silnik od razu
+    ENGINE_START_DELAY_MS = 100
+    # Katalog dyskowej pamięci podręcznej obrazów
+    CACHE_DIR = DEFAULT_DIR
+    # Budżet pamięci podręcznej w bajtach
+    CACHE_MAX_BYTES = DEFAULT_MAX_BYTES
+    # Czas (w sekundach), po którym wpis jest ponownie sprawdzany na serwerze
+    CACHE_MAX_AGE = DEFAULT_MAX_AGE
+    # Budżet (w bajtach) pamięci zdekodowanych miniatur, podglądów i kafelków przeglądarki
+    MEMORY_CACHE_BYTES = DEFAULT_MEMORY_BYTES
+    # Czas życia (w sekundach) zapamiętanych wyników wyszukiwania
+    SEARCH_CACHE_TTL = DEFAULT_TTL
+    # Maksymalna liczba zapamiętanych odpowiedzi wyszukiwarki
+    SEARCH_CACHE_SIZE = DEFAULT_MAX_ENTRIES
+    # Plik SQLite z zapamiętanymi wynikami (None - tylko w pamięci)
+    SEARCH_CACHE_PATH = os.path.join(CACHE_DIR, "searches.sqlite")
+    # Plik SQLite z indeksem pełnotekstowym metadanych pobranych elementów (None - tylko w pamięci)
+    METADATA_INDEX_PATH = os.path.join(CACHE_DIR, "metadata.sqlite")
+    # Czy odpowiadać na zapytania od razu z lokalnego indeksu
+    LOCAL_SEARCH = True
+    # Czy równolegle pytać API NASA (False - wyszukiwanie wyłącznie lokalne)
+    REMOTE_SEARCH = True
+    # Maksymalna liczba wyników z lokalnego indeksu
+    LOCAL_RESULTS = 100
+    # Czy wyszukiwać w trakcie pisania (bez Enter)
+    LIVE_SEARCH = False
+    # Czas (w ms) od ostatniego naciśnięcia klawisza do wysłania zapytania
+    LIVE_SEARCH_DELAY_MS = 300
+    # Najkrótsze zapytanie wysyłane w trakcie pisania
+    LIVE_SEARCH_MIN_CHARS = 2
+    # Limit liczby pikseli pobieranego obrazu (większe są odrzucane po odczycie nagłówka)
+    IMAGE_MAX_PIXELS = MAX_IMAGE_PIXELS
+    # Limit wielkości pobieranego obrazu w bajtach
+    IMAGE_MAX_BYTES = MAX_IMAGE_BYTES
+    # Czy pobierać z wyprzedzeniem podglądy kafelków w widoku i pod kursorem
+    PREFETCH = True
+    # Budżet (w bajtach) podglądów pobieranych z wyprzedzeniem w ramach jednego wyszukiwania
+    PREFETCH_BYTES = 64 * 2 ** 20
+    # Limit przepustowości pobierania z wyprzedzeniem (w bajtach na sekundę, 0 - bez limitu)
+    PREFETCH_RATE = 2 * 2 ** 20
+    # Rozmiar okna przeglądarki pełnego obrazu
+    VIEWER_SIZE = (1000, 700)
+    # Budżet pamięci (w bajtach) na zdekodowane piksele podczas budowy piramidy kafelków
+    VIEWER_MEMORY_BUDGET = DEFAULT_MEMORY_BUDGET
+    # Największe powiększenie (piksele ekranu na piksel oryginału)
+    VIEWER_MAX_ZOOM = 4.0
+    # Krok powiększenia kółkiem myszy
+    VIEWER_ZOOM_STEP = 1.25
+    # Liczba piramid kafelków zachowywanych na dysku
+    PYRAMIDS_KEEP = PYRAMIDS_KEEP
+    # Czy mierzyć czasy etapów (żądania, pobieranie, dekodowanie, rysowanie)
+    PROFILE = False
+    # Plik JSON Lines z pomiarami etapów (None - tylko podsumowanie w logu)
+    PROFILE_PATH = os.path.join(CACHE_DIR, "profile.jsonl")
+    # Odstęp (w ms) między podsumowaniami pomiarów w logu
+    PROFILE_SUMMARY_MS = 5000
+    # Liczba ostatnich wierszy zachowywanych w polu logu
+    LOG_LINES = 1000
+    # Liczba komunikatów czekających na wyświetlenie (nadmiarowe najstarsze są pomijane)
+    LOG_BUFFER = DEFAULT_LOG_BUFFER
+    # Odstęp (w ms) między wstawieniami porcji komunikatów do pola logu
+    LOG_FLUSH_MS = 100
+    # Plik z pełnym logiem (None - tylko pole logu)
+    LOG_PATH = None
+    # Rozmiar pliku logu (w bajtach), po którym plik jest rotowany
+    LOG_FILE_BYTES = DEFAULT_FILE_BYTES
+    # Liczba zachowywanych starszych plików logu
+    LOG_FILE_BACKUPS = DEFAULT_BACKUPS
+
+# Klasa implementująca pole do logowania zdarzeń
+class LogBox(scrolledtext.ScrolledText):
+    # Inicjalizacja komponentu
+    def __init__(self, parent):
+        # Wywołanie konstruktora klasy nadrzędnej
+        super().__init__(
+            parent, width=40, height=30, font=UIConfig.FONT,
+            fg=UIConfig.FG_COLOR, bg=UIConfig.BG_COLOR,
+            insertbackground=UIConfig.FG_COLOR, state="normal"
+        )
+        # Ustawienie pozycji komponentu
+        self.pack(side="right", padx=10, pady=10, fill="y")
+        # Bufor komunikatów wstawianych do pola porcjami
+        self.sink = LogSink(UIConfig.LOG_BUFFER, UIConfig.LOG_PATH, UIConfig.LOG_FILE_BYTES,
+                            UIConfig.LOG_FILE_BACKUPS)
+        # Liczba wierszy w polu (bez odpytywania widżetu)
+        self.line_count = 0
+        self.after(UIConfig.LOG_FLUSH_MS, self._tick)
+
+    # Metoda do dodawania tekstu do logu (można wywołać z dowolnego wątku)
+    def log(self, text):
+        self.sink.put(text)
+
+    # Wstawienie oczekujących komunikatów jednym wywołaniem i usunięcie najstarszych wierszy
+    def _flush(self):
+        lines = self.sink.drain()[-UIConfig.LOG_LINES:]
+        if lines:
+            # Wstawienie tekstu na koniec pola
+            self.insert(tk.END, "\n".join(lines) + "\n")
+            self.line_count += sum(line.count("\n") + 1 for line in lines)
+            excess = self.line_count - UIConfig.LOG_LINES
+            if excess > 0:
+                self.delete("1.0", f"{excess + 1}.0")
+                self.line_count -= excess
+            # Przewinięcie do końca
+            self.see(tk.END)
+
+    # Cykliczne wstawianie komunikatów
+    def _tick(self):
+        self._flush()
+        self.after(UIConfig.LOG_FLUSH_MS, self._tick)
+
+    # Wyświetlenie ostatnich komunikatów i zamknięcie pliku logu
+    def close(self):
+        self._flush()
+        self.sink.close()
+
+# Klasa panelu wyszukiwania
+class SearchPanel(tk.Frame):
+    # Inicjalizacja komponentu
+    def __init__(self, parent, search_callback, live=False):
+        # Wywołanie konstruktora klasy nadrzędnej
+        super().__init__(parent, bg=UIConfig.BG_COLOR)
+        # Ustawienie odstępów
+        self.pack(pady=10)
+        # Funkcja wyszukująca (live=True - zapytanie wysłane w trakcie pisania)
+        self.search_callback = search_callback
+        # Zaplanowane wyszukiwanie w trakcie pisania
+        self.pending = None
+        # Ostatnie zapytanie wysłane w trakcie pisania
+        self.last_query = None
+
+        # Tworzenie pola wprowadzania tekstu
+        self.entry = tk.Entry(
+            self, width=50, font=UIConfig.FONT,
+            fg=UIConfig.FG_COLOR, bg=UIConfig.BG_COLOR,
+            insertbackground=UIConfig.FG_COLOR
+        )
+        # Ustawienie pozycji pola
+        self.entry.pack(side=tk.LEFT, padx=5)
+        # Powiązanie zdarzenia Enter z funkcją callback
+        self.entry.bind("<Return>", lambda e: self.search())
+        # Wyszukiwanie w trakcie pisania - zapytanie jest wysyłane po przerwie w pisaniu
+        if live:
+            self.entry.bind("<KeyRelease>", self._on_key)
+
+        # Tworzenie przycisku wyszukiwania
+        self.button = tk.Button(
+            self, text="Search", command=self.search,
+            font=UIConfig.FONT, fg=UIConfig.FG_COLOR,
+            bg=UIConfig.BG_COLOR, relief="solid"
+        )
+        # Ustawienie pozycji przycisku
+        self.button.pack(side=tk.LEFT)
+
+    # Metoda pobierająca zapytanie z pola tekstowego
+    def get_query(self):
+        # Zwraca wprowadzony tekst bez białych znaków na końcach
+        return self.entry.get().strip()
+
+    # Wyszukiwanie na żądanie (Enter lub przycisk)
+    def search(self):
+        self._cancel_pending()
+        self.last_query = self.get_query()
+        self.search_callback()
+
+    # Odłożenie wyszukiwania do przerwy w pisaniu
+    def _on_key(self, event):
+        self._cancel_pending()
+        self.pending = self.after(UIConfig.LIVE_SEARCH_DELAY_MS, self._live_search)
+
+    # Anulowanie zaplanowanego wyszukiwania
+    def _cancel_pending(self):
+        if self.pending is not None:
+            self.after_cancel(self.pending)
+            self.pending = None
+
+    # Wyszukiwanie po przerwie w pisaniu (klawisze nie zmieniające tekstu są pomijane)
+    def _live_search(self):
+        self.pending = None
+        query = self.get_query()
+        if query == self.last_query or len(query) < UIConfig.LIVE_SEARCH_MIN_CHARS:
+            return
+        self.last_query = query
+        self.search_callback(live=True)
+
+# Klasa wyświetlająca wyniki wyszukiwania obrazów jako wirtualną siatkę na Canvas:
+# rysowane są tylko kafelki widocznych wierszy (plus zapas), a elementy Canvas są
+# przenoszone między miejscami zamiast tworzenia nowych widżetów dla każdego wyniku
+class ImageResults(tk.Frame):
+    # Inicjalizacja komponentu
+    def __init__(self, parent, log_callback, preview_callback, engine, bridge, memory, prefetcher=None):
+        # Wywołanie konstruktora klasy nadrzędnej
+        super().__init__(parent, bg=UIConfig.BG_COLOR)
+        # Tworzenie canvas do przewijania
+        self.canvas = tk.Canvas(self, bg=UIConfig.BG_COLOR, highlightthickness=0, cursor="hand2")
+        # Tworzenie paska przewijania
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        # Konfiguracja przewijania canvas - każda zmiana pozycji odświeża widoczne kafelki
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+
+        # Ustawienie pozycji paska przewijania
+        self.scrollbar.pack(side="left", fill="y")
+        # Ustawienie pozycji canvas
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        # Powiązanie zdarzenia scrollowania myszy
+        self.canvas.bind_all("<MouseWheel>", self._on_mouse_wheel)
+        # Zmiana rozmiaru okna zmienia liczbę widocznych wierszy
+        self.canvas.bind("<Configure>", lambda e: self._schedule_render())
+        # Kliknięcie w kafelek otwiera podgląd pełnego obrazu
+        self.canvas.bind("<Button-1>", self._on_click)
+        # Wskazanie kafelka myszą pobiera jego podgląd z wyprzedzeniem
+        self.canvas.bind("<Motion>", self._on_motion)
+
+        # Ustawienie pozycji głównej ramki
+        self.pack(fill="both", expand=True)
+
+        # Przypisanie funkcji callback
+        self.log = log_callback
+        self.preview = preview_callback
+        # Silnik pobierający miniatury i most do jego pętli zdarzeń
+        self.engine = engine
+        self.bridge = bridge
+        # Wspólna pamięć zdekodowanych obrazów - miniatury poprzednich wyników są w niej
+        # dostępne od razu, bez pobierania i dekodowania
+        self.memory = memory
+        # Opcjonalne pobieranie podglądów z wyprzedzeniem
+        self.prefetcher = prefetcher
+
+        # Wymiary komórki siatki
+        self.cell_width = UIConfig.THUMB_SIZE[0] + 2 * UIConfig.TILE_PAD
+        self.cell_height = UIConfig.THUMB_SIZE[1] + UIConfig.TITLE_HEIGHT + 2 * UIConfig.TILE_PAD
+        # Wolne elementy Canvas (obraz, tytuł) do ponownego użycia
+        self.pool = []
+        # Kafelki przypisane do miejsc w siatce (miejsce -> (obraz, tytuł))
+        self.visible = {}
+        # Obrazy Tk kafelków w pobliżu widoku (miejsce -> PhotoImage); wyświetlane obrazy
+        # pozostają tu, nawet gdy zostaną usunięte z pamięci podręcznej
+        self.photos = {}
+        # Czy odświeżenie widoku jest już zaplanowane
+        self.render_pending = False
+        # Kafelki poprzednich wyników czekające na ponowne użycie (identyfikator -> (kafelek, obraz))
+        self.kept = {}
+        # Tryb atlasu: elementy Canvas bloków w widoku (blok -> element), wolne elementy
+        # i atlasy wyświetlanych bloków (blok -> (klucz, PhotoImage))
+        self.blocks = {}
+        self.block_pool = []
+        self.atlases = {}
+        # Bloki obejmujące widoczne miejsca
+        self.block_range = range(0)
+
+        # Stan przewijanej listy wyników
+        self._reset()
+
+    # Wyzerowanie stanu listy wyników
+    def _reset(self):
+        # Wyświetlane elementy - pozycja na liście wyznacza miejsce w siatce
+        self.items = []
+        # Elementy z pobranych stron, które nie zostały jeszcze dołożone do siatki
+        self.buffer = []
+        # Identyfikatory elementów w siatce i w buforze (wyniki lokalne i zdalne się powtarzają)
+        self.seen = set()
+        # Adres następnej strony wyników
+        self.next_url = None
+        # Czy trwa pobieranie kolejnej strony
+        self.page_loading = False
+        # Czy użytkownik dotarł do końca listy i czeka na kolejną stronę
+        self.want_more = False
+        # Miejsca, dla których zlecono pobranie miniatury
+        self.requested = set()
+        # Bloki, dla których zlecono złożenie atlasu (blok -> klucz atlasu)
+        self.requested_blocks = {}
+        # Miejsca z pustą komórką w atlasie (miniatura nie została pobrana)
+        self.missing_slots = set()
+        # Miejsca, których miniatury silnik pobiera w pierwszej kolejności
+        self.focused = None
+        # Znacznik pokolenia - pobrania poprzednich wyników są anulowane przy czyszczeniu
+        self.token = CancelToken()
+        # Miejsce pod kursorem myszy
+        self.hovered = None
+        if self.prefetcher is not None:
+            self.prefetcher.reset()
+        # Aktualny obszar przewijania
+        self.scroll_region = None
+
+    # Obsługa scrollowania myszą
+    def _on_mouse_wheel(self, event):
+        # Przewijanie w górę lub w dół
+        self.canvas.yview_scroll(-1 * (event.delta // 120), "units")
+
+    # Obsługa zmiany pozycji przewijania
+    def _on_scroll(self, first, last):
+        # Aktualizacja paska przewijania
+        self.scrollbar.set(first, last)
+        self._schedule_render()
+
+    # Zaplanowanie odświeżenia widoku raz na cykl pętli Tk
+    def _schedule_render(self):
+        if not self.render_pending:
+            self.render_pending = True
+            self.after_idle(self._render)
+
+    # Anulowanie pobrań stron i miniatur bieżących wyników
+    def cancel(self):
+        self.token.cancel()
+        self.token = CancelToken()
+        self.requested.clear()
+        self.requested_blocks.clear()
+        self.page_loading = False
+
+    # Czyszczenie wyników
+    def clear(self):
+        # Przerwanie pobrań poprzednich wyników - ich miniatury nie trafią do nowych kafelków
+        self.token.cancel()
+        # Zwrócenie wszystkich kafelków do puli (elementy Canvas nie są usuwane)
+        for slot in list(self.visible):
+            self._release(slot)
+        for block in list(self.blocks):
+            self._release_block(block)
+        # Powrót na początek listy
+        self.canvas.yview_moveto(0)
+        self._reset()
+        self._schedule_render()
+
+    # Wyświetlenie pierwszej strony nowych wyników. Kafelki elementów obecnych także
+    # w poprzednich wynikach (ten sam nasa_id) są zachowywane wraz z miniaturą
+    # i przenoszone na nowe miejsca zamiast pobierania obrazu od nowa.
+    def show_page(self, page):
+        self.token.cancel()
+        for tile, photo in self.kept.values():
+            self._recycle(tile)
+        self.kept = {}
+        for slot in list(self.visible):
+            self.kept[self._item_id(self.items[slot])] = (self.visible.pop(slot), self.photos.pop(slot, None))
+        self.photos.clear()
+        for block in list(self.blocks):
+            self._release_block(block)
+        self.canvas.yview_moveto(0)
+        self._reset()
+        self._append_page(page)
+        self._schedule_render()
+
+    # Dołączenie kolejnych wyników (np. z API do wyników z lokalnego indeksu) bez czyszczenia siatki
+    def merge_page(self, page):
+        # Strona lokalna nie ma następnej strony - nie nadpisuje adresu ze strony zdalnej
+        if page.next_url:
+            self.next_url = page.next_url
+        self._buffer_items(page.items)
+        # Siatka mogła nie wypełnić widoku - odświeżenie dołoży kolejną porcję
+        self._schedule_render()
+
+    # Dołączenie strony wyników do bufora
+    def _append_page(self, page):
+        self.next_url = page.next_url
+        self._buffer_items(page.items)
+
+    # Dodanie do bufora elementów, których jeszcze nie ma na liście
+    def _buffer_items(self, items):
+        for item in items:
+            item_id = self._item_id(item)
+            if item_id not in self.seen:
+                self.seen.add(item_id)
+                self.buffer.append(item)
+        # Dołożenie kolejnej porcji, jeśli lista jest pusta lub użytkownik na nią czeka
+        if not self.items or self.want_more:
+            self.want_more = False
+            self._load_more()
+
+    # Dołożenie kolejnej porcji wyników z bufora
+    def _load_more(self):
+        batch = self.buffer[:UIConfig.IMAGE_LIMIT]
+        del self.buffer[:UIConfig.IMAGE_LIMIT]
+        if batch:
+            self.display_thumbnails(batch)
+        else:
+            # Bufor pusty - porcja zostanie dołożona po nadejściu strony
+            self.want_more = True
+        # Pobranie następnej strony z wyprzedzeniem, zanim bufor się wyczerpie
+        if len(self.buffer) < UIConfig.IMAGE_LIMIT:
+            self._prefetch_page()
+
+    # Pobranie następnej strony wyników w tle
+    def _prefetch_page(self):
+        if self.page_loading or not self.next_url:
+            return
+        self.page_loading = True
+        self.bridge.submit(
+            self.engine.fetch_page(url=self.next_url), self._on_page, self._on_page_error,
+            token=self.token
+        )
+
+    # Odebranie kolejnej strony wyników
+    def _on_page(self, page):
+        self.page_loading = False
+        self.log(f"Loaded next page: {len(page.items)} items")
+        self._append_page(page)
+
+    # Obsługa błędu pobierania kolejnej strony
+    def _on_page_error(self, e):
+        self.page_loading = False
+        self.log(f"Error loading next page: {e}")
+
+    # Wyświetlanie miniaturek obrazów (dokładanych na koniec siatki)
+    def display_thumbnails(self, items):
+        # Tylko elementy z linkiem do obrazu dostają miejsce w siatce
+        self.items.extend(item for item in items if item.thumb)
+        # Miniatury pobieramy dopiero, gdy ich wiersz znajdzie się w pobliżu widoku
+        self._schedule_render()
+
+    # Odświeżenie widoku
+    def _render(self):
+        self.render_pending = False
+        with profiler.span("grid.render"):
+            self._layout()
+
+    # Przypisanie kafelków z puli do widocznych miejsc
+    def _layout(self):
+        columns = UIConfig.COLUMNS
+        rows = (len(self.items) + columns - 1) // columns
+        # Obszar przewijania obejmuje wszystkie wiersze, choć rysowane są tylko widoczne
+        # (zmieniany tylko przy zmianie liczby wierszy, bo wywołuje yscrollcommand)
+        region = (0, 0, columns * self.cell_width, rows * self.cell_height)
+        if region != self.scroll_region:
+            self.scroll_region = region
+            self.canvas.configure(scrollregion=region)
+
+        # Zakres wierszy widocznych wraz z zapasem
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // self.cell_height) - UIConfig.OVERSCAN_ROWS)
+        last_row = int(bottom // self.cell_height) + UIConfig.OVERSCAN_ROWS
+        wanted = range(first_row * columns, min((last_row + 1) * columns, len(self.items)))
+
+        # Zwolnienie kafelków, które opuściły widok
+        for slot in list(self.visible):
+            if slot not in wanted:
+                self._release(slot)
+
+        # Przypisanie kafelków nowo widocznym miejscom
+        missing = []
+        for slot in wanted:
+            if slot not in self.visible:
+                self._place(slot)
+            # W trybie atlasu miniatury są częścią obrazu bloku
+            if UIConfig.ATLAS:
+                continue
+            # Miniatury w trakcie pobierania nie są ponownie szukane w pamięci podręcznej
+            if slot not in self.photos and slot not in self.requested and not self._cached_thumbnail(slot):
+                missing.append(slot)
+        # Czekające pobrania miniatur spoza widoku ustępują miejsca nowo widocznym
+        if self.items and wanted != self.focused:
+            self.focused = wanted
+            self.bridge.submit(self.engine.focus([self.items[slot].thumb for slot in wanted]))
+        self._request_thumbnails(missing)
+        if UIConfig.ATLAS:
+            self._layout_blocks(wanted)
+        if self.prefetcher is not None:
+            self._prefetch_previews(top, bottom)
+        # Kafelki poprzednich wyników, które nie trafiły do widoku, wracają do puli
+        for tile, photo in self.kept.values():
+            self._recycle(tile)
+        self.kept.clear()
+
+        # Zbliżamy się do końca listy - dokładamy kolejną porcję
+        if self.items and not self.want_more and bottom >= rows * self.cell_height * UIConfig.LOAD_MORE_AT:
+            self._load_more()
+
+    # Podglądy kafelków w widoku (bez zapasu) pobierane z wyprzedzeniem od środka widoku
+    def _prefetch_previews(self, top, bottom):
+        columns = UIConfig.COLUMNS
+        middle = (top + bottom) / 2
+        slots = range(int(top // self.cell_height) * columns,
+                      min((int(bottom // self.cell_height) + 1) * columns, len(self.items)))
+        slots = sorted(slots, key=lambda slot: abs((slot // columns + 0.5) * self.cell_height - middle))
+        self.prefetcher.want([self.items[slot] for slot in slots])
+
+    # Liczba miejsc w jednym bloku atlasu
+    @staticmethod
+    def _block_size():
+        return UIConfig.ATLAS_ROWS * UIConfig.COLUMNS
+
+    # Tryb atlasu: wyświetlenie atlasów bloków obejmujących widoczne miejsca
+    def _layout_blocks(self, wanted):
+        size = self._block_size()
+        blocks = self.block_range = range(wanted.start // size, (wanted.stop + size - 1) // size)
+        for block in list(self.blocks):
+            if block not in blocks:
+                self._release_block(block)
+        for block in blocks:
+            items = self.items[block * size:(block + 1) * size]
+            # Klucz zmienia się, gdy do niepełnego ostatniego bloku dołożono elementy
+            key = self.engine.atlas_key(items)
+            if self.atlases.get(block, (None,))[0] == key or self.requested_blocks.get(block) == key:
+                continue
+            photo = self.memory.get((key, self.cell_width, self.cell_height))
+            if photo is not None:
+                self._show_block(block, key, photo)
+                continue
+            self.requested_blocks[block] = key
+            self.bridge.submit(
+                self.engine.fetch_atlas(items, UIConfig.COLUMNS, (self.cell_width, self.cell_height),
+                                        UIConfig.TILE_PAD, UIConfig.BG_COLOR, UIConfig.THUMBNAIL_WORKERS),
+                lambda result, block=block: self._on_atlas(block, result),
+                lambda e, block=block: self._on_atlas_error(block, e), token=self.token
+            )
+
+    # Odebranie atlasu bloku w wątku Tk
+    def _on_atlas(self, block, result):
+        if self.requested_blocks.get(block) == result.key:
+            del self.requested_blocks[block]
+        size = self._block_size()
+        self.missing_slots.update(block * size + index for index in result.missing)
+        for index in result.missing:
+            self.log(f"Error loading thumbnail: {self._title(self.items[block * size + index])[:40]}")
+        from PIL import ImageTk
+        with profiler.span("photo.create"):
+            photo = ImageTk.PhotoImage(result.image)
+        # Niepełny atlas nie jest zapamiętywany - brakujące miniatury zostaną pobrane ponownie
+        if not result.missing:
+            self.memory.put((result.key, self.cell_width, self.cell_height), photo)
+        # Blok mógł w międzyczasie opuścić widok lub zmienić zawartość
+        items = self.items[block * size:(block + 1) * size]
+        if block in self.block_range and self.engine.atlas_key(items) == result.key:
+            self._show_block(block, result.key, photo)
+            self.log(f"Loaded atlas: {len(items) - len(result.missing)} thumbnails")
+
+    # Obsługa błędu składania atlasu
+    def _on_atlas_error(self, block, e):
+        self.requested_blocks.pop(block, None)
+        self.log(f"Error loading thumbnails: {e}")
+
+    # Umieszczenie atlasu bloku na Canvas (pod tytułami kafelków)
+    def _show_block(self, block, key, photo):
+        image_id = self.blocks.get(block)
+        if image_id is None:
+            image_id = self.block_pool.pop() if self.block_pool else self.canvas.create_image(0, 0, anchor="nw")
+            self.blocks[block] = image_id
+        self.canvas.coords(image_id, 0, block * UIConfig.ATLAS_ROWS * self.cell_height)
+        self.canvas.itemconfigure(image_id, image=photo, state="normal")
+        self.canvas.tag_lower(image_id)
+        self.atlases[block] = (key, photo)
+
+    # Zwrócenie elementu bloku do puli i zwolnienie jego atlasu
+    def _release_block(self, block):
+        image_id = self.blocks.pop(block)
+        self.canvas.itemconfigure(image_id, image="", state="hidden")
+        self.block_pool.append(image_id)
+        self.atlases.pop(block, None)
+
+    # Umieszczenie kafelka z puli w danym miejscu siatki
+    def _place(self, slot):
+        row, col = divmod(slot, UIConfig.COLUMNS)
+        x = col * self.cell_width + self.cell_width // 2
+        y = row * self.cell_height + UIConfig.TILE_PAD
+        # Kafelek tego samego elementu z poprzednich wyników - razem z miniaturą
+        kept = self.kept.pop(self._item_id(self.items[slot]), None)
+        if kept is not None:
+            (image_id, text_id), photo = kept
+            if photo is not None:
+                self.photos[slot] = photo
+        elif self.pool:
+            image_id, text_id = self.pool.pop()
+        else:
+            # Pula jest pusta - tworzymy nowe elementy Canvas (tylko do rozmiaru widoku)
+            image_id = self.canvas.create_image(0, 0, anchor="n")
+            text_id = self.canvas.create_text(
+                0, 0, anchor="n", justify="center", width=UIConfig.THUMB_SIZE[0],
+                fill=UIConfig.FG_COLOR
+            )
+        # Przesunięcie elementów i ustawienie tytułu; obraz pojawi się po pobraniu
+        self.canvas.coords(image_id, x, y)
+        self.canvas.coords(text_id, x, y + UIConfig.THUMB_SIZE[1] + 4)
+        self.canvas.itemconfigure(image_id, image=self.photos.get(slot, ""), state="normal")
+        self.canvas.itemconfigure(text_id, text=self._title(self.items[slot]), state="normal")
+        self.visible[slot] = (image_id, text_id)
+
+    # Zwrócenie kafelka do puli i zwolnienie jego obrazu
+    def _release(self, slot):
+        self._recycle(self.visible.pop(slot))
+        self.photos.pop(slot, None)
+
+    # Ukrycie elementów Canvas kafelka i odłożenie ich do puli
+    def _recycle(self, tile):
+        image_id, text_id = tile
+        self.canvas.itemconfigure(image_id, image="", state="hidden")
+        self.canvas.itemconfigure(text_id, state="hidden")
+        self.pool.append(tile)
+
+    # Wstawienie miniatury z pamięci podręcznej; False, gdy trzeba ją pobrać
+    def _cached_thumbnail(self, slot):
+        photo = self.memory.get(self._thumbnail_key(self.items[slot]))
+        if photo is None:
+            profiler.count("memory_cache.miss")
+            return False
+        profiler.count("memory_cache.hit")
+        self.photos[slot] = photo
+        self.canvas.itemconfigure(self.visible[slot][0], image=photo)
+        return True
+
+    # Klucz miniatury elementu w pamięci podręcznej
+    @staticmethod
+    def _thumbnail_key(item):
+        return item.thumb, UIConfig.THUMB_SIZE
+
+    # Identyfikator elementu (nasa_id lub adres manifestu)
+    @staticmethod
+    def _item_id(item):
+        return item.nasa_id or item.href
+
+    # Skrócony tytuł elementu
+    @staticmethod
+    def _title(item):
+        title = item.title or "No title"
+        if len(title) > UIConfig.TITLE_CHARS:
+            title = title[:UIConfig.TITLE_CHARS - 3] + "..."
+        return title
+
+    # Zlecenie równoległego pobrania miniatur dla wskazanych miejsc; wyniki trafią do wątku Tk
+    def _request_thumbnails(self, slots):
+        slots = [slot for slot in slots if slot not in self.requested]
+        if not slots:
+            return
+        self.requested.update(slots)
+        self.bridge.stream(
+            self.engine.fetch_thumbnails([self.items[slot] for slot in slots], UIConfig.THUMBNAIL_WORKERS),
+            lambda result, slots=slots: self._on_thumbnail(slots[result.index], result),
+            on_done=self._on_thumbnails_done, token=self.token
+        )
+
+    # Odebranie gotowej miniatury w wątku Tk
+    def _on_thumbnail(self, slot, result):
+        self.requested.discard(slot)
+        if result.error is not None:
+            # Logowanie błędu
+            self.log(f"Error loading thumbnail: {result.error}")
+            return
+        # Kafelek mógł w międzyczasie opuścić widok - obrazu nie zatrzymujemy
+        tile = self.visible.get(slot)
+        if tile is None:
+            return
+
+        from PIL import ImageTk
+        try:
+            # Konwersja na format Tkinter i wstawienie do kafelka
+            with profiler.span("photo.create"):
+                photo = ImageTk.PhotoImage(result.image)
+            self.memory.put(self._thumbnail_key(result.item), photo)
+            self.photos[slot] = photo
+            self.canvas.itemconfigure(tile[0], image=photo)
+            # Logowanie informacji o załadowaniu miniatury
+            self.log(f"Loaded thumbnail: {self._title(result.item)[:40]}...")
+        except Exception as e:
+            # Logowanie błędu
+            self.log(f"Error loading thumbnail: {e}")
+
+    # Zakończenie pobierania porcji miniatur
+    def _on_thumbnails_done(self):
+        # Logowanie liczników połączeń, gdy nie czekamy już na żadną miniaturę
+        if not self.requested:
+            self.log(self.engine.http.stats.summary())
+            self.log(self.engine.scheduler.stats.summary())
+            self.log(self.memory.summary())
+
+    # Przełożenie kliknięcia na element wyników
+    def _on_click(self, event):
+        slot = self._slot_at(event)
+        # Kliknięcie poza kafelkami (np. obok kolumn siatki)
+        if slot is None:
+            return
+        # Podgląd otwieramy tylko dla kafelków z wczytaną miniaturą (w trybie atlasu - gdy
+        # atlas bloku jest wyświetlony, a komórka nie jest pusta)
+        loaded = slot in self.photos or (
+            UIConfig.ATLAS and slot // self._block_size() in self.atlases and slot not in self.missing_slots
+        )
+        if loaded:
+            self.preview(self.items[slot])
+
+    # Ruch myszy nad siatką - podgląd wskazanego kafelka jest pobierany w pierwszej kolejności
+    def _on_motion(self, event):
+        slot = self._slot_at(event)
+        if slot != self.hovered:
+            self.hovered = slot
+            if slot is not None and self.prefetcher is not None:
+                self.prefetcher.hover(self.items[slot])
+
+    # Miejsce siatki pod punktem zdarzenia myszy (None poza kafelkami)
+    def _slot_at(self, event):
+        col = int(self.canvas.canvasx(event.x) // self.cell_width)
+        row = int(self.canvas.canvasy(event.y) // self.cell_height)
+        slot = row * UIConfig.COLUMNS + col
+        if 0 <= col < UIConfig.COLUMNS and 0 <= slot < len(self.items):
+            return slot
+        return None
+
+# Okno przeglądarki pełnego obrazu z powiększaniem: najpierw podgląd w niskiej rozdzielczości,
+# potem kafelki piramidy - rysowane są tylko te, które przecinają widok
+class ZoomViewer(tk.Toplevel):
+    # Inicjalizacja okna
+    def __init__(self, master, engine, bridge, log_callback, memory):
+        # Wywołanie konstruktora klasy nadrzędnej
+        super().__init__(master, bg=UIConfig.BG_COLOR)
+        # Ustawienie tytułu okna
+        self.title("Full Image")
+        # Ustawienie rozmiaru okna
+        self.geometry(f"{UIConfig.VIEWER_SIZE[0]}x{UIConfig.VIEWER_SIZE[1]}")
+        # Tworzenie canvas z obrazem
+        self.canvas = tk.Canvas(self, bg=UIConfig.BG_COLOR, highlightthickness=0, cursor="fleur")
+        # Ustawienie pozycji canvas
+        self.canvas.pack(fill="both", expand=True)
+
+        # Przeciąganie przesuwa obraz, kółko myszy powiększa w miejscu kursora
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<MouseWheel>", lambda e: self._on_wheel(e, e.delta > 0))
+        self.canvas.bind("<Button-4>", lambda e: self._on_wheel(e, True))
+        self.canvas.bind("<Button-5>", lambda e: self._on_wheel(e, False))
+        # Klawisze: powiększenie, pomniejszenie i dopasowanie do okna
+        self.bind("<plus>", lambda e: self.zoom(UIConfig.VIEWER_ZOOM_STEP))
+        self.bind("<minus>", lambda e: self.zoom(1 / UIConfig.VIEWER_ZOOM_STEP))
+        self.bind("0", lambda e: self.fit())
+        # Zmiana rozmiaru okna zmienia zakres widocznych kafelków
+        self.canvas.bind("<Configure>", lambda e: self._schedule_render())
+        # Zamknięcie okna przerywa pobieranie i odczyt kafelków
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Silnik i most do jego pętli zdarzeń
+        self.engine = engine
+        self.bridge = bridge
+        # Funkcja logowania
+        self.log = log_callback
+        # Wspólna pamięć zdekodowanych obrazów (kafelki pozostają w niej po zamknięciu okna)
+        self.memory = memory
+        # Znacznik pobierania podglądu i piramidy
+        self.token = CancelToken()
+        # Znacznik odczytu kafelków - wymieniany przy zmianie powiększenia
+        self.tile_token = CancelToken()
+
+        # Podgląd dopasowany do ekranu (obraz PIL)
+        self.preview = None
+        # Piramida kafelków w pełnej rozdzielczości
+        self.pyramid = None
+        # Wymiary obrazu w bieżącym układzie współrzędnych (podgląd lub poziom 0 piramidy)
+        self.image_size = None
+        # Skala: piksele ekranu na piksel obrazu
+        self.scale = 1.0
+        # Punkt obrazu widoczny w lewym górnym rogu okna
+        self.view_x = 0.0
+        self.view_y = 0.0
+        # Ostatnia pozycja kursora podczas przeciągania
+        self.drag = None
+        # Obrazy Tk kafelków na ekranie ((poziom, kolumna, wiersz, powiększenie) -> PhotoImage) -
+        # pozostają dostępne, nawet gdy zostaną usunięte z pamięci podręcznej
+        self.shown = {}
+        # Kafelki, których odczyt zlecono
+        self.requested = set()
+        # Obraz Tk tła rysowanego z podglądu
+        self.backdrop = None
+        # Komunikat o stanie ładowania i jego element na Canvas
+        self.status = "Loading..."
+        self.status_id = None
+        # Czy odświeżenie widoku jest już zaplanowane
+        self.render_pending = False
+        self._schedule_render()
+
+    # Rozmiar obszaru rysowania (przed pierwszym wyświetleniem - rozmiar z konfiguracji)
+    def _view_size(self):
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return UIConfig.VIEWER_SIZE
+        return width, height
+
+    # Odebranie podglądu w niskiej rozdzielczości
+    def set_preview(self, img):
+        self.preview = img
+        if self.pyramid is None:
+            self.image_size = img.size
+            self.status = "Loading full resolution..."
+            self.fit()
+        self.log("Opened full image.")
+
+    # Odebranie piramidy kafelków - przejście na współrzędne pełnej rozdzielczości
+    def set_pyramid(self, pyramid):
+        self.pyramid = pyramid
+        if self.image_size is not None:
+            # Zachowanie bieżącego widoku przy zmianie układu współrzędnych
+            factor = pyramid.width / self.image_size[0]
+            self.scale /= factor
+            self.view_x *= factor
+            self.view_y *= factor
+            self.image_size = (pyramid.width, pyramid.height)
+        else:
+            self.image_size = (pyramid.width, pyramid.height)
+            self.fit()
+        self.status = None
+        self.log(f"Full resolution ready: {pyramid.source_size[0]}x{pyramid.source_size[1]}")
+        self._schedule_render()
+
+    # Funkcja raportowania postępu etapu ("preview" lub "original") wywoływana w wątku silnika
+    def progress_callback(self, stage):
+        return lambda received, length: self.bridge.post(
+            self.show_progress, (stage, received, length), self.token
+        )
+
+    # Wyświetlenie postępu pobierania bieżącego etapu
+    def show_progress(self, progress):
+        stage, received, length = progress
+        # Postęp oryginału pokazujemy dopiero po wyświetleniu podglądu
+        if stage == "preview" and self.preview is not None:
+            return
+        if stage == "original" and (self.preview is None or self.pyramid is not None):
+            return
+        label = "Loading preview..." if stage == "preview" else "Loading full resolution..."
+        text = f"{label} {received / 2 ** 20:.1f} MB"
+        if length:
+            text += f" / {length / 2 ** 20:.1f} MB ({100 * received // length}%)"
+        self.status = text
+        # Zmiana samego napisu nie wymaga przerysowania obrazu
+        if self.status_id is not None:
+            self.canvas.itemconfigure(self.status_id, text=text)
+        else:
+            self._schedule_render()
+
+    # Obsługa błędu budowy piramidy - zostaje sam podgląd
+    def on_pyramid_error(self, e):
+        self.status = None
+        self.log(f"Full resolution unavailable: {e}")
+        self._schedule_render()
+
+    # Dopasowanie całego obrazu do okna
+    def fit(self):
+        if self.image_size is None:
+            return
+        width, height = self._view_size()
+        self.scale = min(width / self.image_size[0], height / self.image_size[1])
+        # Wyśrodkowanie obrazu
+        self.view_x = (self.image_size[0] - width / self.scale) / 2
+        self.view_y = (self.image_size[1] - height / self.scale) / 2
+        self._zoom_changed()
+
+    # Powiększenie o zadany współczynnik względem punktu okna (domyślnie środka)
+    def zoom(self, factor, x=None, y=None):
+        if self.image_size is None:
+            return
+        width, height = self._view_size()
+        x = width / 2 if x is None else x
+        y = height / 2 if y is None else y
+        # Najmniejsza skala to połowa dopasowania do okna, największa - stałe powiększenie
+        fit_scale = min(width / self.image_size[0], height / self.image_size[1])
+        scale = min(max(self.scale * factor, fit_scale / 2), UIConfig.VIEWER_MAX_ZOOM)
+        # Punkt obrazu pod kursorem pozostaje w miejscu
+        self.view_x += x / self.scale - x / scale
+        self.view_y += y / self.scale - y / scale
+        self.scale = scale
+        self._zoom_changed()
+
+    # Zmiana powiększenia unieważnia zlecone odczyty kafelków w poprzedniej skali
+    def _zoom_changed(self):
+        self.tile_token.cancel()
+        self.tile_token = CancelToken()
+        self.requested.clear()
+        self._schedule_render()
+
+    # Początek przeciągania
+    def _on_press(self, event):
+        self.drag = (event.x, event.y)
+
+    # Przesuwanie obrazu
+    def _on_drag(self, event):
+        if self.drag is None:
+            return
+        self.view_x -= (event.x - self.drag[0]) / self.scale
+        self.view_y -= (event.y - self.drag[1]) / self.scale
+        self.drag = (event.x, event.y)
+        self._schedule_render()
+
+    # Powiększanie kółkiem myszy
+    def _on_wheel(self, event, zoom_in):
+        step = UIConfig.VIEWER_ZOOM_STEP
+        self.zoom(step if zoom_in else 1 / step, event.x, event.y)
+
+    # Zaplanowanie odświeżenia widoku raz na cykl pętli Tk
+    def _schedule_render(self):
+        if not self.render_pending:
+            self.render_pending = True
+            self.after_idle(self._render)
+
+    # Odświeżenie widoku: tło z podglądu, na nim kafelki piramidy
+    def _render(self):
+        self.render_pending = False
+        self.canvas.delete("all")
+        width, height = self._view_size()
+        if self.preview is not None and self.image_size is not None:
+            self._render_backdrop(width, height)
+        if self.pyramid is not None:
+            self._render_tiles(width, height)
+        self.status_id = None
+        if self.status:
+            self.status_id = self.canvas.create_text(10, 10, anchor="nw", text=self.status,
+                                                     fill=UIConfig.FG_COLOR, font=UIConfig.FONT)
+
+    # Tło: widoczny fragment podglądu przeskalowany do okna
+    def _render_backdrop(self, width, height):
+        from PIL import Image, ImageTk
+        # Widoczny fragment obrazu (w jego współrzędnych)
+        left, top = max(0.0, self.view_x), max(0.0, self.view_y)
+        right = min(self.image_size[0], self.view_x + width / self.scale)
+        bottom = min(self.image_size[1], self.view_y + height / self.scale)
+        if right <= left or bottom <= top:
+            return
+        ratio = self.preview.width / self.image_size[0]
+        size = (max(1, round((right - left) * self.scale)), max(1, round((bottom - top) * self.scale)))
+        img = self.preview.resize(
+            size, Image.Resampling.BILINEAR,
+            box=(left * ratio, top * ratio, right * ratio, bottom * ratio)
+        )
+        self.backdrop = ImageTk.PhotoImage(img)
+        self.canvas.create_image(
+            round((left - self.view_x) * self.scale), round((top - self.view_y) * self.scale),
+            anchor="nw", image=self.backdrop
+        )
+
+    # Kafelki z poziomu piramidy najbliższego bieżącej skali
+    def _render_tiles(self, width, height):
+        pyramid = self.pyramid
+        # Poziom n jest 2^n razy mniejszy; wybieramy najmniejszy, który nie wymaga powiększania
+        level = 0
+        if self.scale < 1:
+            level = min(len(pyramid.levels) - 1, int(math.log2(1 / self.scale)))
+        factor = 2 ** level
+        zoom = round(self.scale * factor, 4)
+        # Zakres kafelków przecinających widok
+        span = pyramid.tile_size * factor
+        cols, rows = pyramid.grid(level)
+        first_col = max(0, int(self.view_x // span))
+        last_col = min(cols - 1, int((self.view_x + width / self.scale) // span))
+        first_row = max(0, int(self.view_y // span))
+        last_row = min(rows - 1, int((self.view_y + height / self.scale) // span))
+
+        missing = []
+        shown, self.shown = self.shown, {}
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                key = (level, col, row, zoom)
+                photo = shown.get(key)
+                if photo is None:
+                    photo = self.memory.get(self._tile_key(key))
+                if photo is None:
+                    missing.append(key)
+                    continue
+                self.shown[key] = photo
+                self.canvas.create_image(
+                    round((col * span - self.view_x) * self.scale),
+                    round((row * span - self.view_y) * self.scale),
+                    anchor="nw", image=photo
+                )
+        self._request_tiles(missing)
+
+    # Klucz kafelka w pamięci podręcznej: katalog piramidy (wyznaczony z adresu oryginału)
+    # i położenie kafelka w danym powiększeniu
+    def _tile_key(self, key):
+        return (self.pyramid.directory, *key)
+
+    # Zlecenie odczytu brakujących kafelków z dysku
+    def _request_tiles(self, keys):
+        for key in keys:
+            if key in self.requested:
+                continue
+            self.requested.add(key)
+            self.bridge.submit(
+                self.engine.load_tile(self.pyramid, *key),
+                lambda img, key=key: self._on_tile(key, img),
+                lambda e, key=key: self._on_tile_error(key, e),
+                token=self.tile_token
+            )
+
+    # Odebranie kafelka w wątku Tk
+    def _on_tile(self, key, img):
+        from PIL import ImageTk
+        self.requested.discard(key)
+        with profiler.span("photo.create"):
+            photo = ImageTk.PhotoImage(img)
+        self.shown[key] = self.memory.put(self._tile_key(key), photo)
+        self._schedule_render()
+
+    # Obsługa błędu odczytu kafelka
+    def _on_tile_error(self, key, e):
+        self.requested.discard(key)
+        self.log(f"Error loading tile {key[:3]}: {e}")
+
+    # Zamknięcie okna
+    def close(self):
+        self.token.cancel()
+        self.tile_token.cancel()
+        self.destroy()
+
+# Główna klasa aplikacji
+class NASAImageSearcher:
+    # Inicjalizacja aplikacji
+    def __init__(self, master, mirror_dir=None):
+        # Przypisanie głównego okna
+        self.master = master
+        # Ustawienie tytułu okna
+        self.master.title("NASA Image Searcher")
+        # Ustawienie rozmiaru okna
+        self.master.geometry("1000x650")
+        # Ustawienie koloru tła
+        self.master.configure(bg=UIConfig.BG_COLOR)
+
+        # Utworzenie panelu wyszukiwania
+        self.search_panel = SearchPanel(master, self.search_images, UIConfig.LIVE_SEARCH)
+        # Utworzenie głównej ramki
+        self.main_frame = tk.Frame(master, bg=UIConfig.BG_COLOR)
+        # Ustawienie pozycji głównej ramki
+        self.main_frame.pack(fill="both", expand=True)
+
+        # Katalog magazynu lokalnego (None - praca z siecią)
+        self.mirror_dir = mirror_dir
+        # Silnik wyszukiwania (tworzony po pokazaniu okna lub przy pierwszym wyszukiwaniu)
+        self.engine = None
+        # Uruchomienie pętli zdarzeń silnika w osobnym wątku
+        self.bridge = EngineBridge()
+        # Wspólna pamięć zdekodowanych obrazów (miniatury, podglądy, kafelki przeglądarki)
+        self.memory = MemoryCache(UIConfig.MEMORY_CACHE_BYTES)
+        # Otwarte okna przeglądarki (identyfikator elementu -> okno)
+        self.viewers = {}
+        # Rozmiar ekranu, do którego dobierane są podglądy
+        self.screen_size = (self.master.winfo_screenwidth(), self.master.winfo_screenheight())
+        # Utworzenie pola logu
+        self.log_box = LogBox(self.main_frame)
+        # Błędy wywołań przekazujących wyniki silnika do widżetów trafiają do logu
+        self.bridge.on_callback_error = lambda e: self.log_box.log(f"UI update error: {e!r}")
+        # Utworzenie panelu wyników (silnik i pobieranie z wyprzedzeniem dołącza _ensure_engine)
+        self.image_results = ImageResults(
+            self.main_frame, self.log_box.log, self.show_full_image, None, self.bridge, self.memory
+        )
+
+        # Znacznik bieżącego wyszukiwania
+        self.search_token = None
+        # Czy bieżące wyszukiwanie wyświetliło już wyniki
+        self.results_shown = False
+        if mirror_dir:
+            self.log_box.log(f"Offline mode: serving from {mirror_dir}")
+        # Pomiary etapów z okresowym podsumowaniem w logu
+        if UIConfig.PROFILE:
+            profiler.enable(UIConfig.PROFILE_PATH)
+            self.log_box.log(f"Profiling to {UIConfig.PROFILE_PATH or 'memory'}")
+            self.master.after(UIConfig.PROFILE_SUMMARY_MS, self._log_profile)
+
+        # Odbieranie wyników silnika w wątku Tk
+        self.master.after(UIConfig.POLL_INTERVAL_MS, self._poll_engine)
+        # Wczytanie silnika, gdy okno jest już widoczne
+        self.master.after(UIConfig.ENGINE_START_DELAY_MS, self._ensure_engine)
+        # Zamknięcie połączeń przy zamykaniu okna
+        self.master.protocol("WM_DELETE_WINDOW", self.close)
+
+    # Utworzenie silnika wyszukiwania z dyskową pamięcią podręczną obrazów; moduły silnika
+    # (PIL, aiohttp, requests) są importowane dopiero tutaj, aby nie opóźniać pokazania okna
+    def _ensure_engine(self):
+        if self.engine is not None:
+            return self.engine
+        with profiler.span("engine.start"):
+            from .nasa_client import AsyncHTTPClient
+            from .image_cache import ImageCache
+            from .metadata_index import MetadataIndex
+            from .mirror import ContentStore, MirrorClient
+            from .engine import SearchEngine
+            from .preview_prefetch import PreviewPrefetcher
+            self.engine = SearchEngine(
+                # Z magazynem lokalnym aplikacja nie wykonuje żadnych żądań sieciowych
+                MirrorClient(ContentStore(self.mirror_dir)) if self.mirror_dir else AsyncHTTPClient(),
+                ImageCache(UIConfig.CACHE_DIR, UIConfig.CACHE_MAX_BYTES, UIConfig.CACHE_MAX_AGE),
+                UIConfig.THUMB_SIZE,
+                search_cache=SearchCache(
+                    UIConfig.SEARCH_CACHE_TTL, UIConfig.SEARCH_CACHE_SIZE, UIConfig.SEARCH_CACHE_PATH
+                ),
+                pyramid_budget=UIConfig.VIEWER_MEMORY_BUDGET, pyramids_keep=UIConfig.PYRAMIDS_KEEP,
+                max_pixels=UIConfig.IMAGE_MAX_PIXELS, max_bytes=UIConfig.IMAGE_MAX_BYTES,
+                decode_processes=UIConfig.DECODE_PROCESSES,
+                metadata_index=MetadataIndex(UIConfig.METADATA_INDEX_PATH)
+            )
+        self.image_results.engine = self.engine
+        # Pobieranie podglądów z wyprzedzeniem (magazyn lokalny nie wymaga pobierania)
+        if UIConfig.PREFETCH and not self.mirror_dir:
+            self.image_results.prefetcher = PreviewPrefetcher(
+                self.engine, self.bridge, self.screen_size, ImageResults._item_id,
+                UIConfig.PREFETCH_BYTES, UIConfig.PREFETCH_RATE, self.log_box.log
+            )
+        return self.engine
+
+    # Cykliczne przekazywanie wyników silnika do widżetów
+    def _poll_engine(self):
+        try:
+            self.bridge.poll()
+        finally:
+            # Odbieranie trwa także po nieoczekiwanym błędzie
+            self.master.after(UIConfig.POLL_INTERVAL_MS, self._poll_engine)
+
+    # Podsumowanie pomiarów etapów (tylko gdy przybyły nowe)
+    def _log_profile(self):
+        active = profiler.active()
+        if active is None:
+            return
+        if active.changed():
+            for line in active.summary():
+                self.log_box.log(f"Profile: {line}")
+        self.master.after(UIConfig.PROFILE_SUMMARY_MS, self._log_profile)
+
+    # Zamknięcie aplikacji
+    def close(self):
+        # Silnik mógł nie zostać jeszcze utworzony (okno zamknięte tuż po otwarciu)
+        self.bridge.close(self.engine.close() if self.engine is not None else None)
+        profiler.disable()
+        self.log_box.close()
+        self.master.destroy()
+
+    # Wyświetlanie pełnego obrazu
+    def show_full_image(self, item):
+        # Obraz otwarty już w przeglądarce - wystarczy przywołać jej okno
+        # (znacznik okna jest anulowany przy zamknięciu)
+        item_id = ImageResults._item_id(item)
+        viewer = self.viewers.get(item_id)
+        if viewer is not None and not viewer.token.cancelled:
+            viewer.lift()
+            return
+        # Podgląd dopasowany do ekranu pojawia się od razu, kafelki pełnej rozdzielczości później
+        self._ensure_engine()
+        screen_size = self.screen_size
+        viewer = ZoomViewer(self.master, self.engine, self.bridge, self.log_box.log, self.memory)
+        self.viewers = {key: value for key, value in self.viewers.items() if not value.token.cancelled}
+        self.viewers[item_id] = viewer
+        # Podgląd z pamięci podręcznej (obraz otwierany ponownie) lub pobrany w tle
+        key = (item.href or item_id, screen_size)
+        preview = self.memory.get(key)
+        if preview is not None:
+            viewer.set_preview(preview)
+        else:
+            self.bridge.submit(
+                self.engine.fetch_preview(item, screen_size, viewer.progress_callback("preview")),
+                lambda img: viewer.set_preview(self.memory.put(key, img)),
+                lambda e: self._on_full_image_error(viewer, e), token=viewer.token
+            )
+        # Piramida zbudowana przy poprzednim otwarciu jest odczytywana z dysku
+        self.bridge.submit(
+            self.engine.open_pyramid(item, viewer.progress_callback("original")),
+            viewer.set_pyramid, viewer.on_pyramid_error,
+            token=viewer.token
+        )
+
+    # Obsługa błędu pobierania pełnego obrazu
+    def _on_full_image_error(self, viewer, e):
+        # Bez podglądu nie ma czego pokazać - okno jest zamykane
+        viewer.close()
+        # Wyświetlenie komunikatu o błędzie
+        messagebox.showerror("Error", f"Could not fetch full image:\n{e}")
+        # Logowanie błędu
+        self.log_box.log(f"Error opening full image: {e}")
+
+    # Wyszukiwanie obrazów (live=True - w trakcie pisania; poprzednie zapytanie jest anulowane)
+    def search_images(self, live=False):
+        # Pobranie zapytania
+        query = self.search_panel.get_query()
+        # Sprawdzenie czy zapytanie nie jest puste
+        if not query:
+            messagebox.showwarning("Warning", "Please enter a search term.")
+            return
+
+        # Anulowanie poprzedniego wyszukiwania i pobierania jego miniatur
+        if self.search_token is not None:
+            self.search_token.cancel()
+        self.image_results.cancel()
+        self.search_token = CancelToken()
+
+        # Pierwsze wyniki (lokalne lub zdalne) zastępują poprzednie, kolejne są dołączane
+        self.results_shown = False
+
+        # Logowanie zapytania
+        self.log_box.log(f"Searching for: {query}")
+        self._ensure_engine()
+        # Natychmiastowa odpowiedź z lokalnego indeksu metadanych
+        if UIConfig.LOCAL_SEARCH:
+            self.bridge.submit(
+                self.engine.search_local(query, UIConfig.LOCAL_RESULTS), self._on_local_results,
+                lambda e: self.log_box.log(f"Local search error: {e}"), token=self.search_token
+            )
+        # Wysłanie zapytania do API NASA w tle
+        if UIConfig.REMOTE_SEARCH:
+            self.bridge.submit(
+                self.engine.fetch_page(query), self._on_results, self._on_search_error,
+                token=self.search_token
+            )
+
+    # Wyświetlenie wyników z lokalnego indeksu
+    def _on_local_results(self, page):
+        self.log_box.log(f"Found {len(page.items)} items in local index")
+        if page.items:
+            self._show_results(page)
+
+    # Wyświetlenie pierwszej strony wyników (kolejne są doczytywane przy przewijaniu)
+    def _on_results(self, page):
+        # Logowanie liczby wyników
+        self.log_box.log(f"Found {page.total_hits or len(page.items)} items")
+        # Logowanie liczników pamięci podręcznej wyszukiwań
+        self.log_box.log(self.engine.search_cache.stats.summary())
+        self._show_results(page)
+
+    # Zastąpienie poprzednich wyników nowymi lub dołączenie do wyników tego samego wyszukiwania
+    def _show_results(self, page):
+        if self.results_shown:
+            self.image_results.merge_page(page)
+        else:
+            self.image_results.show_page(page)
+            self.results_shown = True
+
+    # Obsługa błędu wyszukiwania
+    def _on_search_error(self, e):
+        # Wyniki z lokalnego indeksu pozostają - wystarczy wpis w logu
+        if self.results_shown:
+            self.log_box.log(f"Search error (showing local results): {e}")
+            return
+        # Wyświetlenie komunikatu o błędzie
+        messagebox.showerror("Error", f"An error occurred: {e}")
+        # Logowanie błędu
+        self.log_box.log(f"Search error: {e}")
+
+# Uruchomienie aplikacji (polecenie nasa-image-searcher lub python -m nasa_image_searcher)
+def main():
+    # Opcjonalny katalog magazynu przygotowanego przez nasa_image_searcher.prefetch
+    parser = argparse.ArgumentParser(description="NASA Image Searcher")
+    parser.add_argument("--mirror", help="serve searches and images from a prefetch store, without network")
+    # Pomiary etapów zapisywane do pliku JSON Lines (domyślnie UIConfig.PROFILE_PATH)
+    parser.add_argument("--profile", nargs="?", const=UIConfig.PROFILE_PATH, metavar="PATH",
+                        help="record stage timings as JSON lines and log p50/p95 summaries")
+    # Pełny log zapisywany do pliku rotowanego po UIConfig.LOG_FILE_BYTES
+    parser.add_argument("--log-file", metavar="PATH", help="also write the full log to a rotating file")
+    args = parser.parse_args()
+    if args.profile:
+        UIConfig.PROFILE = True
+        UIConfig.PROFILE_PATH = args.profile
+    if args.log_file:
+        UIConfig.LOG_PATH = args.log_file
+    # Utworzenie głównego okna
+    root = tk.Tk()
+    # Utworzenie instancji aplikacji
+    app = NASAImageSearcher(root, args.mirror)
+    # Uruchomienie pętli głównej
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
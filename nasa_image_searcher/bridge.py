@@ -0,0 +1,110 @@
+# Most między pętlą asyncio silnika a wątkiem interfejsu. Moduł nie importuje silnika,
+# klienta HTTP ani PIL, dzięki czemu okno aplikacji może powstać przed ich wczytaniem.
+
+# Import pętli zdarzeń asyncio
+import asyncio
+# Import kolejki do przekazywania wyników do innego wątku
+import queue
+# Import modułu do uruchomienia pętli zdarzeń w osobnym wątku
+import threading
+# Import modułu do wypisania błędów wywołań bez obsługi
+import traceback
+
+
+# Znacznik pokolenia pracy (np. jednego wyszukiwania), który pozwala ją w całości anulować
+class CancelToken:
+    # Inicjalizacja znacznika
+    def __init__(self):
+        # Czy praca została anulowana
+        self.cancelled = False
+        # Zadania zlecone w ramach tej pracy
+        self.futures = set()
+
+    # Anulowanie wszystkich zadań; wyniki, które już czekają w kolejce, zostaną odrzucone
+    def cancel(self):
+        self.cancelled = True
+        for future in list(self.futures):
+            future.cancel()
+
+
+# Most między pętlą asyncio działającą w osobnym wątku a wątkiem interfejsu
+class EngineBridge:
+    # Inicjalizacja mostu i uruchomienie pętli zdarzeń
+    def __init__(self, on_callback_error=None):
+        # Pętla zdarzeń silnika
+        self.loop = asyncio.new_event_loop()
+        # Kolejka wywołań do wykonania w wątku interfejsu
+        self.results = queue.Queue()
+        # Obsługa wyjątku zgłoszonego przez wywołanie w wątku interfejsu (None - wypisanie)
+        self.on_callback_error = on_callback_error
+        # Wątek obsługujący pętlę zdarzeń
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    # Zlecenie korutyny; wynik lub błąd trafi do wątku interfejsu przy kolejnym poll()
+    def submit(self, coro, on_result=None, on_error=None, token=None):
+        if token is not None and token.cancelled:
+            # Praca już anulowana - nie uruchamiamy korutyny
+            coro.close()
+            return None
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        if token is not None:
+            # Anulowanie zadania przerywa korutynę w pętli silnika (także w trakcie pobierania)
+            token.futures.add(future)
+            future.add_done_callback(token.futures.discard)
+        future.add_done_callback(lambda f: self._deliver(f, on_result, on_error, token))
+        return future
+
+    # Przekazanie wyniku zakończonej korutyny do kolejki
+    def _deliver(self, future, on_result, on_error, token):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            if on_error is not None:
+                self.results.put((on_error, error, token))
+        elif on_result is not None:
+            self.results.put((on_result, future.result(), token))
+
+    # Odczyt asynchronicznego iteratora; każdy element trafia do on_item w wątku interfejsu
+    def stream(self, agen, on_item, on_error=None, on_done=None, token=None):
+        async def pump():
+            try:
+                async for value in agen:
+                    self.results.put((on_item, value, token))
+            finally:
+                # Zamknięcie iteratora przerywa pobierania, które jeszcze trwają
+                await agen.aclose()
+        return self.submit(pump(), on_done and (lambda _: on_done()), on_error, token)
+
+    # Przekazanie wywołania do wątku interfejsu (można wywołać z dowolnego wątku)
+    def post(self, callback, value, token=None):
+        self.results.put((callback, value, token))
+
+    # Wykonanie oczekujących wywołań (wywoływane z wątku interfejsu)
+    def poll(self):
+        while True:
+            try:
+                callback, value, token = self.results.get_nowait()
+            except queue.Empty:
+                break
+            # Wyniki anulowanej pracy nie docierają do widżetów
+            if token is not None and token.cancelled:
+                continue
+            # Błąd jednego wywołania nie wstrzymuje kolejnych wyników
+            try:
+                callback(value)
+            except Exception as e:
+                if self.on_callback_error is not None:
+                    self.on_callback_error(e)
+                else:
+                    traceback.print_exc()
+
+    # Zatrzymanie pętli zdarzeń po wykonaniu korutyny zamykającej
+    def close(self, coro=None, timeout=5):
+        if coro is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+            except Exception:
+                pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
@@ -0,0 +1,22 @@
+# Domyślne ustawienia wspólne dla interfejsu i silnika. Moduł nie importuje PIL ani klienta
+# HTTP, dzięki czemu konfiguracja interfejsu jest dostępna przed wczytaniem silnika.
+
+# Import modułu do budowania ścieżek
+import os
+
+# Domyślny katalog pamięci podręcznej
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "nasa-image-searcher")
+# Domyślny budżet pamięci podręcznej w bajtach
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+# Domyślny czas (w sekundach), po którym wpis jest ponownie sprawdzany na serwerze
+DEFAULT_MAX_AGE = 24 * 60 * 60
+# Rozmiar kafelka z miniaturą w siatce wyników (także rozmiar miniatur pobieranych z wyprzedzeniem)
+THUMB_SIZE = (180, 180)
+# Domyślny limit liczby pikseli pobieranego obrazu
+MAX_IMAGE_PIXELS = 64 * 1024 * 1024
+# Domyślny limit wielkości pobieranego pliku w bajtach
+MAX_IMAGE_BYTES = 64 * 1024 * 1024
+# Domyślny budżet pamięci (w bajtach) na zdekodowane piksele podczas budowy piramidy
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+# Liczba piramid kafelków zachowywanych na dysku
+PYRAMIDS_KEEP = 5
@@ -0,0 +1,640 @@
+# Asynchroniczny silnik wyszukiwania i pobierania obrazów NASA, niezależny od Tkintera.
+#
+# Użycie bez interfejsu graficznego:
+#     python -m nasa_image_searcher.engine "apollo 11" --limit 50 --concurrency 16
+
+# Import pętli zdarzeń asyncio
+import asyncio
+# Import modułu do parsowania argumentów wiersza poleceń
+import argparse
+# Import modułu do pomiaru czasu
+import time
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu do wyznaczania nazw katalogów piramid
+import hashlib
+# Import modułu do tworzenia unikalnych nazw plików tymczasowych
+import tempfile
+# Import modułu bazy SQLite (błędy lokalnego indeksu nie przerywają wyszukiwania)
+import sqlite3
+# Import modułu do wyboru sposobu uruchamiania procesów
+import multiprocessing
+# Import modułu do tworzenia menedżerów kontekstu
+import contextlib
+# Import uporządkowanego słownika do zapamiętywania manifestów
+from collections import OrderedDict
+# Import pul wątków i procesów do dekodowania obrazów poza pętlą zdarzeń
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+# Import modułu do pracy z danymi binarnymi
+from io import BytesIO
+# Import asynchronicznego klienta HTTP
+from .nasa_client import AsyncHTTPClient
+# Import dyskowej pamięci podręcznej obrazów
+from .image_cache import ImageCache, DEFAULT_DIR, DEFAULT_MAX_BYTES, DEFAULT_MAX_AGE
+# Import dekodera strumieniowego i limitów pobieranych obrazów
+from .imaging import (StreamingDecoder, MAX_IMAGE_PIXELS, MAX_IMAGE_BYTES,
+                     decode_thumbnail_rgb, image_from_rgb, compose_atlas, open_image)
+# Import wyboru wersji (rozmiaru) obrazów
+from .renditions import preview_url, needs_manifest, original_url
+# Import zwięzłych rekordów elementów wyników
+from .items import parse_items, compact_response
+# Import pamięci podręcznej odpowiedzi wyszukiwarki
+from .search_cache import SearchCache, normalize_key, key_for_url
+# Import piramid kafelków dla przeglądarki pełnych obrazów
+from .pyramid import ImagePyramid, DEFAULT_MEMORY_BUDGET, prune
+# Import profilera etapów
+from . import profiler
+# Import mostu do wątku interfejsu (udostępnianego także z tego modułu)
+from .bridge import CancelToken, EngineBridge
+# Import domyślnej liczby zachowywanych piramid
+from .defaults import PYRAMIDS_KEEP
+# Import kolejki priorytetowej pobrań i dekodowania
+from .scheduler import Scheduler, host_of, HOST_LIMIT, DECODE, INTERACTIVE, VISIBLE, NEXT_PAGE, PREFETCH
+
+# Adres wyszukiwarki NASA Image and Video Library
+SEARCH_URL = "https://images-api.nasa.gov/search"
+# Jakość JPEG atlasów miniatur zapisywanych na dysku
+ATLAS_QUALITY = 90
+# Liczba manifestów zasobów (collection.json) zapamiętywanych w pamięci
+MANIFESTS_KEEP = 256
+# Odstęp (w sekundach) między sprawdzeniami, czy wstrzymane pobieranie z wyprzedzeniem może ruszyć
+PREFETCH_POLL = 0.05
+
+
+# Klasa opisująca wynik pobierania jednej miniatury
+class ThumbnailResult:
+    # Inicjalizacja wyniku
+    def __init__(self, index, item, image=None, error=None):
+        # Pozycja elementu na liście przekazanej do fetch_thumbnails
+        self.index = index
+        # Element wyników wyszukiwania
+        self.item = item
+        # Pomniejszony obraz PIL lub None w razie błędu
+        self.image = image
+        # Wyjątek, jeśli pobieranie się nie powiodło
+        self.error = error
+
+
+# Klasa opisująca atlas miniatur porcji wyników
+class AtlasResult:
+    # Inicjalizacja wyniku
+    def __init__(self, key, image, missing=()):
+        # Klucz atlasu (wyznaczony z adresów miniatur)
+        self.key = key
+        # Obraz PIL z miniaturami w układzie siatki
+        self.image = image
+        # Pozycje elementów, których miniatury nie udało się pobrać (puste komórki)
+        self.missing = list(missing)
+
+
+# Klasa opisująca jedną stronę wyników wyszukiwania
+class SearchPage:
+    # Inicjalizacja strony
+    def __init__(self, items, next_url=None, total_hits=None):
+        # Elementy wyników na tej stronie (rekordy items.Item)
+        self.items = items
+        # Adres następnej strony (None na ostatniej stronie)
+        self.next_url = next_url
+        # Łączna liczba wyników zgłoszona przez API
+        self.total_hits = total_hits
+
+
+# Klasa silnika wyszukiwania i pobierania obrazów
+class SearchEngine:
+    # Inicjalizacja silnika
+    def __init__(self, http, cache, thumb_size, decode_workers=None, search_url=SEARCH_URL,
+                 search_cache=None, pyramid_budget=DEFAULT_MEMORY_BUDGET, pyramids_keep=PYRAMIDS_KEEP,
+                 max_pixels=MAX_IMAGE_PIXELS, max_bytes=MAX_IMAGE_BYTES, decode_processes=0,
+                 metadata_index=None, scheduler=None):
+        # Asynchroniczny klient HTTP
+        self.http = http
+        # Adres wyszukiwarki (można wskazać lokalny serwer testowy)
+        self.search_url = search_url
+        # Dyskowa pamięć podręczna obrazów
+        self.cache = cache
+        # Rozmiar miniatur
+        self.thumb_size = thumb_size
+        # Pula wątków na dekodowanie i operacje dyskowe, aby nie blokować pętli zdarzeń
+        self.executor = ThreadPoolExecutor(max_workers=decode_workers)
+        # Opcjonalna pula procesów dekodujących miniatury poza GIL (0 - dekodowanie w wątkach).
+        # Procesy są uruchamiane metodą spawn, bo rodzic ma już wątki (pętla silnika, Tk).
+        self.process_pool = None
+        if decode_processes:
+            self.process_pool = ProcessPoolExecutor(
+                decode_processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        # Pamięć podręczna odpowiedzi wyszukiwarki
+        self.search_cache = search_cache if search_cache is not None else SearchCache()
+        # Żądania wyszukiwania w toku (klucz -> zadanie), współdzielone przez identyczne zapytania
+        self.inflight = {}
+        # Lokalny indeks pełnotekstowy metadanych pobranych elementów (opcjonalny)
+        self.metadata_index = metadata_index
+        # Katalog piramid kafelków pełnych obrazów
+        self.pyramid_dir = os.path.join(cache.directory, "pyramids")
+        # Budżet pamięci na zdekodowane piksele podczas budowy piramidy
+        self.pyramid_budget = pyramid_budget
+        # Liczba piramid zachowywanych na dysku
+        self.pyramids_keep = pyramids_keep
+        # Limity liczby pikseli i bajtów pobieranych obrazów
+        self.max_pixels = max_pixels
+        self.max_bytes = max_bytes
+        # Zapamiętane manifesty zasobów (adres -> lista adresów), najdawniej używane na początku
+        self.manifests = OrderedDict()
+        # Liczba operacji pierwszoplanowych w toku (wyszukiwania, miniatury, otwierane obrazy);
+        # pobieranie z wyprzedzeniem czeka, aż wszystkie się zakończą
+        self.foreground = 0
+        # Zdarzenie "brak operacji pierwszoplanowych" - tworzone dopiero w pętli silnika
+        self._idle = None
+        # Podglądy pobierane z wyprzedzeniem (adres -> zadanie) i adresy, na które czeka już
+        # otwierane okno - te pobierane są bez przerw i limitu przepustowości
+        self.prefetching = {}
+        self.promoted = set()
+        # Pełne obrazy pobierane przez fetch_image (adres -> liczba pobrań) - pobieranie
+        # z wyprzedzeniem ich pomija
+        self.downloading = {}
+        # Kolejka priorytetowa pobrań i dekodowania. Limity odpowiadają puli połączeń klienta
+        # na host i liczbie wątków puli dekodowania - o kolejności czekających decyduje wtedy
+        # priorytet, a nie kolejki klienta i puli.
+        self.scheduler = scheduler if scheduler is not None else Scheduler(
+            getattr(http, "pool_size", HOST_LIMIT),
+            {DECODE: decode_workers or min(32, (os.cpu_count() or 1) + 4)}
+        )
+
+    # Uruchomienie funkcji blokującej w puli wątków
+    def _run(self, func, *args):
+        return asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    # Miejsce w kolejce priorytetowej na pobranie z adresu url
+    def _slot(self, url, priority, key=None):
+        return self.scheduler.slot(host_of(url), priority, key)
+
+    # Zdarzenie ustawione, gdy nie ma operacji pierwszoplanowych. Silnik powstaje w wątku Tk,
+    # a działa w pętli mostu; w Pythonie 3.9 Event wiąże się z pętlą z chwili utworzenia,
+    # więc tworzymy go przy pierwszym użyciu, już w pętli silnika.
+    @property
+    def idle(self):
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            if not self.foreground:
+                self._idle.set()
+        return self._idle
+
+    # Oznaczenie operacji pierwszoplanowej (wstrzymuje pobieranie z wyprzedzeniem)
+    @contextlib.contextmanager
+    def _foreground(self):
+        self.foreground += 1
+        self.idle.clear()
+        try:
+            yield
+        finally:
+            self.foreground -= 1
+            if not self.foreground:
+                self.idle.set()
+
+    # Pobranie pierwszej strony wyników dla zapytania lub kolejnej strony spod adresu "next"
+    # (kolejne strony ustępują miniaturom kafelków w widoku)
+    async def fetch_page(self, query=None, url=None):
+        if url is None:
+            params = {"q": query, "media_type": "image"}
+            data = await self._search_json(normalize_key(params), self.search_url, INTERACTIVE, params=params)
+        else:
+            data = await self._search_json(key_for_url(url), url, NEXT_PAGE)
+        collection = data.get("collection", {})
+        # Adres następnej strony z tablicy "links" kolekcji
+        next_url = next(
+            (link.get("href") for link in collection.get("links", []) if link.get("rel") == "next"),
+            None
+        )
+        items = collection.get("items", [])
+        with profiler.span("items.parse", items=len(items)):
+            items = parse_items(items, self.thumb_size)
+        return SearchPage(items, next_url, collection.get("metadata", {}).get("total_hits"))
+
+    # Odpowiedź wyszukiwarki z pamięci podręcznej, z żądania w toku lub z sieci
+    async def _search_json(self, key, url, priority, **kwargs):
+        data = self.search_cache.get(key)
+        if data is not None:
+            self.search_cache.stats.hits += 1
+            return data
+
+        task = self.inflight.get(key)
+        if task is not None:
+            # Identyczne żądanie jest w toku - czekamy na jego wynik zamiast wysyłać kolejne
+            self.search_cache.stats.coalesced += 1
+        else:
+            self.search_cache.stats.misses += 1
+            task = asyncio.ensure_future(self._fetch_search_json(key, url, priority, **kwargs))
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        # Anulowanie jednego oczekującego nie przerywa żądania współdzielonego z innymi
+        return await asyncio.shield(task)
+
+    # Pobranie odpowiedzi wyszukiwarki i zapis do pamięci podręcznej
+    async def _fetch_search_json(self, key, url, priority, **kwargs):
+        with self._foreground():
+            async with self._slot(url, priority):
+                data = await self.http.get_json(url, **kwargs)
+        # Zapis metadanych elementów do lokalnego indeksu
+        if self.metadata_index is not None:
+            try:
+                await self._run(self.metadata_index.add, data.get("collection", {}).get("items", []))
+            except sqlite3.Error:
+                # Indeks jest tylko dodatkiem - wyniki z sieci wyświetlamy mimo błędu zapisu
+                pass
+        # Pamięć podręczna przechowuje tylko pola potrzebne do wyświetlenia wyników
+        data = compact_response(data)
+        self.search_cache.put(key, data)
+        return data
+
+    # Wyszukiwanie w lokalnym indeksie metadanych (pusta strona, gdy indeks jest wyłączony)
+    async def search_local(self, query, limit=100):
+        if self.metadata_index is None:
+            return SearchPage([])
+        with profiler.span("local.search", query=query):
+            items = await self._run(self.metadata_index.search, query, limit)
+        return SearchPage(parse_items(items, self.thumb_size), None, len(items))
+
+    # Wyszukiwanie obrazów - zwraca asynchroniczny iterator elementów wyników,
+    # pobierając kolejne strony dopiero wtedy, gdy odbiorca dojdzie do końca poprzedniej
+    async def search(self, query, max_pages=None):
+        page = await self.fetch_page(query)
+        pages = 1
+        while True:
+            for item in page.items:
+                yield item
+            if not page.next_url or (max_pages and pages >= max_pages):
+                break
+            page = await self.fetch_page(url=page.next_url)
+            pages += 1
+
+    # Pobranie obrazu z pamięci podręcznej lub z sieci (miniatury, gdy podano size);
+    # progress(odebrane, długość) raportuje postęp pobierania
+    async def fetch_image(self, url, size=None, progress=None, priority=INTERACTIVE):
+        if size is not None:
+            with self._foreground():
+                return await self._fetch_image(url, size, progress, priority)
+        # Obraz jest właśnie pobierany z wyprzedzeniem - zamiast drugiego pobrania czekamy na nie
+        while url in self.prefetching:
+            await self._join_prefetch(url)
+        # Zgłoszenie pobrania bez przerwy po sprawdzeniu - nowe pobieranie z wyprzedzeniem
+        # tego adresu już się nie zacznie
+        self.downloading[url] = self.downloading.get(url, 0) + 1
+        try:
+            with self._foreground():
+                return await self._fetch_image(url, size, progress, priority)
+        finally:
+            self.downloading[url] -= 1
+            if not self.downloading[url]:
+                del self.downloading[url]
+
+    # Pobranie obrazu z pamięci podręcznej lub z sieci (operacja pierwszoplanowa)
+    async def _fetch_image(self, url, size, progress, priority):
+        async with self.scheduler.slot(DECODE, priority, url):
+            img, entry = await self._run(self.cache.load, url, size)
+        if img is not None:
+            profiler.count("disk_cache.hit")
+            return img
+        profiler.count("disk_cache.miss")
+
+        # Pobranie obrazu (warunkowo, jeśli mamy nieaktualny wpis)
+        img = await self._stream_image(url, size, entry, progress, priority)
+        if img is None:
+            # Wpis usunięty w międzyczasie - pobieramy pełną odpowiedź
+            img = await self._stream_image(url, size, None, progress, priority)
+        return img
+
+    # Strumieniowe pobranie i dekodowanie obrazu z zapisem do pamięci podręcznej;
+    # zwraca None, gdy serwer potwierdził wpis (304), który w międzyczasie zniknął
+    async def _stream_image(self, url, size, entry, progress, priority):
+        variant = self.cache.variant(size)
+        # Pełne obrazy trafiają do pamięci podręcznej w oryginalnej postaci - prosto do pliku,
+        # z którego są też dekodowane
+        part = None if size else open(self.cache.part_path(url, variant), "w+b")
+        decoder = StreamingDecoder(size, self.max_pixels, self.max_bytes, spool=part)
+
+        # Dekodowanie fragmentu (i zapis na dysk) w puli wątków
+        async def consume(chunk, length):
+            await self._run(decoder.feed, chunk)
+            if progress is not None:
+                progress(decoder.received, length)
+
+        # Usunięcie niedokończonego pliku (najwyżej raz)
+        def discard():
+            nonlocal part
+            if part is not None:
+                part.close()
+                os.remove(part.name)
+                part = None
+
+        try:
+            # Czas od wysłania żądania do odebrania ostatniego fragmentu
+            async with self._slot(url, priority, url):
+                with profiler.span("thumbnail.download" if size else "image.download", url=url) as span:
+                    # Zapowiedziana długość sprawdzana przed odczytem treści
+                    response = await self.http.stream(url, consume, expect=decoder.expect,
+                                                      headers=self.cache.validators(entry))
+                    span.set(status=response.status_code, bytes=decoder.received)
+            if response.status_code == 304 and entry is not None:
+                discard()
+                return await self._run(self.cache.revalidated_image, url, entry)
+            response.raise_for_status()
+            async with self.scheduler.slot(DECODE, priority, url):
+                img = await self._decode(decoder, size)
+        except BaseException:
+            discard()
+            raise
+
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if part is not None:
+            part.close()
+            await self._run(self.cache.store_file, url, variant, part.name, etag, last_modified)
+        else:
+            img, data = await self._run(self.cache.encode_thumbnail, img)
+            await self._run(self.cache.store, url, variant, data, etag, last_modified)
+        return img
+
+    # Dekodowanie pobranego obrazu - miniatury w puli procesów, jeśli jest włączona
+    async def _decode(self, decoder, size):
+        data = decoder.take_data() if size and self.process_pool is not None else None
+        if data is None:
+            return await self._run(decoder.close)
+        # W procesie profiler jest wyłączony - dekodowanie i skalowanie mierzone razem
+        with profiler.span("image.decode", process=True):
+            decoded = await asyncio.get_running_loop().run_in_executor(
+                self.process_pool, decode_thumbnail_rgb, data, size
+            )
+        return image_from_rgb(decoded)
+
+    # Pobranie miniatury jednego elementu
+    async def _fetch_thumbnail(self, index, item, semaphore, priority):
+        async with semaphore:
+            try:
+                url = item.thumb
+                if not url:
+                    raise ValueError("item has no image link")
+                img = await self.fetch_image(url, self.thumb_size, priority=priority)
+                return ThumbnailResult(index, item, img)
+            except Exception as e:
+                return ThumbnailResult(index, item, error=e)
+
+    # Równoległe pobieranie miniatur - wyniki w kolejności ukończenia
+    async def fetch_thumbnails(self, items, concurrency=8, priority=VISIBLE):
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = [
+            asyncio.ensure_future(self._fetch_thumbnail(index, item, semaphore, priority))
+            for index, item in enumerate(items)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Przerwanie pozostałych pobrań, jeśli odbiorca przestał czytać wyniki
+            for task in tasks:
+                task.cancel()
+
+    # Klucz atlasu miniatur elementów (ta sama porcja wyników daje ten sam klucz)
+    def atlas_key(self, items):
+        urls = "\n".join(item.thumb or "" for item in items)
+        return "atlas:" + hashlib.sha256(urls.encode("utf-8")).hexdigest()
+
+    # Atlas miniatur porcji wyników złożony w puli wątków; ponowne wyświetlenie tej samej
+    # porcji to odczyt jednego pliku z dyskowej pamięci podręcznej
+    async def fetch_atlas(self, items, columns, cell_size, pad=0, background="black", concurrency=8):
+        key = self.atlas_key(items)
+        variant = f"atlas:{columns}x{cell_size[0]}x{cell_size[1]}+{pad}:{background}"
+        entry = await self._run(self.cache.lookup, key, variant)
+        if entry is not None:
+            profiler.count("atlas_cache.hit")
+            try:
+                return AtlasResult(key, await self._run(lambda: open_image(self.cache.read(entry))))
+            except OSError:
+                # Wpis usunięty w międzyczasie - składamy atlas od nowa
+                pass
+        profiler.count("atlas_cache.miss")
+
+        images = [None] * len(items)
+        async for result in self.fetch_thumbnails(items, concurrency):
+            images[result.index] = result.image
+        async with self.scheduler.slot(DECODE, VISIBLE):
+            with profiler.span("atlas.compose", items=len(items)):
+                atlas = await self._run(compose_atlas, images, columns, cell_size, pad, background)
+        missing = [index for index, img in enumerate(images) if img is None]
+        # Niepełny atlas nie trafia na dysk - przy kolejnym wyświetleniu brakujące miniatury
+        # zostaną pobrane ponownie
+        if not missing:
+            await self._run(self._store_atlas, key, variant, atlas)
+        return AtlasResult(key, atlas, missing)
+
+    # Zapis atlasu w pamięci podręcznej w formacie JPEG
+    def _store_atlas(self, key, variant, atlas):
+        buffer = BytesIO()
+        atlas.save(buffer, "JPEG", quality=ATLAS_QUALITY)
+        self.cache.store(key, variant, buffer.getvalue())
+
+    # Manifest zasobów elementu (lista adresów wersji obrazu), zapamiętywany w pamięci
+    async def _manifest(self, item, priority=INTERACTIVE):
+        href = item.href
+        manifest = self.manifests.get(href)
+        if manifest is not None:
+            self.manifests.move_to_end(href)
+            return manifest
+        async with self._slot(href, priority, href):
+            manifest = self.manifests[href] = await self.http.get_json(href)
+        while len(self.manifests) > MANIFESTS_KEEP:
+            self.manifests.popitem(last=False)
+        return manifest
+
+    # Pobranie podglądu dopasowanego do ekranu
+    async def fetch_preview(self, item, screen_size, progress=None):
+        manifest = None
+        if needs_manifest(item, screen_size):
+            with self._foreground():
+                manifest = await self._manifest(item)
+        return await self.fetch_image(preview_url(item, screen_size, manifest), progress=progress)
+
+    # Pobranie podglądu z wyprzedzeniem do dyskowej pamięci podręcznej (bez dekodowania).
+    # Pobieranie zaczyna się i trwa tylko wtedy, gdy nie ma operacji pierwszoplanowych, nie
+    # przekracza max_rate bajtów na sekundę (0 - bez limitu) ani limit bajtów. Zwraca liczbę
+    # pobranych bajtów (0 - podgląd był już na dysku lub jest właśnie pobierany).
+    async def prefetch_preview(self, item, screen_size, limit, max_rate=0):
+        await self.idle.wait()
+        manifest = await self._manifest(item, PREFETCH) if needs_manifest(item, screen_size) else None
+        url = preview_url(item, screen_size, manifest)
+        if not url:
+            raise ValueError("item has no image link")
+        # Sprawdzenie i zajęcie adresu bez przerwy między nimi - otwierane okno, które zacznie
+        # pobierać ten obraz, dołączy do tego pobrania
+        if url in self.prefetching or url in self.downloading:
+            return 0
+        self.prefetching[url] = asyncio.current_task()
+        try:
+            return await self._prefetch_file(url, limit, max_rate)
+        finally:
+            self.prefetching.pop(url, None)
+            self.promoted.discard(url)
+
+    # Pobranie podglądu z wyprzedzeniem do pliku pamięci podręcznej (adres zajęty w prefetching)
+    async def _prefetch_file(self, url, limit, max_rate):
+        variant = self.cache.variant(None)
+        if await self._run(self.cache.lookup, url, variant) is not None:
+            return 0
+        loop = asyncio.get_running_loop()
+        part = open(self.cache.part_path(url, variant), "w+b")
+        # Bajty i początek okna pomiaru przepustowości (liczonego od nowa po każdej przerwie)
+        received = window_bytes = 0
+        window_start = loop.time()
+
+        async def consume(chunk, length):
+            nonlocal received, window_bytes, window_start
+            if (length or 0) > limit or received + len(chunk) > limit:
+                raise ValueError(f"preview larger than prefetch budget ({limit} bytes)")
+            if url not in self.promoted:
+                # Ustąpienie operacjom pierwszoplanowym
+                if not self.idle.is_set():
+                    while not self.idle.is_set() and url not in self.promoted:
+                        await asyncio.sleep(PREFETCH_POLL)
+                    window_bytes, window_start = 0, loop.time()
+                if max_rate:
+                    delay = window_bytes / max_rate - (loop.time() - window_start)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+            await self._run(part.write, chunk)
+            received += len(chunk)
+            window_bytes += len(chunk)
+
+        try:
+            async with self._slot(url, PREFETCH, url):
+                with profiler.span("preview.prefetch", url=url) as span:
+                    response = await self.http.stream(url, consume)
+                    span.set(status=response.status_code, bytes=received)
+            response.raise_for_status()
+            part.close()
+            await self._run(self.cache.store_file, url, variant, part.name,
+                            response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        except BaseException:
+            part.close()
+            try:
+                os.remove(part.name)
+            except OSError:
+                pass
+            raise
+        return received
+
+    # Oczekiwanie na pobieranie z wyprzedzeniem obrazu, który właśnie jest otwierany
+    async def _join_prefetch(self, url):
+        task = self.prefetching[url]
+        # Otwierany obraz jest pobierany dalej bez przerw i limitu przepustowości, a jeśli
+        # czeka jeszcze w kolejce - przed pozostałymi pobraniami
+        self.promoted.add(url)
+        self.scheduler.promote(url, INTERACTIVE)
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Anulowane zostało samo pobieranie z wyprzedzeniem, a nie oczekujące okno
+            if not task.cancelled():
+                raise
+        except Exception:
+            # Nieudane pobranie z wyprzedzeniem - obraz zostanie pobrany zwyczajnie
+            pass
+
+    # Otwarcie piramidy kafelków obrazu w pełnej rozdzielczości (budowanej przy pierwszym otwarciu)
+    async def open_pyramid(self, item, progress=None):
+        manifest = await self._manifest(item) if item.href else None
+        url = original_url(item, manifest)
+        if not url:
+            raise ValueError("item has no image link")
+        directory = os.path.join(self.pyramid_dir, hashlib.sha256(url.encode("utf-8")).hexdigest())
+        if ImagePyramid.exists(directory):
+            # Czas modyfikacji katalogu wyznacza kolejność usuwania piramid
+            await self._run(os.utime, directory)
+            return ImagePyramid(directory)
+
+        # Oryginał trafia na dysk strumieniowo, a piramida jest budowana z pliku
+        os.makedirs(self.pyramid_dir, exist_ok=True)
+        # Unikalna nazwa - ten sam obraz może być otwierany równolegle
+        fd, source_path = tempfile.mkstemp(".download", os.path.basename(directory) + ".", self.pyramid_dir)
+        os.close(fd)
+        try:
+            with self._foreground():
+                async with self._slot(url, INTERACTIVE, url):
+                    await self.http.download(url, source_path, progress)
+            async with self.scheduler.slot(DECODE, INTERACTIVE):
+                pyramid = await self._run(ImagePyramid.build, source_path, directory, self.pyramid_budget)
+        finally:
+            try:
+                os.remove(source_path)
+            except OSError:
+                pass
+        await self._run(prune, self.pyramid_dir, self.pyramids_keep)
+        return pyramid
+
+    # Odczyt kafelka piramidy przeskalowanego do wyświetlenia
+    async def load_tile(self, pyramid, level, col, row, zoom):
+        async with self.scheduler.slot(DECODE, INTERACTIVE):
+            return await self._run(pyramid.load_tile, level, col, row, zoom)
+
+    # Kafelki w widoku po przewinięciu: czekające miniatury spoza urls ustępują pozostałym
+    # pobraniom, a miniatury, które wróciły do widoku, odzyskują pierwszeństwo
+    async def focus(self, urls):
+        self.scheduler.focus(urls, VISIBLE, PREFETCH)
+
+    # Zamknięcie połączeń i puli wątków
+    async def close(self):
+        await self.http.close()
+        self.search_cache.close()
+        if self.metadata_index is not None:
+            self.metadata_index.close()
+        self.executor.shutdown(wait=False)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Uruchomienie wyszukiwania i pobierania miniatur bez interfejsu graficznego
+async def main(args):
+    engine = SearchEngine(
+        AsyncHTTPClient(), ImageCache(args.cache_dir, DEFAULT_MAX_BYTES, DEFAULT_MAX_AGE),
+        (args.size, args.size), search_url=args.search_url, decode_processes=args.processes
+    )
+    try:
+        start = time.perf_counter()
+        items = []
+        async for item in engine.search(args.query):
+            items.append(item)
+            if len(items) >= args.limit:
+                break
+        print(f"Found {len(items)} items in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        loaded = failed = 0
+        async for result in engine.fetch_thumbnails(items, args.concurrency):
+            if result.error is None:
+                loaded += 1
+            else:
+                failed += 1
+        elapsed = time.perf_counter() - start
+        print(f"Thumbnails: {loaded} loaded, {failed} failed in {elapsed:.2f}s "
+              f"({loaded / elapsed if elapsed else 0:.1f}/s)")
+        print(engine.http.stats.summary())
+        if profiler.active() is not None:
+            print("\n".join(profiler.active().summary()))
+    finally:
+        await engine.close()
+        profiler.disable()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless NASA image search")
+    parser.add_argument("query")
+    parser.add_argument("--limit", type=int, default=15)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--size", type=int, default=180)
+    parser.add_argument("--cache-dir", default=DEFAULT_DIR)
+    parser.add_argument("--search-url", default=SEARCH_URL)
+    # Liczba procesów dekodujących miniatury ("auto" - liczba rdzeni, 0 - wątki)
+    parser.add_argument("--processes", type=lambda v: os.cpu_count() if v == "auto" else int(v), default=0)
+    # Plik JSON Lines z czasami etapów (podsumowanie p50/p95 na końcu)
+    parser.add_argument("--profile", metavar="PATH")
+    args = parser.parse_args()
+    if args.profile:
+        profiler.enable(args.profile)
+    asyncio.run(main(args))
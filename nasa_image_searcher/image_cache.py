@@ -0,0 +1,259 @@
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu do zapisu metadanych wpisów
+import json
+# Import modułu do wyznaczania skrótów adresów URL
+import hashlib
+# Import modułu do odczytu bieżącego czasu
+import time
+# Import modułu do tworzenia unikalnych plików tymczasowych
+import tempfile
+# Import blokady chroniącej indeks przed dostępem z wielu wątków
+import threading
+# Import uporządkowanego słownika do realizacji LRU
+from collections import OrderedDict
+# Import modułu do pracy z danymi binarnymi
+from io import BytesIO
+# Import funkcji dekodujących obrazy
+from .imaging import open_image
+# Import domyślnego katalogu, budżetu i czasu ważności wpisów
+from .defaults import DEFAULT_DIR, DEFAULT_MAX_BYTES, DEFAULT_MAX_AGE
+
+# Wariant wpisu z pomniejszoną miniaturą
+THUMB = "thumb"
+# Wariant wpisu z oryginalnymi bajtami pełnego obrazu
+FULL = "full"
+# Wiek (w sekundach), po którym pozostawiony plik tymczasowy jest usuwany przy starcie
+STALE_PART_AGE = 3600
+
+
+# Klasa opisująca pojedynczy wpis w pamięci podręcznej
+class CacheEntry:
+    # Inicjalizacja wpisu
+    def __init__(self, key, size, etag=None, last_modified=None, validated=0.0):
+        # Klucz (skrót wariantu i adresu URL)
+        self.key = key
+        # Rozmiar danych w bajtach
+        self.size = size
+        # Nagłówek ETag zwrócony przez serwer
+        self.etag = etag
+        # Nagłówek Last-Modified zwrócony przez serwer
+        self.last_modified = last_modified
+        # Czas ostatniego potwierdzenia aktualności wpisu
+        self.validated = validated
+
+
+# Klasa implementująca dyskową pamięć podręczną obrazów z usuwaniem LRU
+class ImageCache:
+    # Inicjalizacja pamięci podręcznej
+    def __init__(self, directory, max_bytes, max_age):
+        # Katalog z plikami pamięci podręcznej
+        self.directory = directory
+        # Maksymalna łączna wielkość plików w bajtach
+        self.max_bytes = max_bytes
+        # Czas (w sekundach), przez który wpis uznajemy za aktualny bez pytania serwera
+        self.max_age = max_age
+        # Indeks wpisów w kolejności od najdawniej do najświeżej używanego
+        self.entries = OrderedDict()
+        # Łączny rozmiar przechowywanych danych
+        self.total_bytes = 0
+        # Blokada chroniąca indeks
+        self.lock = threading.Lock()
+
+        # Utworzenie katalogu, jeśli nie istnieje
+        os.makedirs(directory, exist_ok=True)
+        # Odtworzenie indeksu z plików na dysku
+        self._load_index()
+
+    # Wyznaczenie klucza wpisu na podstawie wariantu i adresu URL
+    @staticmethod
+    def key_for(url, variant):
+        return hashlib.sha256(f"{variant}:{url}".encode("utf-8")).hexdigest()
+
+    # Ścieżka do pliku z danymi wpisu
+    def _data_path(self, key):
+        return os.path.join(self.directory, key + ".bin")
+
+    # Ścieżka do pliku z metadanymi wpisu
+    def _meta_path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    # Odczyt istniejących wpisów z dysku
+    def _load_index(self):
+        found = []
+        for name in os.listdir(self.directory):
+            # Usunięcie plików tymczasowych po przerwanych pobraniach
+            if name.endswith(".tmp"):
+                self._remove_stale(os.path.join(self.directory, name))
+                continue
+            # Interesują nas tylko pliki z metadanymi
+            if not name.endswith(".json"):
+                continue
+            key = name[:-len(".json")]
+            try:
+                # Odczyt metadanych i rozmiaru danych
+                with open(self._meta_path(key), encoding="utf-8") as f:
+                    meta = json.load(f)
+                stat = os.stat(self._data_path(key))
+            except (OSError, ValueError):
+                # Pominięcie uszkodzonych lub niekompletnych wpisów
+                continue
+            entry = CacheEntry(key, stat.st_size, meta.get("etag"),
+                               meta.get("last_modified"), meta.get("validated", 0.0))
+            # Czas modyfikacji pliku danych oznacza ostatnie użycie wpisu
+            found.append((stat.st_mtime, entry))
+
+        # Ułożenie wpisów od najdawniej używanego
+        for _, entry in sorted(found, key=lambda pair: pair[0]):
+            self.entries[entry.key] = entry
+            self.total_bytes += entry.size
+        # Usunięcie nadmiaru, jeśli budżet został zmniejszony
+        with self.lock:
+            self._evict()
+
+    # Usunięcie dawnego pliku tymczasowego (świeży może należeć do innego procesu)
+    @staticmethod
+    def _remove_stale(path):
+        try:
+            if time.time() - os.path.getmtime(path) > STALE_PART_AGE:
+                os.remove(path)
+        except OSError:
+            pass
+
+    # Usuwanie najdawniej używanych wpisów ponad budżet (wywoływane pod blokadą)
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self.entries:
+            key, entry = self.entries.popitem(last=False)
+            self.total_bytes -= entry.size
+            for path in (self._data_path(key), self._meta_path(key)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # Zapis metadanych wpisu na dysk
+    def _write_meta(self, entry, url):
+        meta = {
+            "url": url, "etag": entry.etag,
+            "last_modified": entry.last_modified, "validated": entry.validated,
+        }
+        fd, tmp_path = tempfile.mkstemp(".json.tmp", entry.key + ".", self.directory)
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path(entry.key))
+
+    # Wyszukanie wpisu i oznaczenie go jako ostatnio używanego
+    def lookup(self, url, variant):
+        key = self.key_for(url, variant)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+        try:
+            # Aktualizacja czasu modyfikacji zachowuje kolejność LRU między uruchomieniami
+            os.utime(self._data_path(key))
+        except OSError:
+            # Plik zniknął z dysku - usuwamy wpis z indeksu
+            with self.lock:
+                if self.entries.pop(key, None) is not None:
+                    self.total_bytes -= entry.size
+            return None
+        return entry
+
+    # Sprawdzenie, czy wpis można użyć bez pytania serwera
+    def is_fresh(self, entry):
+        return time.time() - entry.validated < self.max_age
+
+    # Odczyt danych wpisu
+    def read(self, entry):
+        with open(self._data_path(entry.key), "rb") as f:
+            return f.read()
+
+    # Zapis nowych danych pod danym adresem URL
+    def store(self, url, variant, data, etag=None, last_modified=None):
+        # Zapis do pliku tymczasowego i atomowa podmiana
+        tmp_path = self.part_path(url, variant)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        return self.store_file(url, variant, tmp_path, etag, last_modified)
+
+    # Utworzenie pustego pliku tymczasowego, do którego można zapisywać pobierane dane;
+    # zwraca jego ścieżkę. Każde pobranie dostaje własny plik, więc równoległe pobrania tego
+    # samego adresu nie nadpisują ani nie usuwają sobie danych.
+    def part_path(self, url, variant):
+        fd, path = tempfile.mkstemp(".bin.tmp", self.key_for(url, variant) + ".", self.directory)
+        os.close(fd)
+        return path
+
+    # Przyjęcie ukończonego pliku tymczasowego (z part_path) jako danych wpisu
+    def store_file(self, url, variant, tmp_path, etag=None, last_modified=None):
+        key = self.key_for(url, variant)
+        entry = CacheEntry(key, os.path.getsize(tmp_path), etag, last_modified, time.time())
+        os.replace(tmp_path, self._data_path(key))
+        self._write_meta(entry, url)
+
+        with self.lock:
+            # Zastąpienie poprzedniej wersji wpisu
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old.size
+            self.entries[key] = entry
+            self.total_bytes += entry.size
+            self._evict()
+        return entry
+
+    # Oznaczenie wpisu jako potwierdzonego przez serwer (odpowiedź 304)
+    def revalidated(self, url, entry):
+        entry.validated = time.time()
+        self._write_meta(entry, url)
+
+    # Odczyt aktualnego obrazu z pamięci podręcznej; zwraca (obraz, wpis)
+    # - obraz jest None, gdy trzeba zapytać serwer, a wpis służy wtedy do walidacji
+    def load(self, url, size=None):
+        entry = self.lookup(url, self.variant(size))
+        if entry is None:
+            return None, None
+        # Aktualny wpis nie wymaga żadnego ruchu sieciowego
+        if self.is_fresh(entry):
+            try:
+                return open_image(self.read(entry)), entry
+            except OSError:
+                # Wpis usunięty w międzyczasie przez inny wątek - pobieramy od nowa
+                return None, None
+        return None, entry
+
+    # Nazwa wariantu wpisu dla danego rozmiaru
+    @staticmethod
+    def variant(size):
+        # Miniatury przechowujemy już pomniejszone, pełne obrazy jako oryginalne bajty
+        return f"{THUMB}:{size[0]}x{size[1]}" if size else FULL
+
+    # Nagłówki warunkowe pozwalające serwerowi odpowiedzieć 304 bez treści
+    @staticmethod
+    def validators(entry):
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    # Zakodowanie miniatury do zapisu w formacie PNG; zwraca (obraz, bajty)
+    @staticmethod
+    def encode_thumbnail(img):
+        # PNG nie obsługuje np. trybu CMYK
+        if img.mode not in ("1", "L", "LA", "P", "RGB", "RGBA"):
+            img = img.convert("RGB")
+        buffer = BytesIO()
+        img.save(buffer, format="PNG")
+        return img, buffer.getvalue()
+
+    # Odczyt wpisu potwierdzonego przez serwer (odpowiedź 304); None, jeśli wpis zniknął
+    def revalidated_image(self, url, entry):
+        self.revalidated(url, entry)
+        try:
+            return open_image(self.read(entry))
+        except OSError:
+            return None
@@ -0,0 +1,211 @@
+# Import modułu do pracy z danymi binarnymi
+from io import BytesIO
+# Import modułu do pracy z obrazami
+from PIL import Image, ImageFile
+# Import profilera etapów (pomiar dekodowania i skalowania)
+from . import profiler
+# Import domyślnych limitów pobieranych obrazów
+from .defaults import MAX_IMAGE_PIXELS, MAX_IMAGE_BYTES
+
+# Filtr używany przy końcowym skalowaniu miniatur
+THUMBNAIL_RESAMPLE = Image.Resampling.LANCZOS
+# Krotność, o jaką obraz przed końcowym skalowaniem może przekraczać miniaturę
+# (dla formatów bez trybu draft pomniejszanie całkowite wykonuje Image.reduce)
+REDUCING_GAP = 2.0
+# Liczba bajtów, w których musi się zmieścić rozpoznawalny nagłówek obrazu
+HEADER_BYTES = 256 * 1024
+
+
+# Błąd zgłaszany, gdy pobierane dane przekraczają limit lub nie są obrazem
+class ImageLimitError(ValueError):
+    pass
+
+
+# Otwarcie obrazu z bajtów i pełne wczytanie danych
+def open_image(data):
+    return open_image_file(BytesIO(data))
+
+
+# Otwarcie obrazu z pliku (lub obiektu plikowego) i pełne wczytanie danych
+def open_image_file(fp):
+    img = Image.open(fp)
+    with profiler.span("image.decode"):
+        img.load()
+    return img
+
+
+# Dekodowanie miniatury z możliwie najmniejszym nakładem pracy
+def decode_thumbnail(data, size):
+    return decode_thumbnail_file(BytesIO(data), size)
+
+
+# Dekodowanie miniatury z pliku (lub obiektu plikowego)
+def decode_thumbnail_file(fp, size):
+    # Otwarcie obrazu - na tym etapie odczytywany jest tylko nagłówek
+    img = Image.open(fp)
+    # Dla JPEG dekoder może od razu zwrócić obraz pomniejszony 2, 4 lub 8 razy
+    # (skala DCT), o ile wynik wciąż pokrywa rozmiar miniatury. Dla PNG/TIFF
+    # draft nic nie zmienia i zwraca None - wtedy dekodujemy pełny obraz.
+    img.draft(img.mode, size)
+    # Dekodowanie (po wyborze skali draft) mierzone osobno od skalowania
+    with profiler.span("image.decode"):
+        img.load()
+    # Zmiana rozmiaru na miniaturkę
+    with profiler.span("image.resize"):
+        img.thumbnail(size, THUMBNAIL_RESAMPLE, REDUCING_GAP)
+    return img
+
+
+# Dekodowanie miniatury do zwartego bufora pikseli (mode, rozmiar, bajty) - funkcja dla puli
+# procesów: do procesu trafiają skompresowane bajty, z powrotem tylko piksele miniatury
+def decode_thumbnail_rgb(data, size):
+    img = decode_thumbnail(data, size)
+    mode = "RGBA" if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info else "RGB"
+    if img.mode != mode:
+        img = img.convert(mode)
+    return mode, img.size, img.tobytes()
+
+
+# Odtworzenie obrazu z bufora zwróconego przez decode_thumbnail_rgb
+def image_from_rgb(decoded):
+    mode, size, data = decoded
+    return Image.frombuffer(mode, size, data, "raw", mode, 0, 1)
+
+
+# Złożenie miniatur w jeden obraz (atlas) o układzie siatki wyników: komórki cell_size
+# w columns kolumnach, miniatura wyśrodkowana poziomo, pad pikseli od góry komórki.
+# Brakujące miniatury (None) zostawiają pustą komórkę.
+def compose_atlas(images, columns, cell_size, pad=0, background="black"):
+    rows = (len(images) + columns - 1) // columns
+    atlas = Image.new("RGB", (columns * cell_size[0], rows * cell_size[1]), background)
+    for index, img in enumerate(images):
+        if img is None:
+            continue
+        row, col = divmod(index, columns)
+        position = (col * cell_size[0] + (cell_size[0] - img.width) // 2, row * cell_size[1] + pad)
+        # Przezroczystość miniatury odsłania tło atlasu
+        if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+            img = img.convert("RGBA")
+            atlas.paste(img, position, img)
+        else:
+            atlas.paste(img.convert("RGB"), position)
+    return atlas
+
+
+# Dekodowanie miniatury w dotychczasowy sposób (pełne dekodowanie przed skalowaniem)
+def decode_thumbnail_full(data, size):
+    img = open_image(data)
+    img.thumbnail(size, THUMBNAIL_RESAMPLE, None)
+    return img
+
+
+
+# Dekoder obrazu zasilany kolejnymi fragmentami pobieranego pliku (feed/close).
+# Format i wymiary są znane po pierwszych kilobajtach, więc zbyt duże obrazy i dane
+# niebędące obrazem odrzucamy, zanim zostaną pobrane w całości. ImageFile.Parser dekoduje
+# w locie tylko formaty bez własnego odczytu (np. BMP, PPM); JPEG i PNG wymagają całego
+# pliku - te dane zbieramy w pliku spool (jeśli podano) zamiast w pamięci.
+class StreamingDecoder:
+    # Inicjalizacja dekodera; size - rozmiar miniatury (None dla pełnego obrazu),
+    # spool - plik otwarty do zapisu i odczytu, do którego trafiają wszystkie dane
+    def __init__(self, size=None, max_pixels=MAX_IMAGE_PIXELS, max_bytes=MAX_IMAGE_BYTES, spool=None):
+        # Rozmiar miniatury
+        self.size = size
+        # Limity liczby pikseli i bajtów (None - bez limitu)
+        self.max_pixels = max_pixels
+        self.max_bytes = max_bytes
+        # Liczba odebranych bajtów
+        self.received = 0
+        # Format i wymiary odczytane z nagłówka
+        self.format = None
+        self.dimensions = None
+        # Początek pliku, dopóki nagłówek nie zostanie rozpoznany
+        self.head = bytearray()
+        # Dekoder przyrostowy Pillow (formaty dekodowane w locie)
+        self.parser = None
+        # Plik z kopią wszystkich danych (np. wpis pamięci podręcznej)
+        self.spool = spool
+        # Zebrane bajty dla formatów wymagających całego pliku i miniatur JPEG w trybie draft
+        self.buffer = None
+
+    # Sprawdzenie zapowiedzianej długości (Content-Length) przed pobraniem treści
+    def expect(self, length):
+        if length is not None and self.max_bytes and length > self.max_bytes:
+            raise ImageLimitError(f"image is {length} bytes, limit is {self.max_bytes}")
+
+    # Przekazanie kolejnego fragmentu danych
+    def feed(self, chunk):
+        self.received += len(chunk)
+        if self.max_bytes and self.received > self.max_bytes:
+            raise ImageLimitError(f"image exceeds {self.max_bytes} bytes")
+        if self.spool is not None:
+            self.spool.write(chunk)
+        if self.dimensions is None:
+            self.head += chunk
+            self._identify()
+        elif self.parser is not None:
+            self.parser.feed(chunk)
+        elif self.buffer is not self.spool:
+            self.buffer.write(chunk)
+
+    # Próba odczytu nagłówka z początku pliku
+    def _identify(self):
+        try:
+            with Image.open(BytesIO(self.head)) as img:
+                self.format, dimensions = img.format, img.size
+        except Image.DecompressionBombError as e:
+            raise ImageLimitError(str(e))
+        except OSError:
+            # Za mało danych, by rozpoznać format
+            if len(self.head) > HEADER_BYTES:
+                raise ImageLimitError("data is not a recognizable image")
+            return
+        if self.max_pixels and dimensions[0] * dimensions[1] > self.max_pixels:
+            raise ImageLimitError(
+                f"image is {dimensions[0]}x{dimensions[1]}, limit is {self.max_pixels} pixels"
+            )
+        self.dimensions = dimensions
+
+        head, self.head = bytes(self.head), None
+        # Miniatury JPEG dekodujemy z całego pliku w trybie draft (zmniejszona skala DCT)
+        if not (self.size and self.format == "JPEG"):
+            self.parser = ImageFile.Parser()
+            self.parser.feed(head)
+            if self.parser.decoder is not None:
+                return
+            self.parser = None
+        # Format wymaga całego pliku - zbieramy dane bez wielokrotnego kopiowania
+        if self.spool is not None:
+            self.buffer = self.spool
+        else:
+            self.buffer = BytesIO(head)
+            self.buffer.seek(0, 2)
+
+    # Zakończenie strumienia bez dekodowania: zwraca bajty pliku zebrane w pamięci albo None,
+    # gdy obraz jest dekodowany w locie lub zebrany w pliku spool (wtedy należy użyć close)
+    def take_data(self):
+        if self.dimensions is None:
+            raise ImageLimitError("data is not a recognizable image")
+        if self.buffer is None or self.buffer is self.spool:
+            return None
+        buffer, self.buffer = self.buffer, None
+        return buffer.getvalue()
+
+    # Zakończenie strumienia i zwrócenie zdekodowanego obrazu
+    def close(self):
+        if self.dimensions is None:
+            raise ImageLimitError("data is not a recognizable image")
+        if self.buffer is not None:
+            # Dekodowanie bezpośrednio z bufora, bez kopii jego zawartości
+            buffer, self.buffer = self.buffer, None
+            buffer.flush()
+            buffer.seek(0)
+            if self.size:
+                return decode_thumbnail_file(buffer, self.size)
+            return open_image_file(buffer)
+        with profiler.span("image.decode"):
+            img, self.parser = self.parser.close(), None
+        if self.size:
+            with profiler.span("image.resize"):
+                img.thumbnail(self.size, THUMBNAIL_RESAMPLE, REDUCING_GAP)
+        return img
\ No newline at end of file
@@ -0,0 +1,79 @@
+# Zwięzłe rekordy elementów wyników wyszukiwania.
+#
+# Element odpowiedzi API zawiera m.in. opis, słowa kluczowe i dane autora, których siatka
+# wyników nie używa. Silnik zamienia każdą stronę wyników na rekordy Item (__slots__)
+# z polami potrzebnymi do wyświetlania i pobierania obrazów, a tablica "links" jest
+# parsowana na wersje obrazu (Rendition) tylko raz. Powtarzające się napisy (nasa_id,
+# daty) są internowane. Pełne elementy trafiają wyłącznie do lokalnego indeksu metadanych.
+
+# Import funkcji internującej napisy
+import sys
+# Import wyboru wersji (rozmiaru) obrazów
+from .renditions import renditions_from_links, thumbnail_url
+
+# Pola elementu i linku zachowywane przez compact_response
+DATA_FIELDS = ("nasa_id", "title", "date_created")
+LINK_FIELDS = ("href", "rel", "render", "width", "height")
+
+
+# Klasa rekordu jednego elementu wyników
+class Item:
+    __slots__ = ("nasa_id", "title", "date", "href", "renditions", "fallback", "thumb")
+
+    # Inicjalizacja rekordu
+    def __init__(self, nasa_id, title, date, href, renditions, fallback="", thumb=None):
+        # Identyfikator NASA
+        self.nasa_id = nasa_id
+        # Tytuł (None, gdy API go nie podało)
+        self.title = title
+        # Data utworzenia (napis ISO z API)
+        self.date = date
+        # Adres manifestu zasobów (collection.json)
+        self.href = href
+        # Wersje graficzne z tablicy "links" (krotka Rendition)
+        self.renditions = renditions
+        # Pierwszy adres z tablicy "links" (gdy żadna wersja nie została rozpoznana)
+        self.fallback = fallback
+        # Adres miniatury wybranej dla rozmiaru kafelka silnika
+        self.thumb = thumb
+
+    def __repr__(self):
+        return f"Item({self.nasa_id!r}, {self.title!r})"
+
+
+# Internowanie napisu (None i inne typy bez zmian)
+def intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+# Rekord z elementu odpowiedzi API; thumb_size - rozmiar kafelka, dla którego wybierana jest miniatura
+def parse_item(raw, thumb_size=None):
+    data = (raw.get("data") or [{}])[0]
+    links = raw.get("links") or []
+    item = Item(
+        intern(data.get("nasa_id")), data.get("title"), intern(data.get("date_created")), raw.get("href"),
+        tuple(renditions_from_links(links)), links[0].get("href", "") if links else ""
+    )
+    if thumb_size:
+        item.thumb = thumbnail_url(item, thumb_size)
+    return item
+
+
+# Rekordy elementów strony wyników
+def parse_items(raw_items, thumb_size=None):
+    return [parse_item(raw, thumb_size) for raw in raw_items]
+
+
+# Odpowiedź wyszukiwarki bez pól, których nie używa parse_item (do pamięci podręcznej wyszukiwań)
+def compact_response(data):
+    collection = data.get("collection", {})
+    items = []
+    for raw in collection.get("items", []):
+        fields = (raw.get("data") or [{}])[0]
+        items.append({
+            "href": raw.get("href"),
+            "data": [{key: fields[key] for key in DATA_FIELDS if key in fields}],
+            "links": [{key: link[key] for key in LINK_FIELDS if key in link} for link in raw.get("links") or []],
+        })
+    return {"collection": {"items": items, "links": collection.get("links", []),
+                           "metadata": collection.get("metadata", {})}}
@@ -0,0 +1,107 @@
+# Bufor komunikatów logu, niezależny od Tkintera.
+#
+# Producenci z dowolnego wątku dokładają komunikaty metodą put(), a wątek interfejsu co
+# pewien czas odbiera je porcją (drain) i wstawia do pola logu jednym wywołaniem. Bufor
+# ma stałą pojemność - gdy interfejs nie nadąża, najstarsze komunikaty są pomijane, a w ich
+# miejsce pojawia się wiersz z liczbą pominiętych. Opcjonalny plik dostaje wszystkie
+# komunikaty (ze znacznikiem czasu) i jest rotowany po przekroczeniu zadanego rozmiaru.
+
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import blokady chroniącej bufor przed dostępem z wielu wątków
+import threading
+# Import modułu do formatowania znaczników czasu
+import time
+# Import kolejki o stałej długości (bufor cykliczny)
+from collections import deque
+
+# Domyślna pojemność bufora (komunikaty czekające na wyświetlenie)
+DEFAULT_CAPACITY = 10000
+# Domyślny rozmiar pliku logu (w bajtach), po którym plik jest rotowany
+DEFAULT_FILE_BYTES = 5 * 2 ** 20
+# Domyślna liczba zachowywanych starszych plików (log.1, log.2, ...)
+DEFAULT_BACKUPS = 3
+
+
+# Klasa pliku logu rotowanego po przekroczeniu rozmiaru
+class RotatingFile:
+    # Inicjalizacja i otwarcie pliku (dopisywanie do istniejącego)
+    def __init__(self, path, max_bytes=DEFAULT_FILE_BYTES, backups=DEFAULT_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+        # Bieżący rozmiar pliku (liczony z zapisanych znaków, bez odczytu z dysku)
+        self.size = self.file.tell()
+
+    # Zapis wiersza; rotacja, gdy plik przekroczył limit
+    def write(self, line):
+        self.file.write(line)
+        self.size += len(line)
+        if self.size >= self.max_bytes:
+            self._rotate()
+
+    # Przesunięcie plików: log -> log.1 -> log.2 ...; najstarszy jest usuwany
+    def _rotate(self):
+        self.file.close()
+        for index in range(self.backups, 0, -1):
+            source = f"{self.path}.{index - 1}" if index > 1 else self.path
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index}")
+        if not self.backups:
+            os.remove(self.path)
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.size = 0
+
+    # Zapis buforowanych danych na dysk
+    def flush(self):
+        self.file.flush()
+
+    # Zamknięcie pliku
+    def close(self):
+        self.file.close()
+
+
+# Klasa bufora komunikatów logu
+class LogSink:
+    # Inicjalizacja bufora (path=None - bez pliku)
+    def __init__(self, capacity=DEFAULT_CAPACITY, path=None, file_bytes=DEFAULT_FILE_BYTES,
+                 backups=DEFAULT_BACKUPS):
+        # Komunikaty czekające na odbiór przez interfejs
+        self.pending = deque(maxlen=capacity)
+        # Liczba komunikatów pominiętych od ostatniego odbioru
+        self.dropped = 0
+        self.lock = threading.Lock()
+        # Plik z pełnym logiem
+        self.file = RotatingFile(path, file_bytes, backups) if path else None
+
+    # Dodanie komunikatu (można wywołać z dowolnego wątku)
+    def put(self, text):
+        with self.lock:
+            if len(self.pending) == self.pending.maxlen:
+                self.dropped += 1
+            self.pending.append(text)
+            if self.file is not None:
+                self.file.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {text}\n")
+
+    # Odebranie oczekujących komunikatów (wywoływane z wątku interfejsu)
+    def drain(self):
+        with self.lock:
+            lines = list(self.pending)
+            self.pending.clear()
+            dropped, self.dropped = self.dropped, 0
+            if self.file is not None:
+                self.file.flush()
+        if dropped:
+            lines.insert(0, f"... {dropped} log messages skipped")
+        return lines
+
+    # Zamknięcie pliku logu
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
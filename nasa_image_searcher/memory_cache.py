@@ -0,0 +1,92 @@
+# Import uporządkowanego słownika do realizacji LRU
+from collections import OrderedDict
+
+# Domyślny budżet pamięci podręcznej w bajtach
+DEFAULT_MAX_BYTES = 256 * 2 ** 20
+# Bajty na piksel obrazu PIL dla trybów jednobajtowych i 16-bitowych; pozostałe tryby
+# (RGB, RGBA, LA, CMYK, I, F...) PIL przechowuje w 4 bajtach na piksel
+MODE_BYTES = {"1": 1, "L": 1, "P": 1, "I;16": 2, "I;16L": 2, "I;16B": 2, "I;16N": 2}
+# Bajty na piksel obrazu Tk (PhotoImage przechowuje piksele jako RGBA)
+PHOTO_BYTES = 4
+
+
+# Pamięć zajmowana przez piksele obrazu PIL lub PhotoImage (rozpoznawanego po metodzie
+# width() - moduł nie importuje PIL, aby nie spowalniać uruchomienia aplikacji)
+def image_bytes(image):
+    if not callable(image.width):
+        return image.width * image.height * MODE_BYTES.get(image.mode, 4)
+    return image.width() * image.height() * PHOTO_BYTES
+
+
+# Klasa zliczająca trafienia w pamięci podręcznej obrazów
+class MemoryCacheStats:
+    # Inicjalizacja liczników
+    def __init__(self):
+        # Obrazy znalezione w pamięci
+        self.hits = 0
+        # Obrazy, których nie było w pamięci
+        self.misses = 0
+        # Obrazy usunięte z powodu przekroczenia budżetu
+        self.evictions = 0
+
+
+# Klasa pamięci podręcznej zdekodowanych obrazów (PIL.Image i PhotoImage) wspólnej dla
+# siatki wyników i przeglądarki. Klucz zawiera adres i rozmiar obrazu, a budżet jest
+# liczony z liczby pikseli i trybu. Obrazy Tk mogą być tworzone i zwalniane tylko
+# w wątku interfejsu, dlatego pamięć podręczna nie jest chroniona blokadą.
+class MemoryCache:
+    # Inicjalizacja pamięci podręcznej
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        # Budżet pamięci
+        self.max_bytes = max_bytes
+        # Wpisy w kolejności od najdawniej do najświeżej używanego (klucz -> (obraz, rozmiar))
+        self.entries = OrderedDict()
+        # Łączny rozmiar wpisów
+        self.size = 0
+        # Liczniki trafień
+        self.stats = MemoryCacheStats()
+
+    # Odczyt obrazu; None, gdy go nie ma
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry[0]
+
+    # Zapisanie obrazu i usunięcie najdawniej używanych ponad budżet
+    def put(self, key, image):
+        self.discard(key)
+        size = image_bytes(image)
+        # Obraz większy niż cały budżet nie jest zapamiętywany
+        if size > self.max_bytes:
+            return image
+        self.entries[key] = (image, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.size -= evicted
+            self.stats.evictions += 1
+        return image
+
+    # Usunięcie wpisu
+    def discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    # Czy obraz jest w pamięci (bez zmiany kolejności LRU)
+    def __contains__(self, key):
+        return key in self.entries
+
+    # Liczba zapamiętanych obrazów
+    def __len__(self):
+        return len(self.entries)
+
+    # Opis stanu do logu
+    def summary(self):
+        return (f"Memory cache: {len(self.entries)} images, {self.size / 2 ** 20:.1f}/"
+                f"{self.max_bytes / 2 ** 20:.0f} MiB, {self.stats.hits} hits, {self.stats.misses} misses, "
+                f"{self.stats.evictions} evicted")
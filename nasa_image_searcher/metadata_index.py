@@ -0,0 +1,121 @@
+# Import modułu do zapisu elementów w bazie
+import json
+# Import modułu do tworzenia katalogu bazy
+import os
+# Import modułu wyrażeń regularnych do podziału zapytania na słowa
+import re
+# Import modułu bazy SQLite z indeksem pełnotekstowym FTS5
+import sqlite3
+# Import modułu do odczytu bieżącego czasu
+import time
+# Import blokady chroniącej dostęp z wielu wątków
+import threading
+
+# Domyślna liczba wyników zwracanych z indeksu
+DEFAULT_LIMIT = 100
+# Wagi kolumn w rankingu bm25: tytuł, opis, słowa kluczowe, identyfikator
+RANK_WEIGHTS = (10.0, 1.0, 5.0, 10.0)
+# Największa liczba dopasowań oceniana przez bm25 - przy częstych słowach ranking
+# obejmuje tylko najnowsze dopasowania, bo sortowanie wszystkich trwa setki milisekund
+RANK_CANDIDATES = 2000
+# Wzorzec słowa w zapytaniu
+WORD = re.compile(r"\w+", re.UNICODE)
+
+
+# Zapytanie FTS5: każde słowo musi wystąpić, także jako początek dłuższego słowa
+def match_expression(query):
+    return " ".join(f'"{word}"*' for word in WORD.findall(query.lower()))
+
+
+# Klasa lokalnego indeksu pełnotekstowego metadanych elementów wyników (data[0])
+class MetadataIndex:
+    # Inicjalizacja indeksu; path=None - indeks tylko w pamięci
+    def __init__(self, path=None):
+        # Blokada chroniąca połączenie z bazą
+        self.lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        with self.lock, self.db:
+            # Elementy w postaci z API (do wyświetlenia) i pola przeszukiwane
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                "id INTEGER PRIMARY KEY, nasa_id TEXT UNIQUE NOT NULL, title TEXT, description TEXT, "
+                "keywords TEXT, date_created TEXT, indexed REAL NOT NULL, item TEXT NOT NULL)"
+            )
+            # Indeks FTS5 z zewnętrzną treścią - teksty są przechowywane tylko w tabeli items
+            self.db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5("
+                "title, description, keywords, nasa_id, content='items', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+            # Wyzwalacze utrzymujące indeks zgodny z tabelą
+            self.db.executescript("""
+                CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+                    INSERT INTO items_fts (rowid, title, description, keywords, nasa_id)
+                    VALUES (new.id, new.title, new.description, new.keywords, new.nasa_id);
+                END;
+                CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+                    INSERT INTO items_fts (items_fts, rowid, title, description, keywords, nasa_id)
+                    VALUES ('delete', old.id, old.title, old.description, old.keywords, old.nasa_id);
+                END;
+                CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN
+                    INSERT INTO items_fts (items_fts, rowid, title, description, keywords, nasa_id)
+                    VALUES ('delete', old.id, old.title, old.description, old.keywords, old.nasa_id);
+                    INSERT INTO items_fts (rowid, title, description, keywords, nasa_id)
+                    VALUES (new.id, new.title, new.description, new.keywords, new.nasa_id);
+                END;
+            """)
+
+    # Dodanie (lub aktualizacja) elementów wyników
+    def add(self, items):
+        now = time.time()
+        rows = []
+        for item in items:
+            data = (item.get("data") or [{}])[0]
+            nasa_id = data.get("nasa_id")
+            if not nasa_id:
+                continue
+            keywords = data.get("keywords") or []
+            rows.append((
+                nasa_id, data.get("title"), data.get("description"),
+                " ".join(keywords) if isinstance(keywords, list) else str(keywords),
+                data.get("date_created"), now, json.dumps(item)
+            ))
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT INTO items (nasa_id, title, description, keywords, date_created, indexed, item) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (nasa_id) DO UPDATE SET "
+                "title = excluded.title, description = excluded.description, keywords = excluded.keywords, "
+                "date_created = excluded.date_created, indexed = excluded.indexed, item = excluded.item",
+                rows
+            )
+        return len(rows)
+
+    # Wyszukanie elementów pasujących do zapytania, od najlepiej dopasowanych
+    def search(self, query, limit=DEFAULT_LIMIT):
+        expression = match_expression(query)
+        if not expression:
+            return []
+        with self.lock:
+            # Identyfikator najstarszego ocenianego dopasowania (FTS5 zwraca je wg rowid bez sortowania)
+            row = self.db.execute(
+                "SELECT rowid FROM items_fts WHERE items_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                (expression, RANK_CANDIDATES - 1)
+            ).fetchone()
+            rows = self.db.execute(
+                "SELECT items.item FROM items_fts JOIN items ON items.id = items_fts.rowid "
+                "WHERE items_fts MATCH ? AND items_fts.rowid >= ? ORDER BY bm25(items_fts, ?, ?, ?, ?) LIMIT ?",
+                (expression, row[0] if row else 0, *RANK_WEIGHTS, limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    # Liczba zaindeksowanych elementów
+    def __len__(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    # Zamknięcie bazy
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,280 @@
+# Lokalny magazyn odpowiedzi API NASA adresowany treścią oraz klient HTTP, który z niego
+# korzysta. W trybie zapisu (z klientem nadrzędnym) brakujące odpowiedzi są pobierane
+# z sieci i zapisywane; w trybie offline (bez klienta nadrzędnego) magazyn jest jedynym
+# źródłem danych - aplikacja nie wykonuje wtedy żadnych żądań sieciowych.
+
+# Import pętli zdarzeń asyncio
+import asyncio
+# Import modułu do wyznaczania skrótów treści
+import hashlib
+# Import modułu do dekodowania odpowiedzi JSON
+import json
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu bazy SQLite z indeksem adresów
+import sqlite3
+# Import blokady chroniącej dostęp z wielu wątków
+import threading
+# Import modułu do odczytu bieżącego czasu
+import time
+# Import funkcji do rozkładu adresów
+from urllib.parse import urlsplit, parse_qsl
+# Import odpowiedzi i liczników zgodnych z klientem asynchronicznym
+from .nasa_client import AsyncResponse, ClientStats
+# Import normalizacji parametrów zapytania (te same klucze co w pamięci podręcznej wyszukiwań)
+from .search_cache import normalize_key
+
+# Domyślny katalog magazynu
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "nasa-image-searcher", "mirror")
+# Wielkość fragmentu przy odczycie obiektów z dysku
+CHUNK_SIZE = 256 * 1024
+# Wiek (w sekundach), po którym plik tymczasowy przerwanego zapisu jest usuwany
+STALE_TMP_AGE = 60 * 60
+
+
+# Klucz magazynu: adres bez zbędnych różnic w kolejności i zapisie parametrów
+def mirror_key(url, params=None):
+    parts = urlsplit(url)
+    merged = dict(parse_qsl(parts.query))
+    merged.update(params or {})
+    base = f"{parts.scheme}://{parts.netloc}{parts.path}"
+    return f"{base}?{normalize_key(merged)}" if merged else base
+
+
+# Klasa magazynu adresowanego treścią: obiekty w plikach nazwanych skrótem SHA-256,
+# indeks adres -> skrót w bazie SQLite (identyczne pliki są przechowywane raz)
+class ContentStore:
+    # Inicjalizacja magazynu
+    def __init__(self, directory=DEFAULT_DIR):
+        # Katalog magazynu
+        self.directory = directory
+        # Katalog obiektów
+        self.objects = os.path.join(directory, "objects")
+        os.makedirs(self.objects, exist_ok=True)
+        self._remove_stale()
+        # Blokada chroniąca połączenie z bazą
+        self.lock = threading.Lock()
+        # Indeks adresów
+        self.db = sqlite3.connect(os.path.join(directory, "index.sqlite"), check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS urls ("
+                "key TEXT PRIMARY KEY, digest TEXT NOT NULL, size INTEGER NOT NULL, stored REAL NOT NULL)"
+            )
+
+    # Usunięcie plików tymczasowych pozostałych po przerwanych zapisach
+    def _remove_stale(self):
+        now = time.time()
+        for name in os.listdir(self.objects):
+            path = os.path.join(self.objects, name)
+            try:
+                if name.startswith(".tmp-") and now - os.path.getmtime(path) > STALE_TMP_AGE:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    # Ścieżka obiektu o danym skrócie
+    def object_path(self, digest):
+        return os.path.join(self.objects, digest[:2], digest)
+
+    # Wyszukanie obiektu dla klucza; zwraca (skrót, rozmiar) lub None
+    def lookup(self, key):
+        with self.lock:
+            row = self.db.execute("SELECT digest, size FROM urls WHERE key = ?", (key,)).fetchone()
+        if row is None or not os.path.exists(self.object_path(row[0])):
+            return None
+        return row
+
+    # Czy magazyn zawiera odpowiedź dla klucza
+    def __contains__(self, key):
+        return self.lookup(key) is not None
+
+    # Utworzenie pisarza zapisującego obiekt strumieniowo
+    def writer(self, key):
+        return StoreWriter(self, key)
+
+    # Zapis całej odpowiedzi naraz
+    def put(self, key, data):
+        writer = self.writer(key)
+        writer.write(data)
+        return writer.commit()
+
+    # Odczyt całej odpowiedzi
+    def read(self, key):
+        found = self.lookup(key)
+        if found is None:
+            raise KeyError(key)
+        with open(self.object_path(found[0]), "rb") as f:
+            return f.read()
+
+    # Zarejestrowanie obiektu w indeksie (wywoływane przez StoreWriter)
+    def _index(self, key, digest, size):
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO urls (key, digest, size, stored) VALUES (?, ?, ?, ?)",
+                (key, digest, size, time.time())
+            )
+
+    # Liczba adresów i łączny rozmiar obiektów
+    def summary(self):
+        with self.lock:
+            count, size = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM urls").fetchone()
+        return count, size
+
+    # Zamknięcie bazy
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+# Klasa zapisująca jeden obiekt: dane trafiają do pliku tymczasowego, a po zakończeniu
+# plik dostaje nazwę od skrótu treści
+class StoreWriter:
+    # Inicjalizacja pisarza
+    def __init__(self, store, key):
+        self.store = store
+        self.key = key
+        self.hash = hashlib.sha256()
+        self.size = 0
+        self.path = os.path.join(store.objects, f".tmp-{os.getpid()}-{threading.get_ident()}-{id(self)}")
+        self.file = open(self.path, "wb")
+
+    # Zapis fragmentu danych
+    def write(self, chunk):
+        self.hash.update(chunk)
+        self.size += len(chunk)
+        self.file.write(chunk)
+
+    # Zakończenie zapisu; zwraca skrót treści
+    def commit(self):
+        self.file.close()
+        digest = self.hash.hexdigest()
+        path = self.store.object_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            # Identyczna treść jest już w magazynie
+            os.remove(self.path)
+        else:
+            os.replace(self.path, path)
+        self.store._index(self.key, digest, self.size)
+        return digest
+
+    # Porzucenie niedokończonego zapisu
+    def abort(self):
+        self.file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+# Liczniki klienta offline - każde żądanie obsługuje magazyn
+class MirrorStats(ClientStats):
+    # Opis liczników do logu
+    def summary(self):
+        return f"Mirror: {self.requests} responses served from store, 0 network requests"
+
+
+# Klient HTTP obsługujący żądania z magazynu (interfejs zgodny z AsyncHTTPClient)
+class MirrorClient:
+    # Inicjalizacja klienta; upstream - klient sieciowy (None - tryb offline)
+    def __init__(self, store, upstream=None):
+        # Magazyn odpowiedzi
+        self.store = store
+        # Klient sieciowy używany przy braku odpowiedzi w magazynie
+        self.upstream = upstream
+        # Liczniki żądań sieciowych; w trybie offline liczone są odpowiedzi z magazynu,
+        # a liczba otwartych połączeń pozostaje zerowa
+        self.stats = upstream.stats if upstream is not None else MirrorStats()
+        # Bajty pobrane z sieci i odczytane z magazynu
+        self.downloaded = 0
+        self.served = 0
+
+    # Odpowiedź 404 dla adresu spoza magazynu w trybie offline
+    @staticmethod
+    def _missing(url):
+        return AsyncResponse(url, 404, {}, b"")
+
+    # Zapewnienie, że odpowiedź jest w magazynie; zwraca (klucz, czy pobrano z sieci) lub None
+    async def fetch(self, url, params=None):
+        key = mirror_key(url, params)
+        if self.store.lookup(key) is not None:
+            return key, False
+        if self.upstream is None:
+            return None
+        writer = self.store.writer(key)
+
+        async def write(chunk, length):
+            writer.write(chunk)
+            self.downloaded += len(chunk)
+
+        try:
+            # Bez nagłówków warunkowych - magazyn potrzebuje pełnej treści
+            response = await self.upstream.stream(url, write, params=params)
+            response.raise_for_status()
+        except BaseException:
+            writer.abort()
+            raise
+        await asyncio.get_running_loop().run_in_executor(None, writer.commit)
+        return key, True
+
+    # Zliczenie odpowiedzi obsłużonej z magazynu
+    def _served(self, size):
+        self.served += size
+        if self.upstream is None:
+            self.stats.count("requests")
+
+    # Wysłanie żądania GET (nagłówki warunkowe są pomijane - magazyn zwraca pełną treść)
+    async def get(self, url, params=None, **kwargs):
+        found = await self.fetch(url, params)
+        if found is None:
+            return self._missing(url)
+        data = self.store.read(found[0])
+        self._served(len(data))
+        return AsyncResponse(url, 200, {}, data)
+
+    # Pobranie i zdekodowanie odpowiedzi JSON. W trybie offline manifest zasobów
+    # (lista adresów) zawiera tylko pliki obecne w magazynie, więc wybór wersji obrazu
+    # ogranicza się do tych, które da się wyświetlić bez sieci.
+    async def get_json(self, url, **kwargs):
+        response = await self.get(url, **kwargs)
+        response.raise_for_status()
+        data = json.loads(response.content)
+        if self.upstream is None and isinstance(data, list):
+            data = [entry for entry in data if not isinstance(entry, str) or mirror_key(entry) in self.store]
+        return data
+
+    # Pobranie treści strumieniowo (odczyt obiektu z dysku fragmentami)
+    async def stream(self, url, consume, chunk_size=CHUNK_SIZE, params=None, expect=None, **kwargs):
+        found = await self.fetch(url, params)
+        if found is None:
+            return self._missing(url)
+        digest, size = self.store.lookup(found[0])
+        if expect is not None:
+            expect(size)
+        self._served(0)
+        with open(self.store.object_path(digest), "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                self.served += len(chunk)
+                await consume(chunk, size)
+        return AsyncResponse(url, 200, {"Content-Length": str(size)}, b"")
+
+    # Pobranie pliku z magazynu na dysk
+    async def download(self, url, path, progress=None, **kwargs):
+        with open(path, "wb") as f:
+            async def write(chunk, length):
+                f.write(chunk)
+                if progress is not None:
+                    progress(f.tell(), length)
+            response = await self.stream(url, write, **kwargs)
+        response.raise_for_status()
+        return response
+
+    # Zamknięcie klienta sieciowego i magazynu
+    async def close(self):
+        if self.upstream is not None:
+            await self.upstream.close()
+        self.store.close()
@@ -0,0 +1,193 @@
+# Import modułu do losowania opóźnień (jitter)
+import random
+# Import pętli zdarzeń asyncio dla klienta asynchronicznego
+import asyncio
+# Import modułu do dekodowania odpowiedzi JSON
+import json
+# Import blokady chroniącej liczniki przed dostępem z wielu wątków
+import threading
+# Import asynchronicznego klienta HTTP
+import aiohttp
+# Import profilera etapów (pomiar żądań API)
+from . import profiler
+
+# Limit czasu (w sekundach) na nawiązanie połączenia
+CONNECT_TIMEOUT = 5
+# Limit czasu (w sekundach) na odczyt kolejnych danych z gniazda
+READ_TIMEOUT = 30
+# Liczba ponownych prób po błędzie przejściowym
+MAX_RETRIES = 4
+# Podstawa opóźnienia wykładniczego (w sekundach)
+BACKOFF_BASE = 0.5
+# Maksymalne opóźnienie między próbami (w sekundach)
+BACKOFF_MAX = 10
+# Liczba utrzymywanych połączeń do jednego hosta
+POOL_SIZE = 16
+# Kody odpowiedzi, po których warto spróbować ponownie
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+# Wyznaczenie opóźnienia przed kolejną próbą (wykładniczo, z pełnym jitterem)
+def backoff_delay(attempt, base, maximum, retry_after=None):
+    delay = random.uniform(0, min(maximum, base * 2 ** attempt))
+    # Serwer może wskazać minimalny czas oczekiwania
+    if retry_after and retry_after.isdigit():
+        delay = max(delay, min(float(retry_after), maximum))
+    return delay
+
+
+# Klasa zliczająca żądania i połączenia
+class ClientStats:
+    # Inicjalizacja liczników
+    def __init__(self):
+        # Blokada chroniąca liczniki
+        self.lock = threading.Lock()
+        # Liczba wysłanych żądań (łącznie z ponownymi próbami)
+        self.requests = 0
+        # Liczba nowo otwartych połączeń TCP/TLS
+        self.opened = 0
+        # Liczba ponownych prób po błędach
+        self.retries = 0
+
+    # Zwiększenie wybranego licznika
+    def count(self, name):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    # Liczba żądań obsłużonych przez istniejące połączenie
+    @property
+    def reused(self):
+        return max(self.requests - self.opened, 0)
+
+    # Opis liczników do logu
+    def summary(self):
+        return (f"HTTP: {self.requests} requests, {self.opened} connections opened, "
+                f"{self.reused} reused, {self.retries} retries")
+
+
+# Błąd HTTP zgłaszany przez klienta asynchronicznego
+class HTTPStatusError(Exception):
+    # Inicjalizacja błędu
+    def __init__(self, status, url):
+        super().__init__(f"{status} Error for url: {url}")
+        # Kod odpowiedzi i adres żądania
+        self.status = status
+        self.url = url
+
+
+# Klasa przechowująca w całości odczytaną odpowiedź klienta asynchronicznego
+class AsyncResponse:
+    # Inicjalizacja odpowiedzi
+    def __init__(self, url, status, headers, content):
+        self.url = url
+        self.status_code = status
+        self.headers = headers
+        self.content = content
+
+    # Zgłoszenie błędu dla odpowiedzi 4xx/5xx
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPStatusError(self.status_code, self.url)
+
+
+# Klasa asynchronicznego klienta HTTP (asyncio + aiohttp) z ponawianiem i pulą połączeń
+class AsyncHTTPClient:
+    # Inicjalizacja klienta
+    def __init__(self, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE,
+                 backoff_max=BACKOFF_MAX, pool_size=POOL_SIZE):
+        # Limity czasu połączenia i odczytu z gniazda
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        # Parametry ponawiania
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        # Liczniki żądań i połączeń
+        self.stats = ClientStats()
+        # Sesja tworzona przy pierwszym użyciu - musi powstać w pętli, która ją obsługuje
+        self.session = None
+
+    # Utworzenie sesji z pulą połączeń i śledzeniem nowych połączeń
+    def _session(self):
+        if self.session is None:
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_end.append(self._on_connection_created)
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size * 4, limit_per_host=self.pool_size),
+                timeout=self.timeout, trace_configs=[trace]
+            )
+        return self.session
+
+    # Zliczenie nowego połączenia
+    async def _on_connection_created(self, session, context, params):
+        self.stats.count("opened")
+
+    # Wysłanie żądania GET z ponawianiem po błędach przejściowych
+    async def get(self, url, **kwargs):
+        async def read(response):
+            return AsyncResponse(url, response.status, response.headers, await response.read())
+        return await self._request(url, read, **kwargs)
+
+    # Pobranie treści strumieniowo: consume(fragment, długość) otrzymuje kolejne fragmenty
+    # poprawnej odpowiedzi, bez trzymania całej treści w pamięci; expect(długość) dostaje
+    # zapowiedzianą długość przed odczytem treści i może przerwać pobieranie wyjątkiem
+    async def stream(self, url, consume, chunk_size=64 * 1024, expect=None, **kwargs):
+        async def read(response):
+            if response.status < 300:
+                if expect is not None:
+                    expect(response.content_length)
+                try:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        await consume(chunk, response.content_length)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    # Część treści została już przekazana - takiego żądania nie ponawiamy
+                    raise aiohttp.ClientPayloadError(f"download interrupted: {e!r}") from e
+            return AsyncResponse(url, response.status, response.headers, b"")
+        return await self._request(url, read, **kwargs)
+
+    # Pobranie pliku strumieniowo na dysk; progress(odebrane, długość) raportuje postęp
+    async def download(self, url, path, progress=None, **kwargs):
+        with open(path, "wb") as f:
+            async def write(chunk, length):
+                f.write(chunk)
+                if progress is not None:
+                    progress(f.tell(), length)
+            response = await self.stream(url, write, 256 * 1024, **kwargs)
+        response.raise_for_status()
+        return response
+
+    # Wykonanie żądania z ponawianiem; reader odczytuje treść poprawnej odpowiedzi
+    async def _request(self, url, reader, **kwargs):
+        attempt = 0
+        while True:
+            self.stats.count("requests")
+            retry_after = None
+            try:
+                async with self._session().get(url, **kwargs) as response:
+                    # Odpowiedź poprawna lub błąd, którego nie warto ponawiać
+                    if response.status not in RETRY_STATUSES or attempt >= self.max_retries:
+                        return await reader(response)
+                    retry_after = response.headers.get("Retry-After")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                # Błąd sieci - ponawiamy, dopóki nie wyczerpiemy prób
+                if attempt >= self.max_retries:
+                    raise
+            self.stats.count("retries")
+            await asyncio.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max, retry_after))
+            attempt += 1
+
+    # Pobranie i zdekodowanie odpowiedzi JSON
+    async def get_json(self, url, **kwargs):
+        with profiler.span("api.request", url=url) as span:
+            response = await self.get(url, **kwargs)
+            span.set(status=response.status_code, bytes=len(response.content))
+        response.raise_for_status()
+        with profiler.span("json.parse", bytes=len(response.content)):
+            return json.loads(response.content)
+
+    # Zamknięcie sesji i połączeń
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
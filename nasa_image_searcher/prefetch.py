@@ -0,0 +1,192 @@
+# Wsadowe pobieranie wyników zapytań do lokalnego magazynu (np. nocne przygotowanie kiosku).
+#
+# Użycie:
+#     python -m nasa_image_searcher.prefetch --queries queries.txt --pages 3 --renditions thumb,medium
+#
+# Plik zapytań zawiera jedno zapytanie w wierszu. Postęp jest zapisywany w pliku
+# manifest.jsonl w katalogu magazynu - po przerwaniu ponowne uruchomienie pomija
+# ukończone pozycje. Aplikacja otwarta z opcją --mirror działa wtedy bez sieci:
+#     nasa-image-searcher --mirror ~/.cache/nasa-image-searcher/mirror
+
+# Import pętli zdarzeń asyncio
+import asyncio
+# Import modułu do parsowania argumentów wiersza poleceń
+import argparse
+# Import modułu do zapisu manifestu
+import json
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu do pomiaru czasu
+import time
+# Import asynchronicznego klienta HTTP
+from .nasa_client import AsyncHTTPClient
+# Import magazynu adresowanego treścią i klienta, który go wypełnia
+from .mirror import ContentStore, MirrorClient, DEFAULT_DIR
+# Import silnika wyszukiwania (ta sama logika stron wyników co w aplikacji)
+from .engine import SearchEngine, SEARCH_URL
+# Import dyskowej pamięci podręcznej obrazów wymaganej przez silnik
+from .image_cache import ImageCache, DEFAULT_MAX_BYTES, DEFAULT_MAX_AGE
+# Import wyboru wersji (rozmiaru) obrazów
+from .renditions import thumbnail_url, renditions_from_manifest
+# Import rozmiaru miniatury siatki wyników (ten sam adres miniatury co w aplikacji)
+from .defaults import THUMB_SIZE
+
+# Nazwa wersji oznaczająca miniaturę wybieraną przez siatkę wyników
+THUMB = "thumb"
+# Nazwa pliku manifestu w katalogu magazynu
+MANIFEST_NAME = "manifest.jsonl"
+
+
+# Klasa manifestu ukończonych zadań (dopisywany wiersz po wierszu)
+class Manifest:
+    # Wczytanie manifestu z dysku
+    def __init__(self, path):
+        # Ścieżka pliku
+        self.path = path
+        # Ukończone zadania
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self.done.add(json.loads(line)["task"])
+                    except (ValueError, KeyError):
+                        # Ostatni wiersz mógł zostać przerwany w połowie zapisu
+                        continue
+        # Plik otwarty do dopisywania
+        self.file = open(path, "a", encoding="utf-8")
+
+    # Oznaczenie zadania jako ukończonego
+    def mark(self, task):
+        self.done.add(task)
+        self.file.write(json.dumps({"task": task, "time": time.time()}) + "\n")
+        self.file.flush()
+
+    # Zamknięcie pliku
+    def close(self):
+        self.file.close()
+
+
+# Klasa liczników przepustowości
+class PrefetchStats:
+    # Inicjalizacja liczników
+    def __init__(self):
+        self.start = time.perf_counter()
+        # Elementy wyników i pliki pobrane, już obecne w magazynie, pominięte dzięki manifestowi
+        self.items = 0
+        self.fetched = 0
+        self.present = 0
+        self.skipped = 0
+        self.failed = 0
+
+    # Opis liczników
+    def summary(self, client):
+        elapsed = time.perf_counter() - self.start
+        mib = client.downloaded / 2 ** 20
+        return (f"{self.items} items, {self.fetched} files fetched, {self.present} already stored, "
+                f"{self.skipped} skipped (manifest), {self.failed} failed; "
+                f"{mib:.1f} MiB in {elapsed:.1f}s ({mib / elapsed if elapsed else 0:.2f} MiB/s, "
+                f"{self.fetched / elapsed if elapsed else 0:.1f} files/s)")
+
+
+# Adresy wybranych wersji elementu; manifest zasobów pobierany tylko, gdy potrzebny
+async def rendition_urls(client, item, names):
+    urls = {}
+    if THUMB in names:
+        url = thumbnail_url(item, THUMB_SIZE)
+        if url:
+            urls[THUMB] = url
+    others = [name for name in names if name != THUMB]
+    if others and item.href:
+        # Manifest trafia do magazynu - aplikacja offline wybiera z niego wersje podglądu
+        for rendition in renditions_from_manifest(await client.get_json(item.href)):
+            name = "orig" if rendition.is_original else rendition.name
+            if name in others and name not in urls:
+                urls[name] = rendition.href
+    return urls
+
+
+# Pobranie wybranych wersji jednego elementu
+async def prefetch_item(client, item, names, manifest, stats, semaphore):
+    nasa_id = item.nasa_id or item.href
+    pending = [name for name in names if f"{nasa_id}:{name}" not in manifest.done]
+    stats.skipped += len(names) - len(pending)
+    if not pending:
+        return
+    async with semaphore:
+        try:
+            urls = await rendition_urls(client, item, pending)
+        except Exception as e:
+            stats.failed += len(pending)
+            print(f"  {nasa_id}: {e}")
+            return
+        for name in pending:
+            url = urls.get(name)
+            try:
+                if url is None:
+                    raise ValueError(f"no {name} rendition")
+                _, downloaded = await client.fetch(url)
+            except Exception as e:
+                stats.failed += 1
+                print(f"  {nasa_id} {name}: {e}")
+                continue
+            if downloaded:
+                stats.fetched += 1
+            else:
+                stats.present += 1
+            manifest.mark(f"{nasa_id}:{name}")
+
+
+# Pobranie stron wyników jednego zapytania i wersji ich elementów
+async def prefetch_query(engine, query, pages, names, manifest, stats, semaphore):
+    tasks = []
+    # Strony wyników trafiają do magazynu przez klienta silnika
+    async for item in engine.search(query, max_pages=pages):
+        stats.items += 1
+        tasks.append(asyncio.ensure_future(
+            prefetch_item(engine.http, item, names, manifest, stats, semaphore)
+        ))
+    await asyncio.gather(*tasks)
+
+
+async def main(args):
+    names = [name.strip() for name in args.renditions.split(",") if name.strip()]
+    with open(args.queries, encoding="utf-8") as f:
+        queries = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    store = ContentStore(args.store)
+    client = MirrorClient(store, AsyncHTTPClient(pool_size=args.concurrency))
+    # Silnik potrzebuje pamięci podręcznej obrazów, choć pliki trafiają tylko do magazynu
+    engine = SearchEngine(
+        client, ImageCache(os.path.join(args.store, "image-cache"), DEFAULT_MAX_BYTES, DEFAULT_MAX_AGE),
+        THUMB_SIZE, search_url=args.search_url
+    )
+    manifest = Manifest(os.path.join(args.store, MANIFEST_NAME))
+    semaphore = asyncio.Semaphore(args.concurrency)
+    stats = PrefetchStats()
+    try:
+        for query in queries:
+            print(f"{query}:")
+            try:
+                await prefetch_query(engine, query, args.pages, names, manifest, stats, semaphore)
+            except Exception as e:
+                stats.failed += 1
+                print(f"  search failed: {e}")
+            print(f"  {stats.summary(client)}")
+        count, size = store.summary()
+        print(f"Done: {stats.summary(client)}")
+        print(f"Store: {count} responses, {size / 2 ** 20:.1f} MiB in {args.store}")
+    finally:
+        manifest.close()
+        await engine.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prefetch NASA image queries into a local store")
+    parser.add_argument("--queries", required=True, help="file with one query per line")
+    parser.add_argument("--pages", type=int, default=1, help="result pages per query")
+    parser.add_argument("--renditions", default=THUMB, help="comma-separated: thumb,small,medium,large,orig")
+    parser.add_argument("--store", default=DEFAULT_DIR)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--search-url", default=SEARCH_URL)
+    asyncio.run(main(parser.parse_args()))
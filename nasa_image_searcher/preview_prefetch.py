@@ -0,0 +1,113 @@
+# Pobieranie z wyprzedzeniem podglądów obrazów, które użytkownik najpewniej otworzy:
+# najpierw elementu wskazanego myszą, potem kafelków najbliższych środka widoku.
+#
+# Podglądy trafiają do dyskowej pamięci podręcznej silnika, więc kliknięcie kończy się
+# odczytem pliku zamiast pobierania. Naraz pobierany jest jeden podgląd z widoku i jeden
+# wskazany myszą, a silnik wstrzymuje je na czas wyszukiwań i pobierania miniatur
+# (SearchEngine.prefetch_preview). Łączna liczba bajtów jest ograniczona budżetem
+# odnawianym przy każdym nowym wyszukiwaniu.
+
+# Import znacznika anulowania pracy
+from .bridge import CancelToken
+
+
+# Klasa kolejki podglądów pobieranych z wyprzedzeniem (używana w wątku Tk)
+class PreviewPrefetcher:
+    # Inicjalizacja; key(element) - identyfikator elementu, max_rate w bajtach na sekundę,
+    # log(tekst) - zapis nieudanych pobrań
+    def __init__(self, engine, bridge, screen_size, key, max_bytes, max_rate=0, log=None):
+        # Silnik pobierający podglądy i most do jego pętli zdarzeń
+        self.engine = engine
+        self.bridge = bridge
+        # Rozmiar ekranu, do którego dobierany jest podgląd (jak przy otwieraniu obrazu)
+        self.screen_size = screen_size
+        self.key = key
+        # Budżet bajtów na jedno wyszukiwanie i limit przepustowości
+        self.max_bytes = max_bytes
+        self.max_rate = max_rate
+        self.log = log
+        self._reset()
+
+    # Wyzerowanie stanu kolejki
+    def _reset(self):
+        # Znacznik pokolenia - pobieranie jest anulowane przy nowym wyszukiwaniu
+        self.token = CancelToken()
+        # Bajty pobrane w ramach budżetu
+        self.spent = 0
+        # Kandydaci w kolejności od najbardziej prawdopodobnego i element wskazany myszą
+        self.candidates = []
+        self.hovered = None
+        # Identyfikatory elementów pobranych lub pominiętych
+        self.done = set()
+        # Czy trwa pobieranie kandydata z widoku i elementu wskazanego myszą
+        self.busy = False
+        self.hover_busy = False
+
+    # Nowe wyszukiwanie - przerwanie pobierania i odnowienie budżetu
+    def reset(self):
+        self.token.cancel()
+        self._reset()
+
+    # Kandydaci do pobrania (np. kafelki w widoku, od środka)
+    def want(self, items):
+        self.candidates = items
+        self._next()
+
+    # Element pod kursorem myszy - pobierany obok kandydatów z widoku, bez czekania na nich;
+    # przy szybkim ruchu myszy pobierany jest tylko ostatnio wskazany
+    def hover(self, item):
+        self.hovered = item
+        self._next_hovered()
+
+    # Zlecenie pobrania podglądu elementu wskazanego myszą
+    def _next_hovered(self):
+        if self.hover_busy or self.hovered is None or self.spent >= self.max_bytes:
+            return
+        item, self.hovered = self.hovered, None
+        if self._claim(item):
+            self.hover_busy = True
+            self._submit(item, self._on_hovered_done)
+
+    # Zlecenie pobrania kolejnego kandydata z widoku, jeśli żaden nie jest pobierany
+    def _next(self):
+        if self.busy or self.spent >= self.max_bytes:
+            return
+        for item in self.candidates:
+            if self._claim(item):
+                self.busy = True
+                self._submit(item, self._on_done)
+                return
+
+    # Oznaczenie elementu jako obsłużonego; False, jeśli już był
+    def _claim(self, item):
+        item_id = self.key(item)
+        if item_id in self.done:
+            return False
+        self.done.add(item_id)
+        return True
+
+    # Zlecenie pobrania w silniku; done(rozmiar) jest wywoływane w wątku Tk (0 przy błędzie -
+    # błąd trafia tylko do logu, obraz zostanie pobrany po kliknięciu)
+    def _submit(self, item, done):
+        self.bridge.submit(
+            self.engine.prefetch_preview(item, self.screen_size, self.max_bytes - self.spent, self.max_rate),
+            done, lambda e: self._failed(item, e, done), token=self.token
+        )
+
+    # Nieudane pobieranie z wyprzedzeniem - zapis w logu i przejście do kolejnego elementu
+    def _failed(self, item, error, done):
+        if self.log is not None:
+            self.log(f"Preview prefetch failed ({self.key(item)}): {error!r}")
+        done(0)
+
+    # Podgląd z widoku pobrany (lub był już na dysku)
+    def _on_done(self, size):
+        self.busy = False
+        self.spent += size
+        self._next()
+
+    # Podgląd wskazany myszą pobrany
+    def _on_hovered_done(self, size):
+        self.hover_busy = False
+        self.spent += size
+        self._next_hovered()
@@ -0,0 +1,197 @@
+# Lekki profiler etapów wyszukiwania i pobierania obrazów.
+#
+# Kod aplikacji oznacza etapy funkcją span():
+#     with profiler.span("api.request", url=url) as span:
+#         ...
+#         span.set(bytes=len(data))
+# Dopóki profiler nie jest włączony (enable), span() zwraca wspólny pusty obiekt - koszt
+# to jedno sprawdzenie zmiennej globalnej. Po włączeniu czasy trafiają do pliku JSON Lines
+# (jeden wiersz na etap) i do podsumowania p50/p95 wyświetlanego w logu aplikacji.
+# W procesach puli dekodującej profiler nie jest włączony - silnik mierzy wtedy
+# dekodowanie w całości.
+
+# Import modułu do zapisu wierszy JSON
+import json
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import blokady chroniącej dane z wielu wątków
+import threading
+# Import modułu do pomiaru czasu
+import time
+# Import kolejki o stałej długości na ostatnie pomiary
+from collections import deque
+
+# Liczba ostatnich pomiarów etapu, z których liczone są percentyle
+WINDOW = 1000
+
+
+# Percentyl z posortowanej listy
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+# Klasa mierzonego etapu (menedżer kontekstu)
+class Span:
+    __slots__ = ("profiler", "stage", "fields", "start")
+
+    # Inicjalizacja etapu
+    def __init__(self, profiler, stage, fields):
+        self.profiler = profiler
+        self.stage = stage
+        # Dodatkowe pola zapisywane w wierszu (np. url, bytes)
+        self.fields = fields
+        self.start = None
+
+    # Uzupełnienie pól w trakcie etapu (np. liczby pobranych bajtów)
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    # Początek pomiaru
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    # Koniec pomiaru (także przy wyjątku, który jest zapisywany w polu error)
+    def __exit__(self, kind, error, traceback):
+        duration = time.perf_counter() - self.start
+        if kind is not None:
+            self.fields["error"] = kind.__name__
+        self.profiler.record(self.stage, duration, self.fields)
+
+
+# Klasa pustego etapu zwracanego, gdy profiler jest wyłączony
+class NullSpan:
+    __slots__ = ()
+
+    # Pola są pomijane
+    def set(self, **fields):
+        pass
+
+    # Brak pomiaru
+    def __enter__(self):
+        return self
+
+    # Brak zapisu
+    def __exit__(self, kind, error, traceback):
+        pass
+
+
+# Wspólny pusty etap
+NULL_SPAN = NullSpan()
+
+
+# Klasa zbierająca czasy etapów i liczniki
+class Profiler:
+    # Inicjalizacja profilera; path - plik JSON Lines (None - tylko podsumowanie w pamięci)
+    def __init__(self, path=None, window=WINDOW):
+        # Blokada chroniąca pomiary (etapy kończą się w wątku Tk, pętli silnika i puli)
+        self.lock = threading.Lock()
+        # Plik z wierszami pomiarów (katalog może jeszcze nie istnieć przy pierwszym uruchomieniu)
+        self.file = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = open(path, "a", encoding="utf-8")
+        # Liczba ostatnich pomiarów etapu
+        self.window = window
+        # Ostatnie czasy etapów (etap -> kolejka czasów w sekundach)
+        self.durations = {}
+        # Liczba pomiarów i przesłanych bajtów etapów od uruchomienia
+        self.totals = {}
+        self.bytes = {}
+        # Liczniki zdarzeń (np. trafień pamięci podręcznej)
+        self.counters = {}
+        # Liczba pomiarów przy ostatnim podsumowaniu
+        self.reported = 0
+
+    # Zapisanie czasu etapu
+    def record(self, stage, duration, fields):
+        with self.lock:
+            durations = self.durations.get(stage)
+            if durations is None:
+                durations = self.durations[stage] = deque(maxlen=self.window)
+            durations.append(duration)
+            self.totals[stage] = self.totals.get(stage, 0) + 1
+            if "bytes" in fields:
+                self.bytes[stage] = self.bytes.get(stage, 0) + fields["bytes"]
+            if self.file is not None:
+                line = {"time": round(time.time(), 6), "stage": stage, "ms": round(duration * 1000, 3)}
+                line.update(fields)
+                self.file.write(json.dumps(line, default=str) + "\n")
+
+    # Zwiększenie licznika zdarzeń
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    # Czy od ostatniego podsumowania przybyły pomiary
+    def changed(self):
+        return sum(self.totals.values()) != self.reported
+
+    # Podsumowanie etapów (p50/p95, bajty) i trafień pamięci podręcznej jako wiersze logu
+    def summary(self):
+        with self.lock:
+            self.reported = sum(self.totals.values())
+            stages = {stage: sorted(durations) for stage, durations in self.durations.items()}
+            totals, sizes, counters = dict(self.totals), dict(self.bytes), dict(self.counters)
+            if self.file is not None:
+                self.file.flush()
+        lines = []
+        for stage in sorted(stages):
+            values = stages[stage]
+            line = (f"{stage}: n={totals[stage]} p50={percentile(values, 0.5) * 1000:.1f}ms "
+                    f"p95={percentile(values, 0.95) * 1000:.1f}ms")
+            if stage in sizes:
+                line += f" {sizes[stage] / 2 ** 20:.2f}MiB"
+            lines.append(line)
+        # Trafienia liczone parami liczników "<nazwa>.hit" i "<nazwa>.miss"
+        for name in sorted({key.rsplit(".", 1)[0] for key in counters if key.endswith((".hit", ".miss"))}):
+            hits, misses = counters.get(f"{name}.hit", 0), counters.get(f"{name}.miss", 0)
+            lines.append(f"{name}: {100 * hits / (hits + misses):.0f}% hits ({hits}/{hits + misses})")
+        return lines
+
+    # Zamknięcie pliku pomiarów
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+# Włączony profiler (None - pomiary wyłączone)
+_active = None
+
+
+# Włączenie profilera; zwraca go, aby można było odczytać podsumowanie
+def enable(path=None):
+    global _active
+    disable()
+    _active = Profiler(path)
+    return _active
+
+
+# Wyłączenie profilera i zamknięcie pliku pomiarów
+def disable():
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.close()
+
+
+# Włączony profiler lub None
+def active():
+    return _active
+
+
+# Etap do pomiaru (pusty, gdy profiler jest wyłączony)
+def span(stage, **fields):
+    if _active is None:
+        return NULL_SPAN
+    return Span(_active, stage, fields)
+
+
+# Zwiększenie licznika zdarzeń (bez efektu, gdy profiler jest wyłączony)
+def count(name, n=1):
+    if _active is not None:
+        _active.count(name, n)
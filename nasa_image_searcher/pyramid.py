@@ -0,0 +1,253 @@
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu do zapisu opisu piramidy
+import json
+# Import modułu do usuwania katalogów
+import shutil
+# Import modułu do obliczeń skali
+import math
+# Import modułu do mapowania plików poziomów w pamięci
+import mmap
+# Import modułu do tworzenia unikalnych nazw tymczasowych
+import tempfile
+# Import modułu czasu (wiek plików tymczasowych)
+import time
+# Import modułów do pracy z obrazami
+from PIL import Image, JpegImagePlugin
+# Import domyślnego budżetu pamięci budowy piramidy
+from .defaults import DEFAULT_MEMORY_BUDGET
+
+# Bok kafelka piramidy w pikselach
+TILE_SIZE = 256
+# Nazwa pliku z opisem piramidy - jego obecność oznacza ukończoną budowę
+META_NAME = "pyramid.json"
+# Największe zmniejszenie, jakie dekoder JPEG wykonuje podczas dekodowania
+MAX_DRAFT_SCALE = 8
+# Część budżetu pamięci przeznaczona na pas wierszy zmniejszany naraz (1 / BAND_SHARE)
+BAND_SHARE = 8
+# Wiek (w sekundach), po którym pozostałości przerwanej budowy są usuwane
+STALE_TMP_AGE = 60 * 60
+
+
+# Klasa opisująca zapisaną na dysku piramidę kafelków jednego obrazu
+class ImagePyramid:
+    # Wczytanie opisu gotowej piramidy z katalogu
+    def __init__(self, directory):
+        # Katalog z kafelkami
+        self.directory = directory
+        with open(os.path.join(directory, META_NAME), encoding="utf-8") as f:
+            meta = json.load(f)
+        # Wymiary poziomu 0 (najdokładniejszego zapisanego)
+        self.width, self.height = meta["width"], meta["height"]
+        # Wymiary oryginału (poziom 0 może być pomniejszony przez budżet pamięci)
+        self.source_size = tuple(meta["source_size"])
+        # Bok kafelka
+        self.tile_size = meta["tile_size"]
+        # Wymiary kolejnych poziomów; poziom n jest 2^n razy mniejszy od poziomu 0
+        self.levels = [tuple(size) for size in meta["levels"]]
+        # Rozszerzenie plików kafelków
+        self.extension = meta["extension"]
+
+    # Czy w katalogu jest ukończona piramida
+    @staticmethod
+    def exists(directory):
+        return os.path.exists(os.path.join(directory, META_NAME))
+
+    # Ścieżka do pliku kafelka
+    def tile_path(self, level, col, row):
+        return os.path.join(self.directory, str(level), f"{col}_{row}.{self.extension}")
+
+    # Liczba kolumn i wierszy kafelków na danym poziomie
+    def grid(self, level):
+        width, height = self.levels[level]
+        return math.ceil(width / self.tile_size), math.ceil(height / self.tile_size)
+
+    # Odczyt kafelka z dysku przeskalowanego o zadany współczynnik
+    def load_tile(self, level, col, row, zoom=1.0):
+        with Image.open(self.tile_path(level, col, row)) as tile:
+            if zoom == 1.0:
+                tile.load()
+                return tile.copy()
+            size = (max(1, round(tile.width * zoom)), max(1, round(tile.height * zoom)))
+            return tile.resize(size, Image.Resampling.BILINEAR)
+
+    # Budowa piramidy z pliku źródłowego; pamięć zdekodowanych pikseli nie przekracza budżetu
+    @classmethod
+    def build(cls, source_path, directory, memory_budget=DEFAULT_MEMORY_BUDGET, tile_size=TILE_SIZE):
+        # Budowa w unikalnym katalogu tymczasowym i atomowa podmiana po ukończeniu
+        tmp_dir = tempfile.mkdtemp(".tmp", os.path.basename(directory) + ".", os.path.dirname(directory))
+        try:
+            meta = _build_levels(source_path, tmp_dir, memory_budget, tile_size)
+            with open(os.path.join(tmp_dir, META_NAME), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            shutil.rmtree(directory, ignore_errors=True)
+            try:
+                os.replace(tmp_dir, directory)
+            except OSError:
+                # Równoległa budowa tego samego obrazu zdążyła pierwsza - jej wynik jest taki sam
+                if not cls.exists(directory):
+                    raise
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return cls(directory)
+
+
+# Budowa kolejnych poziomów w katalogu; zwraca opis piramidy
+def _build_levels(source_path, directory, memory_budget, tile_size):
+    img = open_source(source_path)
+    source_size = img.size
+    # Kafelki zapisujemy jako JPEG, chyba że obraz ma przezroczystość
+    if img.mode in ("RGBA", "LA", "P", "PA") or "transparency" in img.info:
+        work_mode, extension = "RGBA", "png"
+    else:
+        work_mode, extension = ("L" if img.mode == "L" else "RGBX"), "jpg"
+    # Pas wierszy przetwarzany naraz zajmuje najwyżej część budżetu
+    band_budget = memory_budget // BAND_SHARE
+    budget = memory_budget - 2 * band_budget
+
+    # Poziom 0 ma zawsze pełną rozdzielczość; gdy nie mieści się w budżecie,
+    # dekoder zapisuje piksele do pliku mapowanego w pamięci, z którego wycinamy kafelki
+    level_img, level_map = img, None
+    if not _fits(source_size, img.mode, budget):
+        level_map = _map_file(os.path.join(directory, "level0.raw"), source_size, img.mode)
+        # Obraz zdekodowany do podstawionej pamięci (tak samo PIL mapuje nieskompresowane pliki)
+        stride = source_size[0] * _pixel_bytes(img.mode)
+        img.im = Image.core.map_buffer(level_map, source_size, "raw", 0, (img.mode, stride, 1))
+    img.load()
+    del img
+
+    levels = []
+    while True:
+        level = len(levels)
+        _save_tiles(level_img, os.path.join(directory, str(level)), tile_size, extension, work_mode)
+        levels.append(level_img.size)
+        # Ostatni poziom mieści się w jednym kafelku
+        if max(level_img.size) <= tile_size:
+            break
+        # Kolejny poziom powstaje z poprzedniego; poprzedni przestaje być potrzebny
+        size = (math.ceil(level_img.width / 2), math.ceil(level_img.height / 2))
+        next_img = next_map = None
+        if level_map is not None and _fits(size, work_mode, budget):
+            # Zamiast czytać cały plik mapowany, mniejszy poziom dekoduje od razu dekoder JPEG
+            next_img = _draft(source_path, 2 ** (level + 1), size)
+        if next_img is None:
+            if not _fits(size, work_mode, budget):
+                next_map = _map_file(os.path.join(directory, f"level{level + 1}.raw"), size, work_mode)
+                next_img = Image.frombuffer(work_mode, size, next_map, "raw", work_mode, 0, 1)
+            else:
+                next_img = Image.new(work_mode, size)
+            _reduce_into(level_img, next_img, band_budget)
+        _release(level_img, level_map, directory, level)
+        level_img, level_map = next_img, next_map
+    _release(level_img, level_map, directory, len(levels) - 1)
+
+    return {
+        "width": levels[0][0], "height": levels[0][1], "source_size": source_size,
+        "tile_size": tile_size, "levels": levels, "extension": extension,
+    }
+
+
+# Liczba bajtów na piksel w pamięci PIL
+def _pixel_bytes(mode):
+    if mode in ("1", "L", "P"):
+        return 1
+    return 2 if mode.startswith("I;16") else 4
+
+
+# Czy poziom (razem z dwa razy mniejszym następnym) zmieści się w budżecie
+def _fits(size, mode, budget):
+    return size[0] * size[1] * _pixel_bytes(mode) * 1.25 <= budget
+
+
+# Utworzenie pliku poziomu i zmapowanie go w pamięci
+def _map_file(path, size, mode):
+    length = size[0] * size[1] * _pixel_bytes(mode)
+    with open(path, "w+b") as f:
+        f.truncate(length)
+        return mmap.mmap(f.fileno(), length)
+
+
+# Zwolnienie poziomu; plik mapowany można usunąć dopiero po zwolnieniu obrazu
+def _release(img, mapping, directory, level):
+    img.close()
+    if mapping is not None:
+        mapping.close()
+        os.remove(os.path.join(directory, f"level{level}.raw"))
+
+
+# Dekodowanie pomniejszonego poziomu wprost z JPEG (2, 4 lub 8 razy); None, gdy niemożliwe
+def _draft(source_path, scale, size):
+    if scale > MAX_DRAFT_SCALE:
+        return None
+    img = open_source(source_path)
+    if img.format != "JPEG":
+        img.close()
+        return None
+    img.draft(img.mode, size)
+    if img.size != size:
+        img.close()
+        return None
+    img.load()
+    return img
+
+
+# Zmniejszenie poziomu dwukrotnie pasami wierszy mieszczącymi się w budżecie
+def _reduce_into(img, target, band_budget):
+    rows = max(2, band_budget // (img.width * 4) // 2 * 2)
+    for top in range(0, img.height, rows):
+        band = img.crop((0, top, img.width, min(top + rows, img.height)))
+        if band.mode != target.mode:
+            band = band.convert(target.mode)
+        target.paste(band.reduce(2), (0, top // 2))
+
+# Otwarcie pliku źródłowego bez dekodowania pikseli
+def open_source(path):
+    with open(path, "rb") as f:
+        signature = f.read(3)
+    if signature == b"\xff\xd8\xff":
+        # Wielkie mozaiki JPEG przekraczają limit Image.open chroniący przed "bombami" -
+        # tutaj pamięć ogranicza budżet i dekodowanie w zmniejszonej skali
+        return JpegImagePlugin.JpegImageFile(path)
+    return Image.open(path)
+
+
+# Pocięcie jednego poziomu na kafelki zapisywane w trybie odpowiadającym trybowi roboczemu
+def _save_tiles(img, directory, tile_size, extension, work_mode):
+    os.makedirs(directory, exist_ok=True)
+    mode = "RGB" if work_mode == "RGBX" else work_mode
+    for top in range(0, img.height, tile_size):
+        for left in range(0, img.width, tile_size):
+            tile = img.crop((left, top, min(left + tile_size, img.width), min(top + tile_size, img.height)))
+            if tile.mode != mode:
+                tile = tile.convert(mode)
+            name = f"{left // tile_size}_{top // tile_size}.{extension}"
+            if extension == "jpg":
+                tile.save(os.path.join(directory, name), quality=90)
+            else:
+                tile.save(os.path.join(directory, name))
+
+
+# Usunięcie najdawniej otwieranych piramid ponad zadaną liczbę i pozostałości przerwanych budów
+def prune(root, keep):
+    try:
+        entries = os.listdir(root)
+    except OSError:
+        return
+    now = time.time()
+    for name in entries:
+        path = os.path.join(root, name)
+        try:
+            # Świeży plik tymczasowy może należeć do trwającej budowy
+            if name.endswith((".tmp", ".download")) and now - os.path.getmtime(path) > STALE_TMP_AGE:
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
+        except OSError:
+            pass
+    names = [name for name in entries if ImagePyramid.exists(os.path.join(root, name))]
+    paths = sorted((os.path.join(root, name) for name in names), key=os.path.getmtime)
+    for path in paths[:max(0, len(paths) - keep)]:
+        shutil.rmtree(path, ignore_errors=True)
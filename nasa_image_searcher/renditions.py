@@ -0,0 +1,145 @@
+# Import modułu wyrażeń regularnych do rozpoznawania nazw wersji
+import re
+# Import funkcji internującej napisy
+import sys
+
+# Szacunkowa długość dłuższego boku (w pikselach) wersji udostępnianych przez NASA,
+# używana, gdy API nie podaje wymiarów w tablicy "links"
+ESTIMATED_LONG_EDGE = {
+    "thumb": 100,
+    "small": 640,
+    "medium": 1280,
+    "large": 1920,
+}
+# Nazwa wersji oryginalnej - pobierana tylko wtedy, gdy nie ma innej
+ORIGINAL = "orig"
+# Rozszerzenia plików uznawanych za obrazy
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".tif", ".tiff")
+# Wzorzec nazwy pliku wersji, np. "PIA12345~medium.jpg"
+RENDITION_NAME = re.compile(r"~([a-z]+)\.[a-z0-9]+$", re.IGNORECASE)
+
+
+# Klasa opisująca jedną wersję (rozmiar) obrazu
+class Rendition:
+    __slots__ = ("href", "rel", "width", "height", "name")
+
+    # Inicjalizacja wersji
+    def __init__(self, href, rel=None, width=None, height=None):
+        # Adres pliku
+        self.href = href
+        # Relacja z tablicy "links" (preview, alternate, canonical)
+        self.rel = sys.intern(rel) if isinstance(rel, str) else rel
+        # Wymiary podane przez API (jeśli są)
+        self.width = width
+        self.height = height
+        # Nazwa wersji odczytana z nazwy pliku (thumb, small, medium, large, orig)
+        match = RENDITION_NAME.search(href.split("?", 1)[0])
+        self.name = sys.intern(match.group(1).lower()) if match else None
+
+    # Czy to wersja oryginalna (pełna rozdzielczość)
+    @property
+    def is_original(self):
+        return self.name == ORIGINAL or self.rel == "canonical"
+
+    # Długość dłuższego boku - podana przez API lub oszacowana po nazwie
+    @property
+    def long_edge(self):
+        if self.width and self.height:
+            return max(self.width, self.height)
+        return ESTIMATED_LONG_EDGE.get(self.name)
+
+    # Czy wersja pokrywa zadany prostokąt bez powiększania
+    def covers(self, box):
+        if self.width and self.height:
+            # Dopasowanie do prostokąta nie wymaga powiększenia
+            return self.width >= box[0] or self.height >= box[1]
+        long_edge = self.long_edge
+        return long_edge is not None and long_edge >= max(box)
+
+    def __repr__(self):
+        return f"Rendition({self.name!r}, {self.href!r})"
+
+
+# Odczyt wersji graficznych z tablicy "links" elementu wyników
+def renditions_from_links(links):
+    renditions = []
+    for link in links or []:
+        href = link.get("href", "")
+        # Pominięcie napisów, metadanych i innych zasobów niebędących obrazem
+        render = link.get("render")
+        if not href or (render and render != "image"):
+            continue
+        if not render and not href.lower().split("?", 1)[0].endswith(IMAGE_EXTENSIONS):
+            continue
+        renditions.append(Rendition(href, link.get("rel"), link.get("width"), link.get("height")))
+    return renditions
+
+
+# Odczyt wersji graficznych z manifestu zasobów (collection.json)
+def renditions_from_manifest(urls):
+    return [
+        Rendition(url) for url in urls
+        if url.lower().split("?", 1)[0].endswith(IMAGE_EXTENSIONS)
+    ]
+
+
+# Wybór najmniejszej wersji, która pokrywa zadany prostokąt (oryginał tylko w ostateczności)
+def choose(renditions, box):
+    # Wersje nieoryginalne o znanym lub oszacowanym rozmiarze, od najmniejszej
+    sized = sorted(
+        (r for r in renditions if r.long_edge is not None and not r.is_original),
+        key=lambda r: r.long_edge
+    )
+    for rendition in sized:
+        if rendition.covers(box):
+            return rendition
+    # Żadna wersja nie pokrywa prostokąta - bierzemy największą dostępną
+    if sized:
+        return sized[-1]
+    # W ostateczności zostaje wersja o nieznanym rozmiarze lub oryginał
+    others = [r for r in renditions if not r.is_original]
+    if others:
+        return others[0]
+    return renditions[0] if renditions else None
+
+
+# Adres miniatury elementu (rekord items.Item) pokrywającej kafelek o zadanym rozmiarze
+def thumbnail_url(item, size):
+    rendition = choose(item.renditions, size)
+    if rendition is not None:
+        return rendition.href
+    # Brak rozpoznanych wersji - zachowanie jak dotychczas
+    return item.fallback
+
+
+# Czy wybór podglądu wymaga pobrania manifestu zasobów (collection.json)
+def needs_manifest(item, screen_size):
+    # Tablica "links" zawiera zwykle tylko miniaturę - wtedy sięgamy po manifest zasobów
+    rendition = choose(item.renditions, screen_size)
+    return bool(item.href) and (rendition is None or not rendition.covers(screen_size))
+
+
+# Adres podglądu dopasowanego do ekranu; manifest to lista adresów zasobów (jeśli pobrana)
+def preview_url(item, screen_size, manifest=None):
+    renditions = list(item.renditions)
+    if manifest:
+        renditions += renditions_from_manifest(manifest)
+    rendition = choose(renditions, screen_size)
+    if rendition is not None:
+        return rendition.href
+    return item.fallback
+
+
+
+# Adres wersji w pełnej rozdzielczości (do powiększania); bez oryginału - największa znana
+def original_url(item, manifest=None):
+    renditions = list(item.renditions)
+    if manifest:
+        renditions += renditions_from_manifest(manifest)
+    for rendition in renditions:
+        if rendition.is_original:
+            return rendition.href
+    sized = [r for r in renditions if r.long_edge is not None]
+    if sized:
+        return max(sized, key=lambda r: r.long_edge).href
+    return renditions[0].href if renditions else None
\ No newline at end of file
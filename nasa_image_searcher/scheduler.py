@@ -0,0 +1,221 @@
+# Kolejka priorytetowa pobrań i dekodowania silnika (używana w pętli asyncio).
+#
+# Każde pobranie zajmuje miejsce zasobu - hosta z adresu lub puli dekodowania (DECODE).
+# Zasób ma limit równoległych operacji; gdy jest zajęty, operacje czekają w kolejce i są
+# uruchamiane według klas priorytetu:
+#     INTERACTIVE - otwierany obraz i pierwsza strona wyszukiwania (użytkownik czeka),
+#     VISIBLE     - miniatury kafelków w widoku,
+#     NEXT_PAGE   - kolejna strona wyników,
+#     PREFETCH    - pobieranie z wyprzedzeniem i miniatury, które opuściły widok.
+# W obrębie klasy grupy (domyślnie hosty) są obsługiwane na zmianę, więc wolny host nie
+# blokuje pozostałych. Miniatury zmieniają klasę przy przewijaniu (focus).
+
+# Import pętli zdarzeń asyncio
+import asyncio
+# Import modułu do tworzenia menedżerów kontekstu
+import contextlib
+# Import modułu do pomiaru czasu oczekiwania
+import time
+# Import uporządkowanego słownika (kolejka grup obsługiwanych na zmianę) i kolejek
+from collections import OrderedDict, deque
+# Import funkcji do rozkładu adresów
+from urllib.parse import urlsplit
+
+# Klasy priorytetu - mniejsza wartość oznacza pierwszeństwo
+INTERACTIVE = 0
+VISIBLE = 1
+NEXT_PAGE = 2
+PREFETCH = 3
+PRIORITIES = (INTERACTIVE, VISIBLE, NEXT_PAGE, PREFETCH)
+# Nazwy klas do podsumowania
+PRIORITY_NAMES = ("interactive", "visible", "next page", "prefetch")
+# Domyślny limit równoległych pobrań z jednego hosta
+HOST_LIMIT = 8
+# Część miejsc zasobu dostępna dla operacji zleconych w klasie PREFETCH - reszta zostaje dla
+# pracy, na którą czeka użytkownik (wstrzymane pobieranie z wyprzedzeniem nie zajmuje
+# wszystkich miejsc)
+PREFETCH_SHARE = 0.5
+# Zasób puli dekodowania obrazów
+DECODE = "decode"
+
+
+# Zasób (host), do którego odwołuje się adres
+def host_of(url):
+    return urlsplit(url).netloc or url
+
+
+# Klasa opisująca operację czekającą na miejsce zasobu
+class Ticket:
+    __slots__ = ("resource", "group", "key", "base", "priority", "future", "queued")
+
+    # Inicjalizacja operacji
+    def __init__(self, resource, group, key, priority, future):
+        self.resource = resource
+        # Grupa, w ramach której operacje są obsługiwane na zmianę z innymi grupami
+        self.group = group
+        # Klucz, po którym operację można przenieść do innej klasy (np. adres miniatury)
+        self.key = key
+        # Klasa zlecona i bieżąca (po obniżeniu lub podniesieniu)
+        self.base = priority
+        self.priority = priority
+        self.future = future
+        # Chwila dodania do kolejki
+        self.queued = time.perf_counter()
+
+
+# Klasa zliczająca operacje według klas
+class SchedulerStats:
+    # Inicjalizacja liczników
+    def __init__(self):
+        # Operacje uruchomione w każdej klasie
+        self.started = [0] * len(PRIORITIES)
+        # Operacje, które czekały w kolejce, i łączny czas ich oczekiwania (w sekundach)
+        self.waited = [0] * len(PRIORITIES)
+        self.wait_time = [0.0] * len(PRIORITIES)
+        # Operacje przeniesione do niższej i wyższej klasy
+        self.demoted = 0
+        self.promoted = 0
+
+    # Opis liczników do logu
+    def summary(self):
+        classes = ", ".join(
+            f"{name} {started} ({self.wait_time[priority] / self.waited[priority] * 1000:.0f} ms avg wait)"
+            if self.waited[priority] else f"{name} {started}"
+            for priority, (name, started) in enumerate(zip(PRIORITY_NAMES, self.started))
+        )
+        return f"Scheduler: {classes}; {self.demoted} demoted, {self.promoted} promoted"
+
+
+# Klasa kolejki priorytetowej z limitami zasobów
+class Scheduler:
+    # Inicjalizacja; limits - limity wybranych zasobów (np. {DECODE: 4}), pozostałe host_limit
+    def __init__(self, host_limit=HOST_LIMIT, limits=None):
+        self.host_limit = host_limit
+        self.limits = dict(limits or {})
+        # Liczba trwających operacji każdego zasobu
+        self.active = {}
+        # Liczba operacji czekających na każdy zasób
+        self.pending = {}
+        # Kolejki klas: grupa -> operacje w kolejności zlecenia (grupy obsługiwane na zmianę)
+        self.queues = {priority: OrderedDict() for priority in PRIORITIES}
+        self.stats = SchedulerStats()
+
+    # Czy zasób ma wolne miejsce dla operacji zleconej w danej klasie
+    def _free(self, resource, priority):
+        limit = self.limits.get(resource, self.host_limit)
+        if priority == PREFETCH:
+            limit = max(1, int(limit * PREFETCH_SHARE))
+        return self.active.get(resource, 0) < limit
+
+    # Miejsce zasobu na czas bloku: async with scheduler.slot(host_of(url), VISIBLE): ...
+    @contextlib.asynccontextmanager
+    async def slot(self, resource, priority, key=None, group=None):
+        await self.acquire(resource, priority, key, group)
+        try:
+            yield
+        finally:
+            self.release(resource)
+
+    # Zajęcie miejsca zasobu - od razu, jeśli nikt na nie nie czeka, inaczej w kolejce
+    async def acquire(self, resource, priority, key=None, group=None):
+        if not self.pending.get(resource) and self._free(resource, priority):
+            self.active[resource] = self.active.get(resource, 0) + 1
+            self.stats.started[priority] += 1
+            return
+        ticket = Ticket(resource, resource if group is None else group, key, priority,
+                        asyncio.get_running_loop().create_future())
+        self._enqueue(ticket)
+        # Miejsce mogło czekać tylko na operację anulowaną w kolejce
+        self._dispatch()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.future.cancelled():
+                self._remove(ticket)
+            else:
+                # Miejsce przydzielone tuż przed anulowaniem - zwalniamy je dla następnych
+                self.release(resource)
+            raise
+
+    # Zwolnienie miejsca i uruchomienie czekających operacji
+    def release(self, resource):
+        self.active[resource] -= 1
+        self._dispatch()
+
+    # Dodanie operacji do kolejki jej bieżącej klasy
+    def _enqueue(self, ticket):
+        queue = self.queues[ticket.priority]
+        if ticket.group not in queue:
+            queue[ticket.group] = deque()
+        queue[ticket.group].append(ticket)
+        self.pending[ticket.resource] = self.pending.get(ticket.resource, 0) + 1
+
+    # Usunięcie operacji z kolejki
+    def _remove(self, ticket):
+        queue = self.queues[ticket.priority]
+        tickets = queue[ticket.group]
+        tickets.remove(ticket)
+        if not tickets:
+            del queue[ticket.group]
+        self.pending[ticket.resource] -= 1
+
+    # Uruchomienie czekających operacji, dla których zwolniło się miejsce: klasy od
+    # najważniejszej, w klasie grupy na zmianę, w grupie w kolejności zlecenia
+    def _dispatch(self):
+        granted = True
+        while granted:
+            granted = False
+            for priority in PRIORITIES:
+                queue = self.queues[priority]
+                for group, tickets in queue.items():
+                    # Operacje anulowane w oczekiwaniu usuwa z kolejki ich własna obsługa anulowania
+                    ticket = next((ticket for ticket in tickets
+                                   if not ticket.future.done() and self._free(ticket.resource, ticket.base)), None)
+                    if ticket is not None:
+                        break
+                else:
+                    continue
+                self._remove(ticket)
+                # Grupa obsłużona - na koniec kolejki klasy
+                if group in queue:
+                    queue.move_to_end(group)
+                self.active[ticket.resource] = self.active.get(ticket.resource, 0) + 1
+                self.stats.started[ticket.base] += 1
+                self.stats.waited[ticket.base] += 1
+                self.stats.wait_time[ticket.base] += time.perf_counter() - ticket.queued
+                ticket.future.set_result(None)
+                granted = True
+                break
+
+    # Operacje klasy priority z kluczami spoza keys przechodzą do klasy demoted, a wcześniej
+    # obniżone z kluczami z keys wracają (np. miniatury kafelków, które opuściły widok)
+    def focus(self, keys, priority, demoted):
+        keys = set(keys)
+        moved = [
+            ticket for current in (priority, demoted) for tickets in self.queues[current].values()
+            for ticket in tickets if ticket.base == priority and (ticket.key in keys) != (current == priority)
+        ]
+        for ticket in moved:
+            self._remove(ticket)
+            if ticket.key in keys:
+                ticket.priority = priority
+                self.stats.promoted += 1
+            else:
+                ticket.priority = demoted
+                self.stats.demoted += 1
+            self._enqueue(ticket)
+
+    # Przeniesienie czekających operacji o kluczu key do wyższej klasy (np. podgląd pobierany
+    # z wyprzedzeniem, na który czeka już otwierane okno)
+    def promote(self, key, priority):
+        moved = [
+            ticket for current in PRIORITIES if current > priority
+            for tickets in self.queues[current].values() for ticket in tickets if ticket.key == key
+        ]
+        for ticket in moved:
+            self._remove(ticket)
+            ticket.base = ticket.priority = priority
+            self._enqueue(ticket)
+            self.stats.promoted += 1
+        if moved:
+            self._dispatch()
@@ -0,0 +1,134 @@
+# Import modułu do zapisu odpowiedzi w bazie
+import json
+# Import modułu do tworzenia katalogu bazy
+import os
+# Import modułu bazy SQLite do opcjonalnego trwałego zapisu
+import sqlite3
+# Import modułu do odczytu bieżącego czasu
+import time
+# Import blokady chroniącej dostęp z wielu wątków
+import threading
+# Import uporządkowanego słownika do realizacji LRU
+from collections import OrderedDict
+# Import funkcji do rozkładu i składania parametrów adresu
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# Domyślny czas życia wpisu (w sekundach)
+DEFAULT_TTL = 15 * 60
+# Domyślna maksymalna liczba wpisów
+DEFAULT_MAX_ENTRIES = 200
+
+
+# Klucz wpisu: znormalizowane zapytanie i filtry w stałej kolejności
+def normalize_key(params):
+    normalized = []
+    for name, value in params.items():
+        value = str(value)
+        # Wielkość liter i nadmiarowe odstępy w zapytaniu nie zmieniają wyników
+        if name == "q":
+            value = " ".join(value.lower().split())
+        normalized.append((name, value))
+    return urlencode(sorted(normalized))
+
+
+# Klucz wpisu dla adresu strony wyników (np. z linku "next")
+def key_for_url(url):
+    return normalize_key(dict(parse_qsl(urlsplit(url).query)))
+
+
+# Klasa zliczająca trafienia w pamięci podręcznej wyszukiwań
+class SearchCacheStats:
+    # Inicjalizacja liczników
+    def __init__(self):
+        # Odpowiedzi obsłużone z pamięci podręcznej
+        self.hits = 0
+        # Odpowiedzi pobrane z sieci
+        self.misses = 0
+        # Żądania dołączone do identycznego żądania w toku
+        self.coalesced = 0
+
+    # Opis liczników do logu
+    def summary(self):
+        return f"Search cache: {self.hits} hits, {self.misses} misses, {self.coalesced} coalesced"
+
+
+# Klasa pamięci podręcznej odpowiedzi wyszukiwarki z czasem życia i limitem wpisów
+class SearchCache:
+    # Inicjalizacja pamięci podręcznej
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, path=None):
+        # Czas życia wpisu
+        self.ttl = ttl
+        # Maksymalna liczba wpisów
+        self.max_entries = max_entries
+        # Wpisy w kolejności od najdawniej do najświeżej używanego (klucz -> (czas, dane))
+        self.entries = OrderedDict()
+        # Liczniki trafień
+        self.stats = SearchCacheStats()
+        # Blokada chroniąca wpisy i bazę
+        self.lock = threading.Lock()
+        # Opcjonalna baza SQLite przechowująca wpisy między uruchomieniami
+        self.db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS searches "
+                "(key TEXT PRIMARY KEY, stored REAL NOT NULL, data TEXT NOT NULL)"
+            )
+            self._load()
+
+    # Odczyt aktualnych wpisów z bazy
+    def _load(self):
+        with self.lock:
+            # Usunięcie przeterminowanych wpisów
+            self.db.execute("DELETE FROM searches WHERE stored < ?", (time.time() - self.ttl,))
+            self.db.commit()
+            rows = self.db.execute(
+                "SELECT key, stored, data FROM searches ORDER BY stored DESC LIMIT ?",
+                (self.max_entries,)
+            ).fetchall()
+            for key, stored, data in reversed(rows):
+                self.entries[key] = (stored, json.loads(data))
+
+    # Odczyt wpisu; None, jeśli go nie ma lub jest przeterminowany
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            stored, data = entry
+            if time.time() - stored >= self.ttl:
+                # Przeterminowany wpis usuwamy
+                del self.entries[key]
+                if self.db is not None:
+                    self.db.execute("DELETE FROM searches WHERE key = ?", (key,))
+                    self.db.commit()
+                return None
+            self.entries.move_to_end(key)
+            return data
+
+    # Zapis odpowiedzi
+    def put(self, key, data):
+        stored = time.time()
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (stored, data)
+            if self.db is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO searches (key, stored, data) VALUES (?, ?, ?)",
+                    (key, stored, json.dumps(data))
+                )
+            # Usunięcie najdawniej używanych wpisów ponad limit
+            while len(self.entries) > self.max_entries:
+                old_key, _ = self.entries.popitem(last=False)
+                if self.db is not None:
+                    self.db.execute("DELETE FROM searches WHERE key = ?", (old_key,))
+            if self.db is not None:
+                self.db.commit()
+
+    # Zamknięcie bazy
+    def close(self):
+        if self.db is not None:
+            with self.lock:
+                self.db.close()
+                self.db = None
@@ -0,0 +1,141 @@
+# Wspólne narzędzia testów: lokalny serwer HTTP, którego odpowiedzi (opóźnienia, błędy,
+# zerwane połączenia) ustala każdy test.
+
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu gniazd (serwer, który nie przyjmuje połączeń)
+import socket
+# Import modułu z parametrami interpretera
+import sys
+# Import modułu do uruchomienia serwera w osobnym wątku
+import threading
+# Import modułu do opóźnień i pomiaru czasu
+import time
+# Import wielowątkowego serwera HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+# Import funkcji do rozkładu adresów
+from urllib.parse import urlsplit
+
+# Import modułu testów
+import pytest
+
+# Dostęp do pakietu aplikacji z katalogu nadrzędnego (testy bez instalacji pakietu)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Klasa opisująca żądanie odebrane przez serwer testowy
+class Request:
+    # Inicjalizacja opisu
+    def __init__(self, path, client, started):
+        # Ścieżka żądania (bez parametrów)
+        self.path = path
+        # Adres i port klienta - ten sam port oznacza ponownie użyte połączenie
+        self.client = client
+        # Chwila odebrania żądania (time.perf_counter)
+        self.started = started
+        # Chwila wysłania całej odpowiedzi (None - odpowiedź nie została wysłana w całości)
+        self.finished = None
+        # Czy klient zamknął połączenie w trakcie wysyłania treści
+        self.aborted = False
+
+
+# Klasa obsługi żądań serwera testowego - odpowiedź przygotowuje funkcja trasy
+class ScriptedHandler(BaseHTTPRequestHandler):
+    # Połączenia utrzymywane między żądaniami (keep-alive)
+    protocol_version = "HTTP/1.1"
+
+    # Obsługa żądania GET
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        request = self.server.record(path, self.client_address)
+        route = self.server.routes.get(path)
+        try:
+            if route is None:
+                self.reply(404)
+            else:
+                route(self, request)
+            request.finished = time.perf_counter()
+        except (BrokenPipeError, ConnectionResetError):
+            # Klient zerwał połączenie (np. anulowane pobieranie)
+            request.aborted = True
+            self.close_connection = True
+
+    # Wysłanie odpowiedzi; treść w fragmentach co delay sekund (np. powolny serwer)
+    def reply(self, status, body=b"", headers=None, chunks=1, delay=0.0):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        size = max(1, -(-len(body) // chunks))
+        for start in range(0, len(body), size):
+            if delay:
+                time.sleep(delay)
+            self.wfile.write(body[start:start + size])
+            self.wfile.flush()
+
+    # Wyciszenie logu serwera
+    def log_message(self, format, *args):
+        pass
+
+
+# Klasa serwera testowego z trasami ustawianymi przez test
+class ScriptedServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    # Inicjalizacja serwera na wolnym porcie
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), ScriptedHandler)
+        # Ścieżka -> funkcja(handler, request) wysyłająca odpowiedź
+        self.routes = {}
+        # Odebrane żądania w kolejności przyjścia
+        self.requests = []
+        self.lock = threading.Lock()
+
+    # Adres serwera z daną ścieżką
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+    # Zapamiętanie odebranego żądania
+    def record(self, path, client):
+        request = Request(path, client, time.perf_counter())
+        with self.lock:
+            self.requests.append(request)
+        return request
+
+    # Żądania danej ścieżki
+    def received(self, path):
+        with self.lock:
+            return [request for request in self.requests if request.path == path]
+
+
+# Serwer testowy uruchomiony w osobnym wątku na czas testu
+@pytest.fixture
+def server():
+    instance = ScriptedServer()
+    # Krótki odstęp sprawdzania zatrzymania skraca zamykanie serwera po teście
+    thread = threading.Thread(target=instance.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield instance
+    instance.shutdown()
+    instance.server_close()
+
+
+# Adres, pod którym połączenie nigdy nie zostaje nawiązane: gniazdo nasłuchuje, ale nie
+# przyjmuje połączeń, a jego kolejka jest już zapełniona (nowe SYN są odrzucane)
+@pytest.fixture
+def blackhole():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(0)
+    port = listener.getsockname()[1]
+    fillers = []
+    for _ in range(4):
+        filler = socket.socket()
+        filler.setblocking(False)
+        filler.connect_ex(("127.0.0.1", port))
+        fillers.append(filler)
+    time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}/"
+    for sock in fillers + [listener]:
+        sock.close()
@@ -0,0 +1,170 @@
+# Testy anulowania pracy zleconej przez most (EngineBridge) na powolnym lokalnym serwerze:
+# po cancel() żadne wyniki nie docierają do wątku interfejsu, a trwające pobrania są
+# przerywane razem z połączeniem.
+
+# Import modułu do pomiaru czasu
+import time
+# Import modułu do pracy z danymi binarnymi
+from io import BytesIO
+
+# Import modułu testów
+import pytest
+# Import modułu do pracy z obrazami
+from PIL import Image
+
+# Import testowanego mostu i silnika
+from nasa_image_searcher.bridge import CancelToken, EngineBridge
+from nasa_image_searcher.engine import SearchEngine
+from nasa_image_searcher.nasa_client import AsyncHTTPClient
+from nasa_image_searcher.image_cache import ImageCache
+from nasa_image_searcher.items import parse_items
+
+# Rozmiar miniatur silnika
+THUMB_SIZE = (180, 180)
+# Liczba fragmentów i odstęp między nimi w odpowiedziach powolnego serwera (ok. 4 s)
+SLOW_CHUNKS = 200
+SLOW_DELAY = 0.02
+
+
+# Obraz JPEG zwracany przez serwer
+def jpeg_bytes():
+    buffer = BytesIO()
+    Image.effect_noise((320, 240), 64).convert("RGB").save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+# Elementy wyników z miniaturami pod danymi ścieżkami serwera
+def make_items(server, paths):
+    return parse_items([
+        {"href": server.url(f"/asset/{index}"), "data": [{"nasa_id": f"id{index}", "title": path}],
+         "links": [{"href": server.url(path), "rel": "preview", "render": "image"}]}
+        for index, path in enumerate(paths)
+    ], THUMB_SIZE)
+
+
+# Wywołanie poll() do chwili spełnienia warunku (lub upływu limitu czasu)
+def poll_until(bridge, condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        bridge.poll()
+        time.sleep(0.01)
+    return True
+
+
+# Oczekiwanie na spełnienie warunku bez wywoływania poll()
+def wait_until(condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+# Serwer z szybkimi (/fast/...) i powolnymi (/slow/...) miniaturami
+@pytest.fixture
+def thumbnails(server):
+    body = jpeg_bytes()
+    for index in range(4):
+        server.routes[f"/fast/{index}~thumb.jpg"] = lambda handler, request: handler.reply(
+            200, body, {"Content-Type": "image/jpeg"}
+        )
+        server.routes[f"/slow/{index}~thumb.jpg"] = lambda handler, request: handler.reply(
+            200, body, {"Content-Type": "image/jpeg"}, chunks=SLOW_CHUNKS, delay=SLOW_DELAY
+        )
+    return server
+
+
+# Most z silnikiem korzystającym z pamięci podręcznej w katalogu tymczasowym testu
+@pytest.fixture
+def engine_bridge(tmp_path):
+    bridge = EngineBridge()
+    engine = SearchEngine(AsyncHTTPClient(), ImageCache(str(tmp_path), 10 ** 9, 3600), THUMB_SIZE)
+    yield engine, bridge
+    bridge.close(engine.close())
+
+
+# Anulowanie strumienia miniatur: szybkie wyniki dotarły, powolne nie docierają po cancel(),
+# a serwer widzi połączenia zerwane w trakcie wysyłania treści
+def test_cancelled_stream_delivers_nothing_and_closes_connections(thumbnails, engine_bridge):
+    engine, bridge = engine_bridge
+    server = thumbnails
+    paths = [f"/fast/{index}~thumb.jpg" for index in range(2)] + [f"/slow/{index}~thumb.jpg" for index in range(2)]
+    delivered = []
+    done = []
+    token = CancelToken()
+    bridge.stream(engine.fetch_thumbnails(make_items(server, paths), 4), delivered.append,
+                  done.append, lambda: done.append("done"), token)
+
+    # Szybkie miniatury docierają, powolne są w trakcie pobierania
+    assert poll_until(bridge, lambda: len(delivered) == 2)
+    assert all(result.error is None for result in delivered)
+    assert wait_until(lambda: len(server.received("/slow/0~thumb.jpg") + server.received("/slow/1~thumb.jpg")) == 2)
+
+    token.cancel()
+    # Serwer wykrywa zamknięte połączenia przy kolejnych fragmentach treści
+    slow = lambda: server.received("/slow/0~thumb.jpg") + server.received("/slow/1~thumb.jpg")
+    assert wait_until(lambda: all(request.aborted for request in slow()), timeout=SLOW_CHUNKS * SLOW_DELAY)
+    assert all(request.finished is None for request in slow())
+
+    # Po anulowaniu nic nie trafia do wątku interfejsu (ani wyniki, ani błąd, ani koniec)
+    time.sleep(0.2)
+    bridge.poll()
+    assert len(delivered) == 2
+    assert done == []
+
+
+# Wynik, który czekał już w kolejce w chwili anulowania, zostaje odrzucony (nieaktualne
+# kafelki nie pojawiają się po nowym wyszukiwaniu)
+def test_result_queued_before_cancel_is_dropped(thumbnails, engine_bridge):
+    engine, bridge = engine_bridge
+    url = make_items(thumbnails, ["/fast/0~thumb.jpg"])[0].thumb
+    delivered = []
+    token = CancelToken()
+    future = bridge.submit(engine.fetch_image(url, THUMB_SIZE), delivered.append, delivered.append, token)
+    assert wait_until(future.done)
+    assert not bridge.results.empty()
+
+    token.cancel()
+    bridge.poll()
+    assert delivered == []
+    # Praca innego znacznika jest dostarczana normalnie
+    other = []
+    bridge.submit(engine.fetch_image(url, THUMB_SIZE), other.append, other.append, CancelToken())
+    assert poll_until(bridge, lambda: other)
+    assert other[0].size[0] <= THUMB_SIZE[0]
+
+
+# Anulowanie w trakcie pobierania pojedynczego obrazu przerywa transfer
+def test_cancelled_submit_aborts_download(thumbnails, engine_bridge):
+    engine, bridge = engine_bridge
+    url = make_items(thumbnails, ["/slow/0~thumb.jpg"])[0].thumb
+    delivered = []
+    token = CancelToken()
+    future = bridge.submit(engine.fetch_image(url, THUMB_SIZE), delivered.append, delivered.append, token)
+    assert wait_until(lambda: thumbnails.received("/slow/0~thumb.jpg"))
+
+    token.cancel()
+    request = thumbnails.received("/slow/0~thumb.jpg")[0]
+    assert wait_until(lambda: request.aborted, timeout=SLOW_CHUNKS * SLOW_DELAY)
+    assert future.cancelled()
+    time.sleep(0.1)
+    bridge.poll()
+    assert delivered == []
+
+
+# Praca zlecona z już anulowanym znacznikiem nie jest uruchamiana
+def test_submit_with_cancelled_token_does_not_run(thumbnails, engine_bridge):
+    engine, bridge = engine_bridge
+    url = make_items(thumbnails, ["/fast/0~thumb.jpg"])[0].thumb
+    delivered = []
+    token = CancelToken()
+    token.cancel()
+    assert bridge.submit(engine.fetch_image(url, THUMB_SIZE), delivered.append, delivered.append, token) is None
+    time.sleep(0.1)
+    bridge.poll()
+    assert thumbnails.received("/fast/0~thumb.jpg") == []
+    # Ani wynik, ani błąd nie trafiają do wątku interfejsu
+    assert delivered == []
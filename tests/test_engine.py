@@ -0,0 +1,376 @@
+# Testy silnika na lokalnym serwerze ze stałym opóźnieniem odpowiedzi: równoległe
+# pobieranie miniatur z ograniczoną liczbą jednoczesnych pobrań, pamięć podręczna oraz
+# pobieranie podglądów z wyprzedzeniem.
+
+# Import pętli zdarzeń asyncio
+import asyncio
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu do uruchomienia serwera w osobnym wątku
+import threading
+# Import modułu do opóźnień i pomiaru czasu
+import time
+# Import modułu do pomiaru szczytowego zużycia pamięci
+import tracemalloc
+# Import modułu do pracy z danymi binarnymi
+from io import BytesIO
+
+# Import modułu testów
+import pytest
+# Import modułu do pracy z obrazami
+from PIL import Image
+
+# Import testowanego silnika
+from nasa_image_searcher.engine import SearchEngine
+from nasa_image_searcher.bridge import EngineBridge
+from nasa_image_searcher.preview_prefetch import PreviewPrefetcher
+from nasa_image_searcher.imaging import ImageLimitError
+from nasa_image_searcher.nasa_client import AsyncHTTPClient
+from nasa_image_searcher.image_cache import ImageCache
+from nasa_image_searcher.items import parse_items
+
+# Rozmiar miniatur silnika
+THUMB_SIZE = (180, 180)
+# Opóźnienie każdej odpowiedzi serwera (w sekundach)
+LATENCY = 0.3
+# Liczba pobieranych miniatur
+COUNT = 8
+# Rozmiar ekranu, do którego dobierany jest podgląd
+SCREEN_SIZE = (1920, 1080)
+
+
+# Klasa trasy z opóźnieniem, zliczająca jednocześnie obsługiwane żądania
+class SlowImages:
+    # Inicjalizacja trasy
+    def __init__(self):
+        buffer = BytesIO()
+        Image.new("RGB", (320, 240), "gray").save(buffer, "JPEG")
+        self.body = buffer.getvalue()
+        self.lock = threading.Lock()
+        # Bieżąca i największa liczba jednocześnie obsługiwanych żądań
+        self.active = 0
+        self.peak = 0
+
+    # Odpowiedź po stałym opóźnieniu
+    def __call__(self, handler, request):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(LATENCY)
+            handler.reply(200, self.body, {"Content-Type": "image/jpeg"})
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+# Serwer z COUNT miniaturami; zwraca (elementy wyników, trasa)
+@pytest.fixture
+def slow_thumbnails(server):
+    route = SlowImages()
+    raw = []
+    for index in range(COUNT):
+        path = f"/image/{index}/{index}~thumb.jpg"
+        server.routes[path] = route
+        raw.append({"href": None, "data": [{"nasa_id": str(index), "title": str(index)}],
+                    "links": [{"href": server.url(path), "rel": "preview", "render": "image"}]})
+    return parse_items(raw, THUMB_SIZE), route
+
+
+# Pobranie miniatur silnikiem; zwraca (czas w sekundach, wyniki)
+def fetch_all(directory, items, concurrency):
+    async def main():
+        engine = SearchEngine(AsyncHTTPClient(), ImageCache(str(directory), 10 ** 9, 3600), THUMB_SIZE)
+        try:
+            started = time.perf_counter()
+            results = [result async for result in engine.fetch_thumbnails(items, concurrency)]
+            return time.perf_counter() - started, results
+        finally:
+            await engine.close()
+    return asyncio.run(main())
+
+
+# Miniatury pobierane równolegle: łączny czas bliski najwolniejszemu pobraniu, a nie sumie
+def test_thumbnails_take_about_one_fetch_not_the_sum(slow_thumbnails, tmp_path):
+    items, route = slow_thumbnails
+    elapsed, results = fetch_all(tmp_path, items, COUNT)
+    assert sorted(result.index for result in results) == list(range(COUNT))
+    assert all(result.error is None and result.image.size[0] <= THUMB_SIZE[0] for result in results)
+    assert route.peak == COUNT
+    assert LATENCY <= elapsed < 2 * LATENCY < COUNT * LATENCY
+
+
+# Liczba jednoczesnych pobrań nie przekracza zadanej - czas rośnie z liczbą porcji
+def test_thumbnail_concurrency_is_bounded(slow_thumbnails, tmp_path):
+    items, route = slow_thumbnails
+    elapsed, results = fetch_all(tmp_path, items, 2)
+    assert len(results) == COUNT
+    assert route.peak == 2
+    assert elapsed >= COUNT / 2 * LATENCY
+
+
+# Powtórne wyszukiwanie obsługiwane z pamięci podręcznej bez ruchu sieciowego
+def test_repeated_thumbnails_come_from_the_cache(slow_thumbnails, server, tmp_path):
+    items, route = slow_thumbnails
+    fetch_all(tmp_path, items, COUNT)
+    requests_before = len(server.requests)
+    elapsed, results = fetch_all(tmp_path, items, COUNT)
+    assert len(server.requests) == requests_before
+    assert all(result.error is None for result in results)
+    assert elapsed < LATENCY
+
+
+# Serwer z podglądem pod /image/p/p~large.jpg; zwraca element wyników
+def serve_preview(server):
+    buffer = BytesIO()
+    Image.effect_noise((1920, 1440), 64).convert("RGB").save(buffer, "JPEG")
+    body = buffer.getvalue()
+    path = "/image/p/p~large.jpg"
+    server.routes[path] = lambda handler, request: handler.reply(200, body, chunks=20, delay=0.01)
+    return parse_items([{"href": None, "data": [{"nasa_id": "p", "title": "p"}], "links": [
+        {"href": server.url(path), "rel": "alternate", "render": "image", "width": 1920, "height": 1440}
+    ]}], THUMB_SIZE)[0]
+
+
+# Wykonanie pracy na silniku z pamięcią podręczną w podanym katalogu
+def with_engine(directory, work):
+    async def main():
+        engine = SearchEngine(AsyncHTTPClient(), ImageCache(str(directory), 10 ** 9, 3600), THUMB_SIZE)
+        try:
+            return await work(engine)
+        finally:
+            await engine.close()
+    return asyncio.run(main())
+
+
+# Podgląd pobrany z wyprzedzeniem otwiera się z dysku bez kolejnego żądania
+def test_prefetched_preview_opens_from_cache(server, tmp_path):
+    item = serve_preview(server)
+
+    async def work(engine):
+        received = await engine.prefetch_preview(item, SCREEN_SIZE, 64 * 2 ** 20)
+        return received, await engine.fetch_preview(item, SCREEN_SIZE)
+    received, image = with_engine(tmp_path, work)
+    assert received > 0
+    assert image.size == (1920, 1440)
+    assert len(server.received("/image/p/p~large.jpg")) == 1
+
+
+# Podgląd większy niż budżet jest przerywany i nie zostawia plików tymczasowych
+def test_prefetch_stops_at_budget(server, tmp_path):
+    item = serve_preview(server)
+    with pytest.raises(ValueError):
+        with_engine(tmp_path, lambda engine: engine.prefetch_preview(item, SCREEN_SIZE, 16 * 1024))
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+
+# Pobieranie z wyprzedzeniem czeka, aż zakończą się operacje pierwszoplanowe (miniatury)
+def test_prefetch_waits_for_foreground(slow_thumbnails, server, tmp_path):
+    items, route = slow_thumbnails
+    item = serve_preview(server)
+
+    async def work(engine):
+        thumbnails = asyncio.ensure_future(engine.fetch_image(items[0].thumb, THUMB_SIZE))
+        # Miniatura jest już w toku, gdy zlecamy pobieranie z wyprzedzeniem
+        await asyncio.sleep(0.05)
+        await engine.prefetch_preview(item, SCREEN_SIZE, 64 * 2 ** 20)
+        await thumbnails
+    with_engine(tmp_path, work)
+    thumbnail, = server.received("/image/0/0~thumb.jpg")
+    preview, = server.received("/image/p/p~large.jpg")
+    assert preview.started >= thumbnail.started + LATENCY
+
+
+# Podgląd otwierany w trakcie pobierania go z wyprzedzeniem; zwraca (wynik pobierania
+# z wyprzedzeniem lub wyjątek, obraz, żądania podglądu odebrane przez serwer, pliki
+# tymczasowe pozostawione w pamięci podręcznej)
+def open_while_prefetching(server, directory, limit):
+    item = serve_preview(server)
+
+    async def work(engine):
+        return await asyncio.gather(engine.prefetch_preview(item, SCREEN_SIZE, limit),
+                                    engine.fetch_preview(item, SCREEN_SIZE), return_exceptions=True)
+    prefetched, image = with_engine(directory, work)
+    leftovers = [name for name in os.listdir(directory) if name.endswith(".tmp")]
+    return prefetched, image, server.received("/image/p/p~large.jpg"), leftovers
+
+
+# Otwierane okno dołącza do trwającego pobierania z wyprzedzeniem - jedno pobranie, bez
+# wspólnego pliku tymczasowego
+def test_open_joins_running_prefetch(server, tmp_path):
+    prefetched, image, requests, leftovers = open_while_prefetching(server, tmp_path, 64 * 2 ** 20)
+    assert isinstance(prefetched, int) and prefetched > 0
+    assert image.size == (1920, 1440)
+    assert len(requests) == 1
+    assert leftovers == []
+
+
+# Pobieranie z wyprzedzeniem przerwane po przekroczeniu budżetu nie usuwa danych otwieranego
+# obrazu - okno pobiera go samodzielnie
+def test_prefetch_over_budget_does_not_break_open(server, tmp_path):
+    prefetched, image, requests, leftovers = open_while_prefetching(server, tmp_path, 16 * 1024)
+    assert isinstance(prefetched, ValueError)
+    assert image.size == (1920, 1440)
+    assert len(requests) == 2
+    assert leftovers == []
+
+
+# Silnik tworzony poza swoją pętlą (jak w aplikacji - w wątku Tk) i używany przez most:
+# pobieranie z wyprzedzeniem czeka na miniaturę w pętli mostu
+def test_engine_built_outside_its_loop(slow_thumbnails, server, tmp_path):
+    items, route = slow_thumbnails
+    item = serve_preview(server)
+    engine = SearchEngine(AsyncHTTPClient(), ImageCache(str(tmp_path), 10 ** 9, 3600), THUMB_SIZE)
+    bridge = EngineBridge()
+    try:
+        thumbnail = bridge.submit(engine.fetch_image(items[0].thumb, THUMB_SIZE))
+        while not server.received("/image/0/0~thumb.jpg"):
+            time.sleep(0.01)
+        prefetched = bridge.submit(engine.prefetch_preview(item, SCREEN_SIZE, 64 * 2 ** 20))
+        assert prefetched.result(timeout=10) > 0
+        assert thumbnail.result(timeout=10).size[0] <= THUMB_SIZE[0]
+    finally:
+        bridge.close(engine.close())
+    thumbnail, = server.received("/image/0/0~thumb.jpg")
+    preview, = server.received("/image/p/p~large.jpg")
+    assert preview.started >= thumbnail.started + LATENCY
+
+
+# Nieudane pobieranie z wyprzedzeniem trafia do logu
+def test_prefetch_errors_are_logged(server, tmp_path):
+    item = serve_preview(server)
+    engine = SearchEngine(AsyncHTTPClient(), ImageCache(str(tmp_path), 10 ** 9, 3600), THUMB_SIZE)
+    bridge = EngineBridge()
+    logged = []
+    try:
+        prefetcher = PreviewPrefetcher(engine, bridge, SCREEN_SIZE, lambda item: item.nasa_id, 16 * 1024,
+                                       log=logged.append)
+        prefetcher.want([item])
+        deadline = time.perf_counter() + 10
+        while prefetcher.busy and time.perf_counter() < deadline:
+            bridge.poll()
+            time.sleep(0.01)
+    finally:
+        bridge.close(engine.close())
+    assert not prefetcher.busy
+    assert len(logged) == 1 and "prefetch budget" in logged[0] and "(p)" in logged[0]
+
+
+# Oczekiwanie na spełnienie warunku (lub upływ limitu czasu)
+def wait_until(condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+# Pobranie obrazu silnikiem z podanymi limitami; zwraca (czas w sekundach, wyjątek lub obraz)
+def fetch_limited(directory, url, size=None, **limits):
+    async def main():
+        engine = SearchEngine(AsyncHTTPClient(), ImageCache(str(directory), 10 ** 9, 3600), THUMB_SIZE,
+                              **limits)
+        try:
+            started = time.perf_counter()
+            try:
+                result = await engine.fetch_image(url, size)
+            except Exception as e:
+                result = e
+            return time.perf_counter() - started, result
+        finally:
+            await engine.close()
+    return asyncio.run(main())
+
+
+# Duży obraz JPEG (szum słabo się kompresuje - kilka MiB)
+def noise_jpeg(size):
+    noise = Image.effect_noise(size, 64)
+    buffer = BytesIO()
+    image = Image.merge("RGB", (noise, noise.transpose(Image.Transpose.ROTATE_180), noise))
+    image.save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+# Zapowiedziana długość ponad limit odrzucana przed odczytem treści - serwer wysyła pierwszy
+# fragment dopiero po 0,5 s, a pobieranie kończy się wcześniej i zrywa połączenie
+def test_content_length_over_limit_is_rejected_before_body(server, tmp_path):
+    server.routes["/big.jpg"] = lambda handler, request: handler.reply(
+        200, b"x" * 2 ** 21, chunks=4, delay=0.5
+    )
+    elapsed, error = fetch_limited(tmp_path, server.url("/big.jpg"), max_bytes=2 ** 20)
+    assert isinstance(error, ImageLimitError) and "limit is 1048576" in str(error)
+    assert elapsed < 0.5
+    request, = server.received("/big.jpg")
+    assert wait_until(lambda: request.aborted)
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+
+# Zbyt duże wymiary odczytane z nagłówka przerywają transfer po pierwszym fragmencie
+def test_pixel_limit_aborts_after_header(server, tmp_path):
+    body = noise_jpeg((2000, 1500))
+    server.routes["/wide.jpg"] = lambda handler, request: handler.reply(200, body, chunks=40, delay=0.025)
+    elapsed, error = fetch_limited(tmp_path, server.url("/wide.jpg"), max_pixels=1000 * 1000)
+    assert isinstance(error, ImageLimitError) and "2000x1500" in str(error)
+    assert elapsed < 0.5
+    request, = server.received("/wide.jpg")
+    assert wait_until(lambda: request.aborted)
+    assert request.finished is None
+
+
+# Treść niebędąca obrazem przerywa transfer po HEADER_BYTES zamiast pobierania całości
+def test_non_image_body_aborts_transfer(server, tmp_path):
+    server.routes["/fake.jpg"] = lambda handler, request: handler.reply(
+        200, b"<html>" + b"x" * 2 ** 22, chunks=64, delay=0.02
+    )
+    elapsed, error = fetch_limited(tmp_path, server.url("/fake.jpg"), THUMB_SIZE)
+    assert isinstance(error, ImageLimitError) and "not a recognizable image" in str(error)
+    assert elapsed < 0.64
+    request, = server.received("/fake.jpg")
+    assert wait_until(lambda: request.aborted)
+    assert request.finished is None
+
+
+# Pełny obraz trafia z sieci prosto do pliku - szczytowa pamięć (tracemalloc) nie zależy
+# od wielkości pobieranego pliku
+def test_streamed_download_peak_memory_is_bounded(server, tmp_path):
+    body = noise_jpeg((3000, 2000))
+    assert len(body) > 4 * 2 ** 20
+    server.routes["/large.jpg"] = lambda handler, request: handler.reply(200, body)
+    tracemalloc.start()
+    try:
+        elapsed, image = fetch_limited(tmp_path, server.url("/large.jpg"))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert image.size == (3000, 2000)
+    assert peak < 2 * 2 ** 20
+
+
+# Odpowiedź 304 z błędem odczytu wpisu zgłasza ten błąd (plik tymczasowy usuwany raz)
+def test_not_modified_error_is_not_masked(server, tmp_path, monkeypatch):
+    body = noise_jpeg((64, 48))
+
+    # Pierwsze żądanie dostaje obraz, kolejne - potwierdzenie aktualności wpisu
+    def route(handler, request):
+        if len(server.received("/etag.jpg")) == 1:
+            handler.reply(200, body, {"ETag": '"v1"'})
+        else:
+            handler.reply(304, headers={"ETag": '"v1"'})
+    server.routes["/etag.jpg"] = route
+
+    async def main():
+        engine = SearchEngine(AsyncHTTPClient(), ImageCache(str(tmp_path), 10 ** 9, 0), THUMB_SIZE)
+        try:
+            await engine.fetch_image(server.url("/etag.jpg"))
+
+            def broken(url, entry):
+                raise RuntimeError("entry unreadable")
+            monkeypatch.setattr(engine.cache, "revalidated_image", broken)
+            with pytest.raises(RuntimeError, match="entry unreadable"):
+                await engine.fetch_image(server.url("/etag.jpg"))
+        finally:
+            await engine.close()
+    asyncio.run(main())
+    assert len(server.received("/etag.jpg")) == 2
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
@@ -0,0 +1,109 @@
+# Testy bufora logu bez ekranu: stały koszt put/drain w długiej sesji, liczba pominiętych
+# komunikatów przy pełnym buforze, rotacja pliku logu oraz przycinanie pola logu do
+# UIConfig.LOG_LINES wierszy.
+
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu do pomiaru czasu
+import time
+
+# Import testowanego bufora i pliku logu
+from nasa_image_searcher.log_sink import LogSink, RotatingFile
+# Import pola logu aplikacji (przycinanie wierszy) i konfiguracji
+from nasa_image_searcher.app import LogBox, UIConfig
+
+
+# Klasa zastępująca pole tekstowe Tk - przechowuje wiersze jako listę
+class FakeText:
+    # Inicjalizacja pola z buforem logu
+    def __init__(self, sink):
+        self.sink = sink
+        self.line_count = 0
+        self.rows = []
+
+    # Wstawienie tekstu na koniec pola (tekst kończy się znakiem nowej linii)
+    def insert(self, index, text):
+        self.rows += text.split("\n")[:-1]
+
+    # Usunięcie wierszy od "1.0" do "N.0" (bez wiersza N)
+    def delete(self, start, end):
+        del self.rows[:int(end.split(".")[0]) - 1]
+
+    # Przewinięcie do końca - bez znaczenia w teście
+    def see(self, index):
+        pass
+
+
+# Koszt put i drain nie rośnie z długością sesji
+def test_put_and_drain_cost_stays_constant():
+    sink = LogSink(capacity=10000)
+    costs = []
+    for block in range(5):
+        started = time.perf_counter()
+        for index in range(50000):
+            sink.put(f"Loaded thumbnail {block}/{index}")
+            if index % 1000 == 999:
+                assert len(sink.drain()) == 1000
+        costs.append(time.perf_counter() - started)
+    assert costs[-1] < 2 * costs[0] + 0.05
+
+
+# Pełny bufor pomija najstarsze komunikaty; odbiorca dostaje ich liczbę i najnowsze wiersze
+def test_full_buffer_reports_dropped_messages():
+    sink = LogSink(capacity=10)
+    for index in range(25):
+        sink.put(f"message {index}")
+    lines = sink.drain()
+    assert lines[0] == "... 15 log messages skipped"
+    assert lines[1:] == [f"message {index}" for index in range(15, 25)]
+    # Licznik pominiętych zerowany po odbiorze
+    sink.put("next")
+    assert sink.drain() == ["next"]
+    assert sink.drain() == []
+
+
+# Plik logu rotowany po przekroczeniu rozmiaru; zachowywana jest zadana liczba starszych plików
+def test_rotating_file_rotates_at_size_limit(tmp_path):
+    path = str(tmp_path / "logs" / "app.log")
+    log = RotatingFile(path, max_bytes=100, backups=2)
+    for index in range(12):
+        log.write(f"line {index:02d} " + "x" * 21 + "\n")
+    log.close()
+    # 30 znaków na wiersz - rotacja co 4 wiersze, najstarsze pliki usunięte
+    assert sorted(os.listdir(tmp_path / "logs")) == ["app.log", "app.log.1", "app.log.2"]
+    with open(path + ".2", encoding="utf-8") as f:
+        assert f.read().startswith("line 04 ")
+    with open(path + ".1", encoding="utf-8") as f:
+        assert os.path.getsize(path + ".1") == 120 and f.read().startswith("line 08 ")
+    assert os.path.getsize(path) == 0
+
+
+# Bufor zapisuje do pliku wszystkie komunikaty ze znacznikiem czasu, także pominięte w polu
+def test_sink_writes_every_message_to_file(tmp_path):
+    path = str(tmp_path / "app.log")
+    sink = LogSink(capacity=2, path=path)
+    for index in range(5):
+        sink.put(f"message {index}")
+    sink.drain()
+    sink.close()
+    with open(path, encoding="utf-8") as f:
+        rows = f.read().splitlines()
+    assert [row.split(" ", 2)[2] for row in rows] == [f"message {index}" for index in range(5)]
+
+
+# Pole logu przycinane do ostatnich UIConfig.LOG_LINES wierszy
+def test_log_widget_keeps_last_lines(monkeypatch):
+    monkeypatch.setattr(UIConfig, "LOG_LINES", 50)
+    box = FakeText(LogSink(capacity=1000))
+    for batch in range(3):
+        for index in range(40):
+            box.sink.put(f"message {batch * 40 + index}")
+        LogBox._flush(box)
+    assert box.rows == [f"message {index}" for index in range(70, 120)]
+    assert box.line_count == 50
+    # Porcja dłuższa niż limit wstawiana jest od razu bez nadmiarowych wierszy
+    for index in range(500):
+        box.sink.put(f"burst {index}")
+    LogBox._flush(box)
+    assert box.rows == [f"burst {index}" for index in range(450, 500)]
+    assert box.line_count == 50
@@ -0,0 +1,164 @@
+# Testy asynchronicznego klienta HTTP na lokalnym serwerze: ponawianie po 429/5xx,
+# nagłówek Retry-After, limity czasu połączenia i odczytu oraz liczniki połączeń.
+
+# Import pętli zdarzeń asyncio
+import asyncio
+# Import modułu do pomiaru czasu
+import time
+
+# Import modułu testów
+import pytest
+# Import asynchronicznego klienta HTTP (błędy sieci)
+import aiohttp
+
+# Import testowanego klienta
+from nasa_image_searcher.nasa_client import AsyncHTTPClient, HTTPStatusError, backoff_delay
+
+# Krótkie opóźnienia ponawiania, aby testy trwały ułamki sekundy
+FAST = {"backoff_base": 0.01, "backoff_max": 0.05}
+
+
+# Wykonanie korutyny z klientem zamykanym po zakończeniu
+def run(client, work):
+    async def main():
+        try:
+            return await work(client)
+        finally:
+            await client.close()
+    return asyncio.run(main())
+
+
+# Trasa zwracająca kolejno podane kody (ostatni powtarzany), potem treść JSON
+def statuses(*codes, headers=None):
+    remaining = list(codes)
+
+    def route(handler, request):
+        status = remaining.pop(0) if len(remaining) > 1 else remaining[0]
+        if status == 200:
+            handler.reply(200, b'{"ok": true}', {"Content-Type": "application/json"})
+        else:
+            handler.reply(status, b"busy", headers)
+    return route
+
+
+# Błędy przejściowe 503 są ponawiane, a odpowiedź poprawna zwracana
+def test_retries_server_errors(server):
+    server.routes["/api"] = statuses(503, 502, 200)
+    client = AsyncHTTPClient(**FAST)
+    assert run(client, lambda c: c.get_json(server.url("/api"))) == {"ok": True}
+    assert len(server.received("/api")) == 3
+    assert client.stats.requests == 3
+    assert client.stats.retries == 2
+
+
+# Po wyczerpaniu prób zwracana jest ostatnia odpowiedź, a get_json zgłasza błąd
+def test_gives_up_after_max_retries(server):
+    server.routes["/api"] = statuses(503)
+    client = AsyncHTTPClient(max_retries=2, **FAST)
+    response = run(client, lambda c: c.get(server.url("/api")))
+    assert response.status_code == 503
+    assert len(server.received("/api")) == 3
+    with pytest.raises(HTTPStatusError):
+        response.raise_for_status()
+
+
+# Błędy klienta (np. 404) nie są ponawiane
+def test_does_not_retry_client_errors(server):
+    client = AsyncHTTPClient(**FAST)
+    with pytest.raises(HTTPStatusError) as error:
+        run(client, lambda c: c.get_json(server.url("/missing")))
+    assert error.value.status == 404
+    assert client.stats.retries == 0
+
+
+# Odpowiedź 429 z Retry-After wstrzymuje kolejną próbę co najmniej na wskazany czas
+def test_honours_retry_after(server):
+    server.routes["/api"] = statuses(429, 200, headers={"Retry-After": "1"})
+    client = AsyncHTTPClient(backoff_base=0.01, backoff_max=5)
+    assert run(client, lambda c: c.get_json(server.url("/api"))) == {"ok": True}
+    first, second = server.received("/api")
+    assert second.started - first.started >= 1.0
+
+
+# Retry-After nie wydłuża oczekiwania ponad maksymalne opóźnienie
+def test_retry_after_is_capped():
+    assert backoff_delay(0, 0.01, 2, "120") == 2
+    assert backoff_delay(0, 0.01, 2, "soon") <= 0.01
+
+
+# Opóźnienie rośnie wykładniczo z numerem próby, ale nie przekracza maksimum
+def test_backoff_is_bounded():
+    for attempt in range(8):
+        assert 0 <= backoff_delay(attempt, 0.5, 10) <= min(10, 0.5 * 2 ** attempt)
+
+
+# Serwer, który nie wysyła odpowiedzi, przerywa żądanie po limicie odczytu - próba jest
+# ponawiana i kolejna się udaje
+def test_read_timeout_is_retried(server):
+    calls = []
+
+    def route(handler, request):
+        calls.append(request)
+        if len(calls) == 1:
+            time.sleep(1.0)
+        handler.reply(200, b'{"ok": true}')
+    server.routes["/api"] = route
+    client = AsyncHTTPClient(read_timeout=0.2, **FAST)
+    started = time.perf_counter()
+    assert run(client, lambda c: c.get_json(server.url("/api"))) == {"ok": True}
+    assert time.perf_counter() - started < 1.0
+    assert client.stats.retries == 1
+
+
+# Nawiązanie połączenia przerywane po limicie; po wyczerpaniu prób błąd trafia do wywołującego
+def test_connect_timeout(blackhole):
+    client = AsyncHTTPClient(connect_timeout=0.2, max_retries=1, **FAST)
+    started = time.perf_counter()
+    with pytest.raises(asyncio.TimeoutError):
+        run(client, lambda c: c.get(blackhole))
+    assert time.perf_counter() - started < 2.0
+    assert client.stats.requests == 2
+
+
+# Strumień zatrzymany w połowie treści jest przerywany po limicie odczytu i nie jest
+# ponawiany (część treści została już przekazana)
+def test_stalled_stream_is_not_retried(server):
+    server.routes["/image"] = lambda handler, request: handler.reply(
+        200, b"x" * 4096, chunks=2, delay=1.0
+    )
+    received = []
+
+    async def consume(chunk, length):
+        received.append(chunk)
+    client = AsyncHTTPClient(read_timeout=0.3, **FAST)
+    with pytest.raises(aiohttp.ClientPayloadError):
+        run(client, lambda c: c.stream(server.url("/image"), consume))
+    assert client.stats.requests == 1
+    assert len(server.received("/image")) == 1
+
+
+# Kolejne żądania do jednego hosta korzystają z tego samego połączenia
+def test_reuses_connections(server):
+    server.routes["/api"] = statuses(200)
+
+    async def work(client):
+        for _ in range(5):
+            await client.get_json(server.url("/api"))
+    client = AsyncHTTPClient(**FAST)
+    run(client, work)
+    assert client.stats.requests == 5
+    assert client.stats.opened == 1
+    assert client.stats.reused == 4
+    assert len({request.client for request in server.received("/api")}) == 1
+
+
+# Równoległe żądania otwierają osobne połączenia, nie więcej niż pula na host
+def test_parallel_requests_open_pool_connections(server):
+    server.routes["/api"] = lambda handler, request: (time.sleep(0.1), handler.reply(200, b"{}"))
+
+    async def work(client):
+        await asyncio.gather(*(client.get_json(server.url("/api")) for _ in range(6)))
+    client = AsyncHTTPClient(pool_size=3, **FAST)
+    run(client, work)
+    assert client.stats.opened == 3
+    assert client.stats.reused == 3
@@ -0,0 +1,116 @@
+# Testy budowy piramidy kafelków: poziom 0 w pełnej rozdzielczości także wtedy, gdy obraz
+# nie mieści się w budżecie pamięci (JPEG i PNG), zgodność kafelków z oryginałem oraz
+# sprzątanie plików tymczasowych.
+
+# Import modułu do obsługi ścieżek i plików
+import os
+
+# Import modułów do pracy z obrazami
+from PIL import Image, ImageChops, ImageStat
+
+# Import testowanej piramidy
+from nasa_image_searcher.pyramid import ImagePyramid, prune
+
+# Wymiary obrazu testowego (nie są wielokrotnością boku kafelka)
+SIZE = (1000, 700)
+# Budżet dużo mniejszy niż zdekodowany poziom 0 (1000 x 700 x 4 bajty)
+BUDGET = 400 * 1024
+
+
+# Zapis obrazu testowego o wyraźnej treści (gradienty w obu kierunkach)
+def write_source(path, mode="RGB", **params):
+    img = Image.merge("RGB", [
+        Image.linear_gradient("L").resize(SIZE),
+        Image.radial_gradient("L").resize(SIZE),
+        Image.linear_gradient("L").rotate(90).resize(SIZE),
+    ])
+    img.convert(mode).save(path, **params)
+    return img
+
+
+# Złożenie poziomu z kafelków zapisanych na dysku
+def assemble(pyramid, level):
+    width, height = pyramid.levels[level]
+    cols, rows = pyramid.grid(level)
+    img = Image.new("RGB", (width, height))
+    for row in range(rows):
+        for col in range(cols):
+            tile = pyramid.load_tile(level, col, row).convert("RGB")
+            img.paste(tile, (col * pyramid.tile_size, row * pyramid.tile_size))
+    return img
+
+
+# Średnia różnica składowych między dwoma obrazami (kafelki są zapisywane ze stratą)
+def mean_difference(a, b):
+    return max(ImageStat.Stat(ImageChops.difference(a, b)).mean)
+
+
+# Wspólne sprawdzenie piramidy większej niż budżet
+def check_over_budget(tmp_path, name, tolerance, mode="RGB", **params):
+    source_path = str(tmp_path / name)
+    original = write_source(source_path, mode, **params).convert(mode).convert("RGB")
+    directory = str(tmp_path / "pyramid")
+    pyramid = ImagePyramid.build(source_path, directory, memory_budget=BUDGET, tile_size=128)
+
+    # Poziom 0 ma pełną rozdzielczość mimo zbyt małego budżetu
+    assert pyramid.levels[0] == SIZE
+    assert (pyramid.width, pyramid.height) == SIZE
+    assert pyramid.source_size == SIZE
+    assert pyramid.grid(0) == (8, 6)
+    assert mean_difference(assemble(pyramid, 0), original) <= tolerance
+    # Kolejne poziomy są dwukrotnie mniejsze aż do jednego kafelka
+    assert pyramid.levels == [(1000, 700), (500, 350), (250, 175), (125, 88)]
+    assert mean_difference(assemble(pyramid, 2), original.reduce(4)) <= tolerance
+    # Po budowie nie zostały pliki mapowane ani katalogi tymczasowe
+    assert sorted(os.listdir(tmp_path)) == sorted([name, "pyramid"])
+    assert not [name for name in os.listdir(directory) if name.endswith(".raw")]
+    return pyramid
+
+
+# JPEG większy niż budżet - poziom 0 nie jest zmniejszany dekoderem
+def test_jpeg_level_zero_exceeds_budget(tmp_path):
+    pyramid = check_over_budget(tmp_path, "source.jpg", 4, quality=95)
+    assert pyramid.extension == "jpg"
+
+
+# PNG większy niż budżet - budowa nie kończy się błędem
+def test_png_level_zero_exceeds_budget(tmp_path):
+    pyramid = check_over_budget(tmp_path, "source.png", 4, mode="RGBA")
+    assert pyramid.extension == "png"
+
+
+# Obraz mieszczący się w budżecie daje te same poziomy
+def test_small_image_within_budget(tmp_path):
+    source_path = str(tmp_path / "source.png")
+    original = write_source(source_path)
+    pyramid = ImagePyramid.build(source_path, str(tmp_path / "pyramid"), tile_size=128)
+    assert pyramid.levels[0] == SIZE
+    assert mean_difference(assemble(pyramid, 0), original) <= 4
+
+
+# Nieudana budowa nie zostawia katalogu tymczasowego
+def test_failed_build_removes_temporary_directory(tmp_path):
+    source_path = str(tmp_path / "source.jpg")
+    with open(source_path, "wb") as f:
+        f.write(b"not an image")
+    try:
+        ImagePyramid.build(source_path, str(tmp_path / "pyramid"))
+    except OSError:
+        pass
+    else:
+        raise AssertionError("build should fail")
+    assert os.listdir(tmp_path) == ["source.jpg"]
+
+
+# Sprzątanie usuwa dawne pozostałości przerwanej budowy, a świeże zostawia
+def test_prune_removes_stale_leftovers(tmp_path):
+    stale_dir = tmp_path / "abc.123.tmp"
+    stale_dir.mkdir()
+    stale_file = tmp_path / "abc.456.download"
+    stale_file.write_bytes(b"x")
+    fresh_file = tmp_path / "abc.789.download"
+    fresh_file.write_bytes(b"x")
+    for path in (stale_dir, stale_file):
+        os.utime(path, (0, 0))
+    prune(str(tmp_path), 5)
+    assert os.listdir(tmp_path) == ["abc.789.download"]
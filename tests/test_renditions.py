@@ -0,0 +1,160 @@
+# Testy wyboru wersji (rozmiaru) obrazów na nagranych odpowiedziach API (tests/fixtures):
+# wersje z wymiarami i bez nich, manifest zasobów, gdy tablica "links" zawiera tylko
+# miniaturę, oraz oryginał używany wyłącznie w ostateczności.
+
+# Import pętli zdarzeń asyncio
+import asyncio
+# Import modułu do odczytu nagrań JSON
+import json
+# Import modułu do obsługi ścieżek i plików
+import os
+# Import modułu do pracy z danymi binarnymi
+from io import BytesIO
+# Import funkcji do rozkładu adresów
+from urllib.parse import urlsplit
+
+# Import modułu do pracy z obrazami
+from PIL import Image
+
+# Import testowanego wyboru wersji
+from nasa_image_searcher.renditions import (Rendition, choose, needs_manifest, preview_url, original_url,
+                                            renditions_from_manifest)
+from nasa_image_searcher.items import parse_items
+from nasa_image_searcher.engine import SearchEngine
+from nasa_image_searcher.nasa_client import AsyncHTTPClient
+from nasa_image_searcher.image_cache import ImageCache
+
+# Katalog nagranych odpowiedzi
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# Host NASA w nagraniach (przy serwowaniu zamieniany na adres lokalnego serwera)
+NASA_ASSETS = "https://images-assets.nasa.gov"
+# Rozmiar kafelka i ekranu
+THUMB_SIZE = (180, 180)
+SCREEN_SIZE = (1920, 1080)
+
+
+# Treść nagrania
+def fixture_text(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+# Elementy nagranej strony wyników (nasa_id -> rekord)
+def recorded_items():
+    items = parse_items(json.loads(fixture_text("search_apollo.json"))["collection"]["items"], THUMB_SIZE)
+    return {item.nasa_id: item for item in items}
+
+
+# Nazwa wersji z adresu (np. "large")
+def name_of(url):
+    return Rendition(url).name
+
+
+# Wersje z wymiarami: najmniejsza, która pokrywa kafelek lub ekran
+def test_smallest_covering_rendition_with_dimensions():
+    item = recorded_items()["as11-40-5874"]
+    assert name_of(item.thumb) == "thumb"
+    assert choose(item.renditions, (400, 400)).name == "small"
+    assert preview_url(item, SCREEN_SIZE).endswith("~large.jpg")
+    assert preview_url(item, (1280, 720)).endswith("~medium.jpg")
+    assert not needs_manifest(item, SCREEN_SIZE)
+
+
+# Wersje bez wymiarów: rozmiar szacowany po nazwie pliku
+def test_estimated_sizes_without_dimensions():
+    item = recorded_items()["PIA12235"]
+    # Szacowana miniatura (100 px) nie pokrywa kafelka 180 px
+    assert name_of(item.thumb) == "small"
+    assert name_of(preview_url(item, SCREEN_SIZE)) == "large"
+    assert name_of(preview_url(item, (1280, 720))) == "medium"
+    assert not needs_manifest(item, SCREEN_SIZE)
+
+
+# Linki niebędące obrazami (np. napisy) są pomijane
+def test_non_image_links_are_ignored():
+    item = recorded_items()["PIA12235"]
+    assert [rendition.name for rendition in item.renditions] == ["thumb", "small", "medium", "large", "orig"]
+
+
+# Tablica "links" z samą miniaturą - podgląd wymaga manifestu zasobów
+def test_manifest_fallback():
+    item = recorded_items()["S65-34635"]
+    manifest = json.loads(fixture_text("manifest_S65-34635.json"))
+    assert needs_manifest(item, SCREEN_SIZE)
+    # Bez manifestu zostaje największa znana wersja, a nie puste miejsce
+    assert name_of(preview_url(item, SCREEN_SIZE)) == "thumb"
+    assert name_of(preview_url(item, SCREEN_SIZE, manifest)) == "large"
+    # Metadane z manifestu nie są traktowane jak obraz
+    assert [rendition.href for rendition in renditions_from_manifest(manifest)] == manifest[:-1]
+
+
+# Element bez manifestu (brak href) nie wymaga jego pobrania
+def test_no_manifest_without_href():
+    item = recorded_items()["S65-34635"]
+    item.href = None
+    assert not needs_manifest(item, SCREEN_SIZE)
+
+
+# Oryginał tylko w ostateczności: gdy żadna wersja nie pokrywa ekranu, wybierana jest
+# największa nieoryginalna, a oryginał - tylko gdy nie ma innej
+def test_original_only_as_last_resort():
+    base = f"{NASA_ASSETS}/image/X/X"
+    renditions = [Rendition(f"{base}~thumb.jpg"), Rendition(f"{base}~orig.jpg", "canonical"),
+                  Rendition(f"{base}~small.jpg")]
+    assert choose(renditions, SCREEN_SIZE).name == "small"
+    assert choose([Rendition(f"{base}~orig.jpg", "canonical")], SCREEN_SIZE).name == "orig"
+    # Wersja oznaczona jako canonical jest oryginałem także bez nazwy w pliku
+    assert choose([Rendition(f"{base}.jpg", "canonical"), Rendition(f"{base}-preview.jpg")],
+                  SCREEN_SIZE).href == f"{base}-preview.jpg"
+    item = recorded_items()["GSFC_20171208_Archive_e001465"]
+    assert name_of(item.thumb) == "orig"
+    assert name_of(original_url(recorded_items()["as11-40-5874"])) == "orig"
+
+
+# Pokrycie prostokąta: dopasowanie bez powiększania w jednym z wymiarów
+def test_covers():
+    assert Rendition("a~large.jpg", width=1920, height=1440).covers(SCREEN_SIZE)
+    assert not Rendition("a~medium.jpg", width=1280, height=960).covers(SCREEN_SIZE)
+    # Portret wypełnia ekran wysokością
+    assert Rendition("a~large.jpg", width=1080, height=1920).covers(SCREEN_SIZE)
+    # Wymiary z API mają pierwszeństwo przed szacunkiem z nazwy
+    assert not Rendition("a~large.jpg", width=1000, height=750).covers(SCREEN_SIZE)
+    # Wersja o nieznanym rozmiarze niczego nie pokrywa
+    assert not Rendition("a.jpg").covers(THUMB_SIZE)
+    assert Rendition("a.jpg").long_edge is None
+
+
+# Silnik na nagraniach serwowanych lokalnie: miniatury i podgląd pobierają wybrane wersje,
+# a oryginał tylko wtedy, gdy element nie ma innej
+def test_engine_fetches_selected_renditions(server, tmp_path):
+    search = fixture_text("search_apollo.json").replace(NASA_ASSETS, server.url(""))
+    manifest = fixture_text("manifest_S65-34635.json").replace(NASA_ASSETS, server.url(""))
+    buffer = BytesIO()
+    Image.new("RGB", (64, 48), "gray").save(buffer, "JPEG")
+    image = buffer.getvalue()
+    server.routes["/search"] = lambda handler, request: handler.reply(200, search.encode("utf-8"))
+    server.routes["/image/S65-34635/collection.json"] = lambda handler, request: handler.reply(
+        200, manifest.encode("utf-8")
+    )
+    hrefs = [link["href"] for raw in json.loads(search)["collection"]["items"] for link in raw["links"]]
+    for href in hrefs + json.loads(manifest):
+        server.routes[urlsplit(href).path] = lambda handler, request: handler.reply(200, image)
+
+    async def main():
+        engine = SearchEngine(AsyncHTTPClient(), ImageCache(str(tmp_path), 10 ** 9, 3600), THUMB_SIZE,
+                              search_url=server.url("/search"))
+        try:
+            page = await engine.fetch_page("apollo")
+            async for result in engine.fetch_thumbnails(page.items):
+                assert result.error is None
+            item = next(item for item in page.items if item.nasa_id == "S65-34635")
+            await engine.fetch_preview(item, SCREEN_SIZE)
+        finally:
+            await engine.close()
+    asyncio.run(main())
+
+    fetched = sorted(request.path.rsplit("/", 1)[-1] for request in server.requests)
+    assert fetched == sorted([
+        "search", "as11-40-5874~thumb.jpg", "PIA12235~small.jpg", "S65-34635~thumb.jpg",
+        "GSFC_20171208_Archive_e001465~orig.jpg", "collection.json", "S65-34635~large.jpg",
+    ])